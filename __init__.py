@@ -24,7 +24,7 @@ from .eos import Eos, EOS_VERSION as __version__
 from .data.cache_handler import *
 from .data.cache_handler.exception import TypeFetchError
 from .data.data_handler import *
-from .fit import Fit
+from .fit import CharacterProfile, Fit, FitPool, FitStats
 from .fit.holder.item import *
 from .fit.restriction_tracker.exception import ValidationError
 from .fit.tuples import DamageTypes
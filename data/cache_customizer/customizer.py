@@ -21,6 +21,7 @@
 
 from eos.const.eos import State, Domain, EffectBuildStatus, Scope, FilterType, Operator
 from eos.const.eve import Type, Group, Attribute, Effect, EffectCategory
+from eos.data.cache_generator.derivation import derive
 
 
 class CacheCustomizer:
@@ -40,6 +41,9 @@ class CacheCustomizer:
         self.data = data
         self._add_character_missile_damage_multiplier()
         self._fix_online_effect_category()
+        # Customizations may affect data derived from
+        # types and effects, thus update it
+        derive(self.data)
 
     def _add_character_missile_damage_multiplier(self):
         """
@@ -20,7 +20,6 @@
 
 
 from eos.const.eve import Effect
-from eos.util.frozen_dict import FrozenDict
 
 
 class Checker:
@@ -171,10 +170,7 @@ class Checker:
             # Replace isDefault field value with False for invalid rows
             table.difference_update(invalid_rows)
             for invalid_row in invalid_rows:
-                new_row = {}
-                for field, value in invalid_row.items():
-                    new_row[field] = False if field == 'isDefault' else value
-                table.add(FrozenDict(new_row))
+                table.add(invalid_row._replace(isDefault=False))
 
     def _colliding_module_racks(self):
         """
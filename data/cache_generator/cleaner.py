@@ -26,6 +26,53 @@ from eos.const.eve import Group, Category
 from eos.util.cached_property import CachedProperty
 
 
+# Format:
+# {source table: {source column: (target table, target column)}}
+FOREIGN_KEYS = {
+    'dgmattribs': {
+        'maxAttributeID': ('dgmattribs', 'attributeID')
+    },
+    'dgmeffects': {
+        'preExpression': ('dgmexpressions', 'expressionID'),
+        'postExpression': ('dgmexpressions', 'expressionID'),
+        'durationAttributeID': ('dgmattribs', 'attributeID'),
+        'trackingSpeedAttributeID': ('dgmattribs', 'attributeID'),
+        'dischargeAttributeID': ('dgmattribs', 'attributeID'),
+        'rangeAttributeID': ('dgmattribs', 'attributeID'),
+        'falloffAttributeID': ('dgmattribs', 'attributeID'),
+        'fittingUsageChanceAttributeID': ('dgmattribs', 'attributeID')
+    },
+    'dgmexpressions': {
+        'arg1': ('dgmexpressions', 'expressionID'),
+        'arg2': ('dgmexpressions', 'expressionID'),
+        'expressionTypeID': ('invtypes', 'typeID'),
+        'expressionGroupID': ('invgroups', 'groupID'),
+        'expressionAttributeID': ('dgmattribs', 'attributeID')
+    },
+    'dgmtypeattribs': {
+        'typeID': ('invtypes', 'typeID'),
+        'attributeID': ('dgmattribs', 'attributeID')
+    },
+    'dgmtypeeffects': {
+        'typeID': ('invtypes', 'typeID'),
+        'effectID': ('dgmeffects', 'effectID')
+    },
+    'invtypes': {
+        'groupID': ('invgroups', 'groupID')
+    }
+}
+# Targets of references stored in modifier info YAML, in the
+# same order as sets of relations of effect
+YAML_TARGETS = (
+    ('invtypes', 'typeID'),
+    ('invgroups', 'groupID'),
+    ('dgmattribs', 'attributeID')
+)
+# Tables which complement invtypes or serve as m:n
+# mapping between invtypes and other tables
+AUX_TABLES = ('dgmtypeattribs', 'dgmtypeeffects')
+
+
 class Cleaner:
     """
     Class responsible for cleaning up unnecessary data
@@ -41,6 +88,9 @@ class Cleaner:
 
     def clean(self, data):
         self.data = data
+        # Drop modifier info relations cached during previous
+        # cleanup, they were generated out of other data
+        self.__dict__.pop('_yaml_modinfo_relations', None)
         # Container to store signs of so-called strong data,
         # such rows are immune to removal. Dictionary structure
         # is the same as structure of general data container
@@ -85,14 +135,7 @@ class Cleaner:
         Define auto-cleanup workflow.
         """
         self._kill_weak()
-        self._changed = True
-        # Cycle as long as we have changes during previous iteration.
-        # We need this because contents of even invtypes may change, which,
-        # by turn, will need to pull additional data into other tables
-        while self._changed is True:
-            self._changed = False
-            self._reanimate_auxiliary_friends()
-            self._reestablish_broken_relationships()
+        self._restore_referenced()
 
     def _kill_weak(self):
         """
@@ -104,124 +147,99 @@ class Cleaner:
             to_trash.update(table.difference(strong_rows))
             self._trash_data(table_name, to_trash)
 
-    def _reanimate_auxiliary_friends(self):
+    def _restore_referenced(self):
         """
-        Restore rows in tables, which complement invtypes
-        or serve as m:n mapping between invtypes and other tables.
-        """
-        # As we filter whole database using invtypes table,
-        # gather invtype IDs we currently have in there
-        type_ids = set(row['typeID'] for row in self.data['invtypes'])
-        # Auxiliary tables are those which do not define
-        # any entities, they just map one entities to others
-        # or complement entities with additional data
-        aux_tables = ('dgmtypeattribs', 'dgmtypeeffects')
-        for table_name in aux_tables:
-            to_restore = set()
-            # Restore rows which map other entities to types
-            for row in self.trashed_data[table_name]:
-                if row['typeID'] in type_ids:
-                    to_restore.add(row)
-            if to_restore:
-                self._changed = True
-                self._restore_data(table_name, to_restore)
-
-    def _reestablish_broken_relationships(self):
+        Restore all trashed rows which are referenced by rows
+        in actual data, including rows referenced by restored
+        rows. Trashed rows are looked up via index, and each
+        row's references are processed only once.
         """
-        Restore all rows targeted by references of rows, which
-        exist in actual data.
-        """
-        # Container for 'target data', matches with which are
-        # going to be restored
-        # Format: {(target table name, target column name): {values to have}}}
-        tgt_data = {}
-        self._get_targets_relational(tgt_data)
-        self._get_targets_yaml(tgt_data)
-        # Now, when we have all the target data values, we may look for
-        # rows, which have matching values, and restore them
-        for tgt_spec, tgt_values in tgt_data.items():
-            tgt_table_name, tgt_column_name = tgt_spec
-            to_restore = set()
-            for row in self.trashed_data[tgt_table_name]:
-                if row.get(tgt_column_name) in tgt_values:
-                    to_restore.add(row)
-            if to_restore:
-                self._changed = True
+        trash_index = self._build_trash_index()
+        # Rows whose references are pending processing
+        # Format: [(table name, row)]
+        worklist = []
+        for table_name, table in self.data.items():
+            for row in table:
+                worklist.append((table_name, row))
+        while worklist:
+            src_table_name, src_row = worklist.pop()
+            for tgt_table_name, tgt_column_name, tgt_value in self._get_references(src_table_name, src_row):
+                try:
+                    tgt_rows = trash_index[(tgt_table_name, tgt_column_name)].pop(tgt_value)
+                except KeyError:
+                    continue
+                trash_table = self.trashed_data[tgt_table_name]
+                to_restore = set(row for row in tgt_rows if row in trash_table)
+                if not to_restore:
+                    continue
                 self._restore_data(tgt_table_name, to_restore)
+                for row in to_restore:
+                    worklist.append((tgt_table_name, row))
 
-    def _get_targets_relational(self, tgt_data):
+    def _build_trash_index(self):
         """
-        Fill dictionary with target references taken from data
-        stored in relational format
+        Index trashed rows by values of all columns which
+        can be targeted by references.
+
+        Return value:
+        Dictionary in {(table name, column name): {column value: {rows}}}
+        format
         """
-        # Format:
-        # {source table: {source column: (target table, target column)}}
-        foreign_keys = {
-            'dgmattribs': {
-                'maxAttributeID': ('dgmattribs', 'attributeID')
-            },
-            'dgmeffects': {
-                'preExpression': ('dgmexpressions', 'expressionID'),
-                'postExpression': ('dgmexpressions', 'expressionID'),
-                'durationAttributeID': ('dgmattribs', 'attributeID'),
-                'trackingSpeedAttributeID': ('dgmattribs', 'attributeID'),
-                'dischargeAttributeID': ('dgmattribs', 'attributeID'),
-                'rangeAttributeID': ('dgmattribs', 'attributeID'),
-                'falloffAttributeID': ('dgmattribs', 'attributeID'),
-                'fittingUsageChanceAttributeID': ('dgmattribs', 'attributeID')
-            },
-            'dgmexpressions': {
-                'arg1': ('dgmexpressions', 'expressionID'),
-                'arg2': ('dgmexpressions', 'expressionID'),
-                'expressionTypeID': ('invtypes', 'typeID'),
-                'expressionGroupID': ('invgroups', 'groupID'),
-                'expressionAttributeID': ('dgmattribs', 'attributeID')
-            },
-            'dgmtypeattribs': {
-                'typeID': ('invtypes', 'typeID'),
-                'attributeID': ('dgmattribs', 'attributeID')
-            },
-            'dgmtypeeffects': {
-                'typeID': ('invtypes', 'typeID'),
-                'effectID': ('dgmeffects', 'effectID')
-            },
-            'invtypes': {
-                'groupID': ('invgroups', 'groupID')
-            }
-        }
-        for src_table_name, table_fks in foreign_keys.items():
-            for src_column_name, fk_target in table_fks.items():
-                tgt_table_name, tgt_column_name = fk_target
-                for row in self.data[src_table_name]:
-                    fk_value = row.get(src_column_name)
-                    # If there's no such field in a row or it is None,
-                    # this is not a valid FK reference
-                    if fk_value is None:
-                        continue
-                    tgt_values = tgt_data.setdefault((tgt_table_name, tgt_column_name), set())
-                    tgt_values.add(fk_value)
+        tgt_specs = set()
+        for table_fks in FOREIGN_KEYS.values():
+            tgt_specs.update(table_fks.values())
+        tgt_specs.update(YAML_TARGETS)
+        for table_name in AUX_TABLES:
+            tgt_specs.add((table_name, 'typeID'))
+        trash_index = {}
+        for tgt_table_name, tgt_column_name in tgt_specs:
+            column_index = trash_index.setdefault((tgt_table_name, tgt_column_name), {})
+            for row in self.trashed_data.get(tgt_table_name, ()):
+                value = row.get(tgt_column_name)
+                # Rows without value cannot be referenced
+                if value is None:
+                    continue
+                column_index.setdefault(value, set()).add(row)
+        return trash_index
 
-    def _get_targets_yaml(self, tgt_data):
+    def _get_references(self, table_name, row):
         """
-        Fill dictionary with target references taken from data
-        stored in YAML format
+        Get references of passed row to other rows.
+
+        Required arguments:
+        table_name -- name of table row belongs to
+        row -- row to get references of
+
+        Return value:
+        Iterable with (target table name, target column name,
+        target column value) tuples
         """
-        for effect_row in self.data['dgmeffects']:
-            effect_id = effect_row['effectID']
+        references = []
+        # Relational references
+        for src_column_name, (tgt_table_name, tgt_column_name) in FOREIGN_KEYS.get(table_name, {}).items():
+            fk_value = row.get(src_column_name)
+            # If there's no such field in a row or it is None,
+            # this is not a valid FK reference
+            if fk_value is not None:
+                references.append((tgt_table_name, tgt_column_name, fk_value))
+        # Auxiliary tables do not define any entities, they just
+        # map one entities to others or complement entities with
+        # additional data; as we filter whole database using
+        # invtypes table, type pulls rows of these tables
+        if table_name == 'invtypes':
+            for aux_table_name in AUX_TABLES:
+                references.append((aux_table_name, 'typeID', row['typeID']))
+        # References stored in YAML
+        elif table_name == 'dgmeffects':
             try:
-                types, groups, attrs = self._yaml_modinfo_relations[effect_id]
+                yaml_references = self._yaml_modinfo_relations[row['effectID']]
             except KeyError:
-                continue
-            for references, tgt_table_name, tgt_column_name in (
-                (types, 'invtypes', 'typeID'),
-                (groups, 'invgroups', 'groupID'),
-                (attrs, 'dgmattribs', 'attributeID')
-            ):
-                # If there're any references for given entity, add them to
-                # dictionary
-                if len(references) > 0:
-                    tgt_values = tgt_data.setdefault((tgt_table_name, tgt_column_name), set())
-                    tgt_values.update(references)
+                pass
+            else:
+                for tgt_values, (tgt_table_name, tgt_column_name) in zip(yaml_references, YAML_TARGETS):
+                    for tgt_value in tgt_values:
+                        references.append((tgt_table_name, tgt_column_name, tgt_value))
+        return references
 
     @CachedProperty
     def _yaml_modinfo_relations(self):
@@ -19,11 +19,81 @@
 #===============================================================================
 
 
+import json
+import multiprocessing
+import os
+import os.path
 import re
+from hashlib import sha1
 
 from eos.const.eve import Attribute, Operand
-from eos.util.frozen_dict import FrozenDict
-from .modifier_builder import ModifierBuilder
+from eos.util.compact_row import CompactRow
+from eos.util.logger.abc import BaseLogger
+from .derivation import derive
+from .modifier_builder import MODIFIER_BUILDER_VERSION, ModifierBuilder
+
+
+# Modifier fields which are written into modifier rows
+MODIFIER_FIELDS = (
+    'state',
+    'scope',
+    'src_attr',
+    'operator',
+    'tgt_attr',
+    'domain',
+    'filter_type',
+    'filter_value'
+)
+
+
+class _LogRecorder(BaseLogger):
+    """
+    Logger which stores calls made to it, so that they
+    can be replayed on actual logger later.
+    """
+
+    def __init__(self):
+        # Format: [(method name, message, child name, signature)]
+        self.calls = []
+
+    def info(self, msg, child_name=None, signature=None):
+        self.calls.append(('info', msg, child_name, signature))
+
+    def warning(self, msg, child_name=None, signature=None):
+        self.calls.append(('warning', msg, child_name, signature))
+
+    def error(self, msg, child_name=None, signature=None):
+        self.calls.append(('error', msg, child_name, signature))
+
+
+# Version of format of file with modifier build results
+BUILD_MEMO_VERSION = 2
+
+
+# Modifier builder of worker process and its logger; workers
+# are forked, thus expression data is inherited, not transferred
+_worker_builder = None
+_worker_log = None
+
+
+def _init_worker(expressions):
+    global _worker_builder, _worker_log
+    _worker_log = _LogRecorder()
+    _worker_builder = ModifierBuilder(expressions, _worker_log)
+
+
+def _build_effect_modifiers(effect_row):
+    """
+    Build modifiers of single effect in worker process.
+
+    Return value:
+    Tuple with tuple of modifier field value tuples, effect build
+    status and list with calls made to logger during building
+    """
+    _worker_log.calls = []
+    modifiers, build_status = _worker_builder.build(effect_row)
+    modifier_values = tuple(tuple(getattr(modifier, field) for field in MODIFIER_FIELDS) for modifier in modifiers)
+    return modifier_values, build_status, _worker_log.calls
 
 
 class Converter:
@@ -31,10 +101,87 @@ class Converter:
     Class responsible for transforming data structure,
     like moving data around or converting whole data
     structure.
+
+    Required arguments:
+    logger -- logger to use for errors
+
+    Optional arguments:
+    processes -- number of processes to use for building
+    modifiers. When more than 1, worker processes are forked;
+    output, including log messages and their order, does not
+    depend on this value. Default is 1.
+
+    Results of modifier building are remembered along with hashes
+    of effect data and expression trees it was built from, and of
+    modifier builder version; when the same converter is used again, modifiers are rebuilt only for
+    effects whose data or any of expressions in trees changed. To
+    reuse results across processes, save them to file and load them
+    in other converter.
     """
 
-    def __init__(self, logger):
+    def __init__(self, logger, processes=1):
         self._logger = logger
+        self._processes = processes
+        # Format: {effect ID: (content hash, modifier values, build status, log calls)}
+        self._build_memo = {}
+
+    def load_build_memo(self, path):
+        """
+        Load results of modifier building saved earlier. If file
+        doesn't exist or cannot be read, nothing is loaded.
+
+        Required arguments:
+        path -- path to file with results
+        """
+        if not os.path.exists(path):
+            return
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                saved = json.load(file)
+            if saved['version'] != BUILD_MEMO_VERSION:
+                raise ValueError('unsupported build memo format')
+            build_memo = {}
+            # JSON has neither integer keys nor tuples, restore them
+            for effect_id, (content_hash, modifier_values, build_status, log_calls) in saved['memo'].items():
+                build_memo[int(effect_id)] = (
+                    content_hash,
+                    tuple(tuple(values) for values in modifier_values),
+                    build_status,
+                    [tuple(call) for call in log_calls]
+                )
+        except KeyboardInterrupt:
+            raise
+        except:
+            msg = 'error during reading modifier build results, rebuilding all modifiers'
+            self._logger.warning(msg, child_name='cache_generator')
+            return
+        self._build_memo = build_memo
+
+    def save_build_memo(self, path):
+        """
+        Save results of modifier building to file.
+
+        Required arguments:
+        path -- path to file with results
+        """
+        folder = os.path.dirname(path)
+        if folder and os.path.isdir(folder) is not True:
+            os.makedirs(folder, mode=0o755)
+        # Write into temporary file first, so that interrupted
+        # write doesn't leave broken file in place
+        memo = {}
+        for effect_id, (content_hash, modifier_values, build_status, log_calls) in self._build_memo.items():
+            # Signatures are arbitrary hashable objects, store their
+            # string representations, which are unique as well
+            log_calls = [
+                (method_name, msg, child_name, None if signature is None else repr(signature))
+                for method_name, msg, child_name, signature in log_calls
+            ]
+            memo[effect_id] = (content_hash, modifier_values, build_status, log_calls)
+        tmp_path = '{}.tmp'.format(path)
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump({'version': BUILD_MEMO_VERSION, 'memo': memo}, file)
+        os.replace(tmp_path, path)
 
     def normalize(self, data):
         """ Make data more consistent."""
@@ -83,14 +230,14 @@ class Converter:
                         attrs_skipped += 1
                         continue
                     # Generate row and add it to proper attribute table
-                    dgmtypeattribs.add(FrozenDict({
+                    dgmtypeattribs.add(CompactRow({
                         'typeID': type_id,
                         'attributeID': attr_id,
                         'value': value
                     }))
                 else:
                     new_row[field] = value
-            new_invtypes.add(FrozenDict(new_row))
+            new_invtypes.add(CompactRow(new_row))
         # Update invtypes with rows which do not contain attributes
         self.data['invtypes'].clear()
         self.data['invtypes'].update(new_invtypes)
@@ -153,13 +300,9 @@ class Converter:
                             id_column, sym_name, ', '.join(str(i) for i in repl_ids), repl_id)
                         self._logger.warning(msg, child_name='cache_generator')
                         warned_conflicts.add(sym_name)
-                # As rows are frozen dicts, we compose new mutable dict, update
-                # data there, freeze it, and add to replacement maps
-                new_exp_row = {}
-                new_exp_row.update(exp_row)
-                new_exp_row['expressionValue'] = None
-                new_exp_row[tgt_column] = repl_id
-                new_exp_row = FrozenDict(new_exp_row)
+                # As rows are immutable, compose new row with
+                # updated data and replace old one with it
+                new_exp_row = exp_row._replace(**{'expressionValue': None, tgt_column: repl_id})
                 dgmexpressions.remove(exp_row)
                 dgmexpressions.add(new_exp_row)
                 successes += 1
@@ -176,6 +319,7 @@ class Converter:
         """
         data = self._assemble(data)
         self._build_modifiers(data)
+        derive(data)
         return data
 
     def _assemble(self, data):
@@ -269,7 +413,6 @@ class Converter:
         Replace expressions with generated out of
         them modifiers.
         """
-        builder = ModifierBuilder(data['expressions'], self._logger)
         # Lists effects, which are using given modifier
         # Format: {modifier row: [effect IDs]}
         modifier_effect_map = {}
@@ -278,18 +421,19 @@ class Converter:
         modifier_id_map = {}
         modifier_id = 1
         # Sort rows by ID so we numerate modifiers in deterministic way
-        for effect_row in sorted(data['effects'], key=lambda row: row['effect_id']):
-            modifiers, build_status = builder.build(effect_row)
+        effect_rows = sorted(data['effects'], key=lambda row: row['effect_id'])
+        build_results = self._run_builder(data['expressions'], effect_rows)
+        for effect_row, (modifier_values, build_status) in zip(effect_rows, build_results):
             # Update effects: add modifier build status and remove
             # fields which we needed only for this process
             effect_row['build_status'] = build_status
             del effect_row['pre_expression']
             del effect_row['post_expression']
             del effect_row['modifier_info']
-            for modifier in modifiers:
+            for values in modifier_values:
                 # Convert modifiers into frozen datarows to use
                 # them in conversion process
-                frozen_modifier = self._freeze_modifier(modifier)
+                frozen_modifier = CompactRow(dict(zip(MODIFIER_FIELDS, values)))
                 # Gather data about which effects use which modifier
                 used_by_effects = modifier_effect_map.setdefault(frozen_modifier, [])
                 used_by_effects.append(effect_row['effect_id'])
@@ -323,24 +467,135 @@ class Converter:
             modifiers.append(modifier)
         data['modifiers'] = modifiers
 
-    def _freeze_modifier(self, modifier):
+    def _run_builder(self, expressions, effect_rows):
+        """
+        Build modifiers for passed effects, reusing results of
+        previous runs for effects whose inputs did not change.
+
+        Required arguments:
+        expressions -- iterable with expression rows
+        effect_rows -- list with effect rows
+
+        Return value:
+        List with tuples, containing tuple of modifier field value tuples
+        (in MODIFIER_FIELDS order) and effect build status, in order of
+        passed effect rows
         """
-        Converts modifier into frozendict with its keys and
-        values assigned according to modifier's ones.
+        expression_map = {}
+        for expression_row in expressions:
+            expression_map[expression_row['expressionID']] = expression_row
+        expression_hashes = {}
+        content_hashes = []
+        to_build = []
+        for effect_row in effect_rows:
+            content_hash = self._get_effect_hash(effect_row, expression_map, expression_hashes)
+            content_hashes.append(content_hash)
+            try:
+                memo_hash = self._build_memo[effect_row['effect_id']][0]
+            except KeyError:
+                memo_hash = None
+            if memo_hash != content_hash:
+                to_build.append(effect_row)
+        if self._build_memo:
+            msg = 'rebuilding modifiers for {} of {} effects'.format(len(to_build), len(effect_rows))
+            self._logger.info(msg, child_name='cache_generator')
+        built = iter(self._build(expressions, to_build))
+        build_memo = {}
+        results = []
+        for effect_row, content_hash in zip(effect_rows, content_hashes):
+            effect_id = effect_row['effect_id']
+            try:
+                memo_entry = self._build_memo[effect_id]
+            except KeyError:
+                memo_entry = None
+            if memo_entry is None or memo_entry[0] != content_hash:
+                memo_entry = (content_hash,) + next(built)
+            build_memo[effect_id] = memo_entry
+            _, modifier_values, build_status, log_calls = memo_entry
+            # Replay log messages in the same order they would
+            # appear if all effects were built serially
+            for method_name, msg, child_name, signature in log_calls:
+                getattr(self._logger, method_name)(msg, child_name=child_name, signature=signature)
+            results.append((modifier_values, build_status))
+        self._build_memo = build_memo
+        return results
+
+    def _build(self, expressions, effect_rows):
+        """
+        Build modifiers for passed effects, in one or multiple
+        processes.
+
+        Required arguments:
+        expressions -- iterable with expression rows
+        effect_rows -- list with effect rows
+
+        Return value:
+        List with tuples, containing tuple of modifier field value
+        tuples, effect build status and list with calls made to
+        logger during building, in order of passed effect rows
+        """
+        if self._processes > 1 and len(effect_rows) > 1:
+            context = multiprocessing.get_context('fork')
+            chunk_size = max(len(effect_rows) // (self._processes * 4), 1)
+            with context.Pool(self._processes, initializer=_init_worker, initargs=(expressions,)) as pool:
+                return list(pool.imap(_build_effect_modifiers, effect_rows, chunksize=chunk_size))
+        builder_log = _LogRecorder()
+        builder = ModifierBuilder(expressions, builder_log)
+        results = []
+        for effect_row in effect_rows:
+            builder_log.calls = []
+            modifiers, build_status = builder.build(effect_row)
+            modifier_values = tuple(
+                tuple(getattr(modifier, field) for field in MODIFIER_FIELDS)
+                for modifier in modifiers
+            )
+            results.append((modifier_values, build_status, builder_log.calls))
+        return results
+
+    def _get_effect_hash(self, effect_row, expression_map, expression_hashes):
+        """
+        Get hash of all data modifier building of effect
+        depends on, including version of modifier builder.
+
+        Required arguments:
+        effect_row -- effect row to get hash for
+        expression_map -- expression rows in {expression ID: row} format
+        expression_hashes -- already calculated expression tree hashes,
+        in {expression ID: hash} format; it is updated by this method
         """
-        # Fields which we need to write into row
-        fields = (
-            'state',
-            'scope',
-            'src_attr',
-            'operator',
-            'tgt_attr',
-            'domain',
-            'filter_type',
-            'filter_value'
+        content = (
+            MODIFIER_BUILDER_VERSION,
+            effect_row['effect_id'],
+            effect_row['effect_category'],
+            effect_row['modifier_info'],
+            self._get_expression_hash(effect_row['pre_expression'], expression_map, expression_hashes),
+            self._get_expression_hash(effect_row['post_expression'], expression_map, expression_hashes)
         )
-        modifier_row = {}
-        for field in fields:
-            modifier_row[field] = getattr(modifier, field)
-        frozen_row = FrozenDict(modifier_row)
-        return frozen_row
+        return sha1(repr(content).encode('utf-8')).hexdigest()
+
+    def _get_expression_hash(self, expression_id, expression_map, expression_hashes):
+        """
+        Get hash of expression tree with root at passed expression ID,
+        which covers contents of all expressions referenced by the tree.
+        """
+        if expression_id is None:
+            return None
+        try:
+            return expression_hashes[expression_id]
+        except KeyError:
+            pass
+        # Guard against reference loops in broken data
+        expression_hashes[expression_id] = None
+        try:
+            expression_row = expression_map[expression_id]
+        except KeyError:
+            content = (expression_id, None)
+        else:
+            content = (
+                sorted((key, value) for key, value in expression_row.items() if key != 'table_pos'),
+                self._get_expression_hash(expression_row.get('arg1'), expression_map, expression_hashes),
+                self._get_expression_hash(expression_row.get('arg2'), expression_map, expression_hashes)
+            )
+        expression_hash = sha1(repr(content).encode('utf-8')).hexdigest()
+        expression_hashes[expression_id] = expression_hash
+        return expression_hash
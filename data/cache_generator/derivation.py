@@ -0,0 +1,64 @@
+#===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+#===============================================================================
+
+
+from eos.data.cache_object import Type, Effect
+
+
+def derive(data):
+    """
+    Compute data which can be derived from already converted
+    types and effects, so that cache handlers can pass it to
+    objects as-is instead of recalculating it every time object
+    is assembled. Derived data is composed using the same logic
+    objects use when it is not available.
+
+    Required arguments:
+    data -- converted data, rows are updated in place
+    """
+    # Format: {effect ID: (effect, effect row)}
+    effects = {}
+    for effect_row in data['effects']:
+        effect = Effect(effect_id=effect_row['effect_id'], category=effect_row['effect_category'])
+        # Effects with unknown category do not have state
+        try:
+            effect_row['state'] = effect._state
+        except KeyError:
+            effect_row['state'] = None
+        effects[effect.id] = (effect, effect_row)
+    for type_row in data['types']:
+        type_effects = []
+        stateful_effects = []
+        modifier_ids = []
+        for effect_id in type_row['effects']:
+            try:
+                effect, effect_row = effects[effect_id]
+            except KeyError:
+                continue
+            type_effects.append(effect)
+            if effect_row['state'] is not None:
+                stateful_effects.append(effect)
+            modifier_ids.extend(effect_row['modifiers'])
+        type_ = Type(attributes=type_row['attributes'], effects=type_effects)
+        type_row['required_skills'] = type_.required_skills
+        type_row['slots'] = sorted(type_.slots)
+        type_row['max_state'] = Type(effects=stateful_effects).max_state
+        type_row['is_targeted'] = type_.is_targeted
+        type_row['modifiers'] = modifier_ids
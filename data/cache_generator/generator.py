@@ -19,7 +19,7 @@
 #===============================================================================
 
 
-from eos.util.frozen_dict import FrozenDict
+from eos.util.compact_row import CompactRow
 from .checker import Checker
 from .cleaner import Cleaner
 from .converter import Converter
@@ -32,12 +32,24 @@ class CacheGenerator:
 
     Positional keywords:
     logger -- logger to use for errors
+
+    Optional arguments:
+    processes -- number of processes to use for building
+    modifiers, the most expensive stage of generation.
+    Output does not depend on this value. Default is 1.
+    memo_path -- path to file where results of modifier
+    building are stored between runs. When specified, they
+    are loaded before generation, and only modifiers of
+    effects changed since then are rebuilt; updated results
+    are saved afterwards. Default is None.
     """
 
-    def __init__(self, logger):
+    def __init__(self, logger, processes=1, memo_path=None):
         self._checker = Checker(logger)
         self._cleaner = Cleaner(logger)
-        self._converter = Converter(logger)
+        self._converter = Converter(logger, processes=processes)
+        self._memo_path = memo_path
+        self.__memo_loaded = False
 
     def run(self, data_handler):
         """
@@ -52,10 +64,11 @@ class CacheGenerator:
         """
         # Put all the data we need into single dictionary
         # Format, as usual, {table name: table}, where table
-        # is set of rows, which are represented by frozendicts
+        # is set of rows, which are represented by compact rows
         # {fieldName: fieldValue}. Combination of sets and
-        # frozendicts is used to speed up several stages of
-        # the generator.
+        # hashable rows is used to speed up several stages of
+        # the generator, while compact rows keep memory usage
+        # low for large tables.
         data = {}
         tables = {
             'invtypes': data_handler.get_invtypes,
@@ -70,7 +83,7 @@ class CacheGenerator:
         for tablename, method in tables.items():
             table_pos = 0
             # For faster processing of various operations,
-            # freeze table rows and put them into set
+            # make table rows hashable and put them into set
             table = set()
             for row in method():
                 # During  further generator stages. some of rows
@@ -80,7 +93,7 @@ class CacheGenerator:
                 # to each row
                 row['table_pos'] = table_pos
                 table_pos += 1
-                table.add(FrozenDict(row))
+                table.add(CompactRow(row))
             data[tablename] = table
 
         # Run pre-cleanup checks, as cleaning and further stages
@@ -97,9 +110,18 @@ class CacheGenerator:
         # Verify that our data is ready for conversion
         self._checker.pre_convert(data)
 
+        # Load results of previous runs only when generation
+        # is needed, and only once per generator
+        if self._memo_path is not None and self.__memo_loaded is not True:
+            self._converter.load_build_memo(self._memo_path)
+            self.__memo_loaded = True
+
         # Convert data into Eos-specific format. Here tables are
-        # no longer represented by sets of frozendicts, but by
+        # no longer represented by sets of compact rows, but by
         # list of dicts
         data = self._converter.convert(data)
 
+        if self._memo_path is not None:
+            self._converter.save_build_memo(self._memo_path)
+
         return data
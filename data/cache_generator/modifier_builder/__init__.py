@@ -25,4 +25,4 @@ which help it to work with raw data.
 """
 
 
-from .builder import ModifierBuilder
+from .builder import MODIFIER_BUILDER_VERSION, ModifierBuilder
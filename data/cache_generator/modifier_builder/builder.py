@@ -23,6 +23,12 @@ from .expression_tree import Effect2Modifiers
 from .modifier_info import Info2Modifiers
 
 
+# Version of modifier building logic; it must be incremented on
+# any change which affects generated modifiers, as results of
+# previous builds are reused when effect data is unchanged
+MODIFIER_BUILDER_VERSION = 1
+
+
 class ModifierBuilder:
     """
     Class which is used for generating Eos modifiers out of
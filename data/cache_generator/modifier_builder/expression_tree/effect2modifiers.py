@@ -37,6 +37,17 @@ class Effect2Modifiers:
         self._etree2actions = ETree2Actions(expressions)
         self._logger = logger
 
+    @property
+    def stats(self):
+        """
+        Get statistics of expression subtree reuse across
+        conversions.
+
+        Return value:
+        ConversionStats named tuple
+        """
+        return self._etree2actions.stats
+
     def convert(self, effect_row):
         """Generate Modifier objects out of passed data."""
         try:
@@ -19,6 +19,9 @@
 #===============================================================================
 
 
+from collections import namedtuple
+from copy import copy
+
 from eos.const.eos import Domain, Operator
 from eos.const.eve import Operand
 from .action import Action
@@ -26,10 +29,16 @@ from .exception import ETree2ActionError, ExpressionFetchError, ActionValidation
 from .shared import operand_data, state_data
 
 
+ConversionStats = namedtuple('ConversionStats', ('hits', 'misses', 'size'))
+
+
 class ETree2Actions:
     """
     Class is responsible for converting tree of Expression objects (which
     aren't directly useful to us) into intermediate Action objects.
+
+    Results of conversion of successfully parsed subtrees are memoized
+    per expression ID, as many effects share the same subtrees.
     """
 
     def __init__(self, expressions):
@@ -38,6 +47,20 @@ class ETree2Actions:
         self._expressions = {}
         for exp_row in expressions:
             self._expressions[exp_row['expressionID']] = exp_row
+        # Format: {expression ID: (actions, skipped data flag)}
+        self._memo = {}
+        self._memo_hits = 0
+        self._memo_misses = 0
+
+    @property
+    def stats(self):
+        """
+        Get statistics of subtree memoization.
+
+        Return value:
+        ConversionStats named tuple
+        """
+        return ConversionStats(hits=self._memo_hits, misses=self._memo_misses, size=len(self._memo))
 
     def convert(self, tree_root_id, effect_category_id):
         """
@@ -58,6 +81,9 @@ class ETree2Actions:
         # Run parsing process
         tree_root = self._get_exp(tree_root_id)
         self._generic(tree_root)
+        # Memoized actions are shared between trees, give each
+        # caller its own copies
+        self._actions = [copy(action) for action in self._actions]
         # Validate generated actions
         for action in self._actions:
             if self.validate_action(action, effect_category_id) is not True:
@@ -66,6 +92,29 @@ class ETree2Actions:
 
     def _generic(self, expression):
         """Generic entry point, used if we expect passed node to be meaningful"""
+        expression_id = expression.get('expressionID')
+        try:
+            actions, skipped_data = self._memo[expression_id]
+        except KeyError:
+            self._memo_misses += 1
+            # Collect results of subtree separately; on failure
+            # nothing is memoized, and exception propagates
+            outer_actions, outer_skipped_data = self._actions, self._skipped_data
+            self._actions, self._skipped_data = [], False
+            try:
+                self._generic_uncached(expression)
+                actions, skipped_data = tuple(self._actions), self._skipped_data
+            finally:
+                self._actions, self._skipped_data = outer_actions, outer_skipped_data
+            self._memo[expression_id] = (actions, skipped_data)
+        else:
+            self._memo_hits += 1
+        self._actions.extend(actions)
+        if skipped_data is True:
+            self._skipped_data = True
+
+    def _generic_uncached(self, expression):
+        """Convert meaningful node, without using memoized results"""
         operand_id = expression.get('operandID')
         try:
             operand_meta = operand_data[operand_id]
@@ -19,9 +19,11 @@
 #===============================================================================
 
 
+from .binary_cache_handler import BinaryCacheHandler
 from .json_cache_handler import JsonCacheHandler
 
 
 __all__ = [
+    'BinaryCacheHandler',
     'JsonCacheHandler'
 ]
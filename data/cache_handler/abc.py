@@ -61,3 +61,75 @@ class BaseCacheHandler(metaclass=ABCMeta):
         fingerprint -- unique ID of data in the form of string
         """
         ...
+
+    def _strip_data(self, data):
+        """
+        Rework passed data, keying it and stripping dictionary
+        keys from rows for performance. Used by handlers to
+        make light version of data before storing it.
+        """
+        slim_data = {}
+
+        slim_types = {}
+        for type_row in data['types']:
+            type_id = type_row['type_id']
+            slim_types[type_id] = (
+                type_row['group'],
+                type_row['category'],
+                tuple(type_row['attributes'].items()),  # Dictionary -> tuple
+                tuple(type_row['effects']),  # List -> tuple
+                type_row['default_effect'],
+                tuple(type_row['required_skills'].items()),  # Dictionary -> tuple
+                tuple(type_row['slots']),  # List -> tuple
+                type_row['max_state'],
+                type_row['is_targeted'],
+                tuple(type_row['modifiers'])  # List -> tuple
+            )
+        slim_data['types'] = slim_types
+
+        slim_attribs = {}
+        for attr_row in data['attributes']:
+            attribute_id = attr_row['attribute_id']
+            slim_attribs[attribute_id] = (
+                attr_row['max_attribute'],
+                attr_row['default_value'],
+                attr_row['high_is_good'],
+                attr_row['stackable']
+            )
+        slim_data['attributes'] = slim_attribs
+
+        slim_effects = {}
+        for effect_row in data['effects']:
+            effect_id = effect_row['effect_id']
+            slim_effects[effect_id] = (
+                effect_row['effect_category'],
+                effect_row['is_offensive'],
+                effect_row['is_assistance'],
+                effect_row['duration_attribute'],
+                effect_row['discharge_attribute'],
+                effect_row['range_attribute'],
+                effect_row['falloff_attribute'],
+                effect_row['tracking_speed_attribute'],
+                effect_row['fitting_usage_chance_attribute'],
+                effect_row['build_status'],
+                tuple(effect_row['modifiers']),  # List -> tuple
+                effect_row['state']
+            )
+        slim_data['effects'] = slim_effects
+
+        slim_modifiers = {}
+        for modifier_row in data['modifiers']:
+            modifier_id = modifier_row['modifier_id']
+            slim_modifiers[modifier_id] = (
+                modifier_row['state'],
+                modifier_row['scope'],
+                modifier_row['src_attr'],
+                modifier_row['operator'],
+                modifier_row['tgt_attr'],
+                modifier_row['domain'],
+                modifier_row['filter_type'],
+                modifier_row['filter_value']
+            )
+        slim_data['modifiers'] = slim_modifiers
+
+        return slim_data
@@ -0,0 +1,411 @@
+#===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+#===============================================================================
+
+
+import mmap
+import os.path
+import struct
+
+from eos.const.eos import State, Slot
+from eos.data.cache_object import *
+from eos.util.object_cache import ObjectCache
+from .abc import BaseCacheHandler
+from .exception import TypeFetchError, AttributeFetchError, EffectFetchError, ModifierFetchError
+
+
+# File starts with magic, format version and length
+# of fingerprint string, which follows header
+HEADER = struct.Struct('<4sHI')
+MAGIC = b'EOSB'
+FORMAT_VERSION = 2
+# Section table entry: offset of section index and
+# amount of records in section
+SECTION = struct.Struct('<QI')
+# Order in which sections are written into file
+SECTIONS = ('types', 'attributes', 'effects', 'modifiers')
+# Index entry: entity ID, offset of its record and
+# record length; entries are sorted by entity ID
+INDEX_ENTRY = struct.Struct('<qQI')
+
+# Tags which describe type of encoded value
+TAG_NONE = b'n'
+TAG_TRUE = b't'
+TAG_FALSE = b'f'
+TAG_INT = b'i'
+TAG_FLOAT = b'd'
+TAG_TUPLE = b'u'
+INT = struct.Struct('<q')
+FLOAT = struct.Struct('<d')
+COUNT = struct.Struct('<I')
+
+
+def _encode_value(value, buffer):
+    """
+    Append binary representation of value to buffer.
+
+    Required arguments:
+    value -- value to encode; can be None, boolean, integer,
+    float or tuple/list of values of these types
+    buffer -- bytearray to write data to
+    """
+    if value is None:
+        buffer += TAG_NONE
+    # Booleans are checked before integers, as they
+    # are subclass of int
+    elif value is True:
+        buffer += TAG_TRUE
+    elif value is False:
+        buffer += TAG_FALSE
+    elif isinstance(value, int):
+        buffer += TAG_INT
+        buffer += INT.pack(value)
+    elif isinstance(value, float):
+        buffer += TAG_FLOAT
+        buffer += FLOAT.pack(value)
+    elif isinstance(value, (tuple, list)):
+        buffer += TAG_TUPLE
+        buffer += COUNT.pack(len(value))
+        for item in value:
+            _encode_value(item, buffer)
+    else:
+        raise TypeError('unable to encode value of type {}'.format(type(value)))
+
+
+def _decode_value(data, offset):
+    """
+    Decode single value from binary data.
+
+    Required arguments:
+    data -- buffer with data
+    offset -- position at which value starts
+
+    Return value:
+    Tuple with decoded value and position right after it
+    """
+    tag = data[offset:offset + 1]
+    offset += 1
+    if tag == TAG_INT:
+        return INT.unpack_from(data, offset)[0], offset + INT.size
+    elif tag == TAG_FLOAT:
+        return FLOAT.unpack_from(data, offset)[0], offset + FLOAT.size
+    elif tag == TAG_TUPLE:
+        count = COUNT.unpack_from(data, offset)[0]
+        offset += COUNT.size
+        items = []
+        for _ in range(count):
+            item, offset = _decode_value(data, offset)
+            items.append(item)
+        return tuple(items), offset
+    elif tag == TAG_NONE:
+        return None, offset
+    elif tag == TAG_TRUE:
+        return True, offset
+    elif tag == TAG_FALSE:
+        return False, offset
+    raise ValueError('unknown value tag {}'.format(tag))
+
+
+class BinaryCacheHandler(BaseCacheHandler):
+    """
+    This cache handler implements on-disk cache store in the form
+    of binary file with fixed layout. File is memory-mapped, and
+    records are decoded on request using per-entity offset index,
+    thus startup is cheap and processes forked after cache handler
+    initialization share the same memory pages. Assembled objects
+    are kept in object cache.
+
+    Required arguments:
+    cache_path -- file name where on-disk cache will be stored
+    logger -- logger to use for errors
+
+    Optional arguments:
+    obj_cache_size -- amount of recently used assembled objects of
+    each kind to keep alive; None pins all objects, 0 keeps only weak
+    references. Default is 5000.
+    """
+
+    def __init__(self, cache_path, logger, obj_cache_size=5000):
+        self._cache_path = cache_path
+        self._logger = logger
+        self.__mmap = None
+        # Format: {section name: (index offset, record amount)}
+        self.__sections = {}
+        self.__fingerprint = None
+        # Initialize object cache
+        self.__type_obj_cache = ObjectCache(obj_cache_size)
+        self.__attribute_obj_cache = ObjectCache(obj_cache_size)
+        self.__effect_obj_cache = ObjectCache(obj_cache_size)
+        self.__modifier_obj_cache = ObjectCache(obj_cache_size)
+
+        # If cache doesn't exist, silently finish initialization
+        if not os.path.exists(self._cache_path):
+            return
+        try:
+            self.__open_mmap()
+        except KeyboardInterrupt:
+            raise
+        # If file is corrupt or anything else bad happens,
+        # do not load anything and leave values as initialized
+        except:
+            self.__close_mmap()
+            msg = 'error during reading cache'
+            self._logger.error(msg, child_name='cache_handler')
+
+    def get_type(self, type_id):
+        try:
+            type_id = int(type_id)
+        except TypeError as e:
+            raise TypeFetchError(type_id) from e
+        try:
+            type_ = self.__type_obj_cache[type_id]
+        except KeyError:
+            type_data = self.__get_record('types', type_id, TypeFetchError)
+            type_ = Type(
+                type_id=type_id,
+                group=type_data[0],
+                category=type_data[1],
+                attributes={attr_id: attr_val for attr_id, attr_val in type_data[2]},
+                effects=tuple(self.get_effect(effect_id) for effect_id in type_data[3]),
+                default_effect=None if type_data[4] is None else self.get_effect(type_data[4]),
+                required_skills={skill_id: skill_lvl for skill_id, skill_lvl in type_data[5]},
+                slots={Slot(slot) for slot in type_data[6]},
+                max_state=State(type_data[7]),
+                is_targeted=type_data[8],
+                modifiers=tuple(self.get_modifier(modifier_id) for modifier_id in type_data[9])
+            )
+            self.__type_obj_cache[type_id] = type_
+        return type_
+
+    def get_attribute(self, attr_id):
+        try:
+            attr_id = int(attr_id)
+        except TypeError as e:
+            raise AttributeFetchError(attr_id) from e
+        try:
+            attribute = self.__attribute_obj_cache[attr_id]
+        except KeyError:
+            attr_data = self.__get_record('attributes', attr_id, AttributeFetchError)
+            attribute = Attribute(
+                attribute_id=attr_id,
+                max_attribute=attr_data[0],
+                default_value=attr_data[1],
+                high_is_good=attr_data[2],
+                stackable=attr_data[3]
+            )
+            self.__attribute_obj_cache[attr_id] = attribute
+        return attribute
+
+    def get_effect(self, effect_id):
+        try:
+            effect_id = int(effect_id)
+        except TypeError as e:
+            raise EffectFetchError(effect_id) from e
+        try:
+            effect = self.__effect_obj_cache[effect_id]
+        except KeyError:
+            effect_data = self.__get_record('effects', effect_id, EffectFetchError)
+            effect = Effect(
+                effect_id=effect_id,
+                category=effect_data[0],
+                is_offensive=effect_data[1],
+                is_assistance=effect_data[2],
+                duration_attribute=effect_data[3],
+                discharge_attribute=effect_data[4],
+                range_attribute=effect_data[5],
+                falloff_attribute=effect_data[6],
+                tracking_speed_attribute=effect_data[7],
+                fitting_usage_chance_attribute=effect_data[8],
+                build_status=effect_data[9],
+                modifiers=tuple(self.get_modifier(modifier_id) for modifier_id in effect_data[10]),
+                state=None if effect_data[11] is None else State(effect_data[11])
+            )
+            self.__effect_obj_cache[effect_id] = effect
+        return effect
+
+    def get_modifier(self, modifier_id):
+        try:
+            modifier_id = int(modifier_id)
+        except TypeError as e:
+            raise ModifierFetchError(modifier_id) from e
+        try:
+            modifier = self.__modifier_obj_cache[modifier_id]
+        except KeyError:
+            modifier_data = self.__get_record('modifiers', modifier_id, ModifierFetchError)
+            modifier = Modifier(
+                modifier_id=modifier_id,
+                state=modifier_data[0],
+                scope=modifier_data[1],
+                src_attr=modifier_data[2],
+                operator=modifier_data[3],
+                tgt_attr=modifier_data[4],
+                domain=modifier_data[5],
+                filter_type=modifier_data[6],
+                filter_value=modifier_data[7]
+            )
+            self.__modifier_obj_cache[modifier_id] = modifier
+        return modifier
+
+    def get_fingerprint(self):
+        return self.__fingerprint
+
+    def get_obj_cache_stats(self):
+        """
+        Get object cache statistics.
+
+        Return value:
+        Dictionary in {table name: ObjectCacheStats} format
+        """
+        return {
+            'types': self.__type_obj_cache.stats,
+            'attributes': self.__attribute_obj_cache.stats,
+            'effects': self.__effect_obj_cache.stats,
+            'modifiers': self.__modifier_obj_cache.stats
+        }
+
+    def update_cache(self, data, fingerprint):
+        # Make light version of data and serialize it
+        binary_data = self.__serialize(self._strip_data(data), fingerprint)
+        # Update disk cache; write data into temporary file
+        # and put it in place of old one, so that processes
+        # which still have old file mapped are not affected
+        cache_folder = os.path.dirname(self._cache_path)
+        if os.path.isdir(cache_folder) is not True:
+            os.makedirs(cache_folder, mode=0o755)
+        tmp_path = '{}.tmp'.format(self._cache_path)
+        with open(tmp_path, 'wb') as file:
+            file.write(binary_data)
+        self.__close_mmap()
+        os.replace(tmp_path, self._cache_path)
+        self.__open_mmap()
+
+    def __serialize(self, slim_data, fingerprint):
+        """
+        Compose binary representation of cache.
+
+        Required arguments:
+        slim_data -- stripped data in {section name: {entity ID: record}}
+        format
+        fingerprint -- fingerprint string
+
+        Return value:
+        Bytes with file contents
+        """
+        fingerprint_bytes = fingerprint.encode('utf-8')
+        # Index data goes right after header, fingerprint and
+        # section table; records are written after all indexes
+        index_start = HEADER.size + len(fingerprint_bytes) + SECTION.size * len(SECTIONS)
+        record_start = index_start
+        for section_name in SECTIONS:
+            record_start += INDEX_ENTRY.size * len(slim_data[section_name])
+        section_table = bytearray()
+        indexes = bytearray()
+        records = bytearray()
+        for section_name in SECTIONS:
+            section = slim_data[section_name]
+            section_table += SECTION.pack(index_start + len(indexes), len(section))
+            for entity_id in sorted(section):
+                record_offset = record_start + len(records)
+                _encode_value(section[entity_id], records)
+                record_length = record_start + len(records) - record_offset
+                indexes += INDEX_ENTRY.pack(entity_id, record_offset, record_length)
+        binary_data = bytearray(HEADER.pack(MAGIC, FORMAT_VERSION, len(fingerprint_bytes)))
+        binary_data += fingerprint_bytes
+        binary_data += section_table
+        binary_data += indexes
+        binary_data += records
+        return bytes(binary_data)
+
+    def __open_mmap(self):
+        """
+        Map cache file into memory and read its header.
+        Also clears object cache to make sure objects
+        composed from old data are gone.
+        """
+        with open(self._cache_path, 'rb') as file:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.__mmap = data
+        magic, version, fingerprint_len = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError('unsupported cache file format')
+        offset = HEADER.size
+        fingerprint = data[offset:offset + fingerprint_len].decode('utf-8')
+        offset += fingerprint_len
+        sections = {}
+        for section_name in SECTIONS:
+            sections[section_name] = SECTION.unpack_from(data, offset)
+            offset += SECTION.size
+        self.__sections = sections
+        self.__fingerprint = fingerprint
+        self.__type_obj_cache.clear()
+        self.__attribute_obj_cache.clear()
+        self.__effect_obj_cache.clear()
+        self.__modifier_obj_cache.clear()
+
+    def __close_mmap(self):
+        """Unmap cache file and forget everything loaded from it."""
+        if self.__mmap is not None:
+            self.__mmap.close()
+        self.__mmap = None
+        self.__sections = {}
+        self.__fingerprint = None
+
+    def __get_record(self, section_name, entity_id, fetch_error):
+        """
+        Find record using binary search over section index
+        and decode it.
+
+        Required arguments:
+        section_name -- name of section to search in
+        entity_id -- ID of entity to find
+        fetch_error -- class of exception to raise when
+        record cannot be fetched
+
+        Return value:
+        Decoded record
+
+        Possible exceptions:
+        fetch_error -- raised when record cannot be found, or
+        data of cache file which contains it is damaged
+        """
+        try:
+            index_offset, record_amount = self.__sections[section_name]
+        except KeyError as e:
+            raise fetch_error(entity_id) from e
+        data = self.__mmap
+        low = 0
+        high = record_amount
+        try:
+            while low < high:
+                middle = (low + high) // 2
+                current_id, record_offset, _ = INDEX_ENTRY.unpack_from(
+                    data, index_offset + middle * INDEX_ENTRY.size)
+                if current_id < entity_id:
+                    low = middle + 1
+                elif current_id > entity_id:
+                    high = middle
+                else:
+                    return _decode_value(data, record_offset)[0]
+        # Reading past end of truncated file, or decoding
+        # garbage of otherwise damaged file
+        except (ValueError, struct.error, IndexError) as e:
+            msg = 'error during reading {} record {} from cache'.format(section_name, entity_id)
+            self._logger.error(msg, child_name='cache_handler')
+            raise fetch_error(entity_id) from e
+        raise fetch_error(entity_id)
@@ -22,60 +22,110 @@
 import bz2
 import json
 import os.path
-from weakref import WeakValueDictionary
+import struct
+from bisect import bisect_right
 
+from eos.const.eos import State, Slot
 from eos.data.cache_object import *
+from eos.util.object_cache import ObjectCache
 from .abc import BaseCacheHandler
 from .exception import TypeFetchError, AttributeFetchError, EffectFetchError, ModifierFetchError
 
 
+# In lazy mode, cache file starts with length of compressed
+# header, which contains fingerprint and chunk indexes
+LAZY_HEADER_LENGTH = struct.Struct('<Q')
+# Amount of rows stored in single chunk in lazy mode
+LAZY_CHUNK_SIZE = 500
+# Tables which are stored in cache
+TABLES = ('types', 'attributes', 'effects', 'modifiers')
+# Version of layout of stored rows; cache files with
+# other versions are not loaded, and thus get regenerated
+FORMAT_VERSION = 2
+
+
 class JsonCacheHandler(BaseCacheHandler):
     """
     This cache handler implements on-disk cache store in the form
     of compressed JSON. To improve performance further, it also
-    keeps loads data from on-disk cache to memory, and uses weakref
-    object cache for assembled objects.
+    keeps loads data from on-disk cache to memory, and uses object
+    cache for assembled objects, which keeps limited amount of recently
+    used objects alive even when nothing else uses them.
+
+    In lazy mode, each table is split into separately compressed
+    chunks, and only small ID->chunk index is loaded on startup;
+    chunks are decompressed and parsed when data from them is
+    requested for the first time.
 
     Required arguments:
     cache_path -- file name where on-disk cache will be stored (.json.bz2)
     logger -- logger to use for errors
+
+    Optional arguments:
+    lazy -- use chunked cache file and load its parts on demand,
+    default is False
+    obj_cache_size -- amount of recently used assembled objects of
+    each kind to keep alive; None pins all objects, 0 keeps only weak
+    references. Default is 5000.
     """
 
-    def __init__(self, cache_path, logger):
+    def __init__(self, cache_path, logger, lazy=False, obj_cache_size=5000):
         self._cache_path = cache_path
         self._logger = logger
+        self._lazy = lazy
         # Initialize memory data cache
-        self.__type_data_cache = {}
-        self.__attribute_data_cache = {}
-        self.__effect_data_cache = {}
-        self.__modifier_data_cache = {}
+        # Format: {table name: {JSON entity ID: row}}
+        self.__data_cache = {table_name: {} for table_name in TABLES}
+        # In lazy mode, stores chunk indexes and loaded chunks
+        # Format: {table name: ([first IDs of chunks], [(offset, length)])}
+        self.__chunk_index = {}
+        # Format: {(table name, chunk position): {JSON entity ID: row}}
+        self.__chunk_cache = {}
+        # In lazy mode, cache file is kept open, chunks
+        # are read from it using offset of chunk data
+        self.__lazy_file = None
+        self.__chunk_data_offset = None
         self.__fingerprint = None
-        # Initialize weakref object cache
-        self.__type_obj_cache = WeakValueDictionary()
-        self.__attribute_obj_cache = WeakValueDictionary()
-        self.__effect_obj_cache = WeakValueDictionary()
-        self.__modifier_obj_cache = WeakValueDictionary()
+        # Initialize object cache
+        self.__type_obj_cache = ObjectCache(obj_cache_size)
+        self.__attribute_obj_cache = ObjectCache(obj_cache_size)
+        self.__effect_obj_cache = ObjectCache(obj_cache_size)
+        self.__modifier_obj_cache = ObjectCache(obj_cache_size)
 
         # If cache doesn't exist, silently finish initialization
         if not os.path.exists(self._cache_path):
             return
         # Read JSON into local variable
         try:
-            with bz2.BZ2File(self._cache_path, 'r') as file:
-                json_data = file.read().decode('utf-8')
-                data = json.loads(json_data)
+            if lazy is True:
+                header = self.__open_lazy_file()
+                format_version = header.get('format_version')
+            else:
+                with bz2.BZ2File(self._cache_path, 'r') as file:
+                    json_data = file.read().decode('utf-8')
+                    data = json.loads(json_data)
+                format_version = data.get('format_version')
+            if format_version != FORMAT_VERSION:
+                raise ValueError('unsupported cache file format')
         except KeyboardInterrupt:
             raise
         # If file doesn't exist, JSON load errors occur, or
         # anything else bad happens, do not load anything
         # and leave values as initialized
         except:
+            self.__close_lazy_file()
             msg = 'error during reading cache'
             self._logger.error(msg, child_name='cache_handler')
         # Load data into data cache, if no errors occurred
         # during JSON reading/parsing
         else:
-            self.__update_mem_cache(data)
+            if lazy is True:
+                self.__update_chunk_index(header)
+            else:
+                self.__update_mem_cache(data)
+
+    def __del__(self):
+        self.__close_lazy_file()
 
     def get_type(self, type_id):
         try:
@@ -85,11 +135,8 @@ class JsonCacheHandler(BaseCacheHandler):
         try:
             type_ = self.__type_obj_cache[type_id]
         except KeyError:
-            # We do str(int(id)) here because JSON dictionaries
-            # always have strings as key
-            json_type_id = str(type_id)
             try:
-                type_data = self.__type_data_cache[json_type_id]
+                type_data = self.__get_data_row('types', type_id)
             except KeyError as e:
                 raise TypeFetchError(type_id) from e
             type_ = Type(
@@ -98,7 +145,12 @@ class JsonCacheHandler(BaseCacheHandler):
                 category=type_data[1],
                 attributes={attr_id: attr_val for attr_id, attr_val in type_data[2]},
                 effects=tuple(self.get_effect(effect_id) for effect_id in type_data[3]),
-                default_effect=None if type_data[4] is None else self.get_effect(type_data[4])
+                default_effect=None if type_data[4] is None else self.get_effect(type_data[4]),
+                required_skills={skill_id: skill_lvl for skill_id, skill_lvl in type_data[5]},
+                slots={Slot(slot) for slot in type_data[6]},
+                max_state=State(type_data[7]),
+                is_targeted=type_data[8],
+                modifiers=tuple(self.get_modifier(modifier_id) for modifier_id in type_data[9])
             )
             self.__type_obj_cache[type_id] = type_
         return type_
@@ -111,9 +163,8 @@ class JsonCacheHandler(BaseCacheHandler):
         try:
             attribute = self.__attribute_obj_cache[attr_id]
         except KeyError:
-            json_attr_id = str(attr_id)
             try:
-                attr_data = self.__attribute_data_cache[json_attr_id]
+                attr_data = self.__get_data_row('attributes', attr_id)
             except KeyError as e:
                 raise AttributeFetchError(attr_id) from e
             attribute = Attribute(
@@ -134,9 +185,8 @@ class JsonCacheHandler(BaseCacheHandler):
         try:
             effect = self.__effect_obj_cache[effect_id]
         except KeyError:
-            json_effect_id = str(effect_id)
             try:
-                effect_data = self.__effect_data_cache[json_effect_id]
+                effect_data = self.__get_data_row('effects', effect_id)
             except KeyError as e:
                 raise EffectFetchError(effect_id) from e
             effect = Effect(
@@ -151,7 +201,8 @@ class JsonCacheHandler(BaseCacheHandler):
                 tracking_speed_attribute=effect_data[7],
                 fitting_usage_chance_attribute=effect_data[8],
                 build_status=effect_data[9],
-                modifiers=tuple(self.get_modifier(modifier_id) for modifier_id in effect_data[10])
+                modifiers=tuple(self.get_modifier(modifier_id) for modifier_id in effect_data[10]),
+                state=None if effect_data[11] is None else State(effect_data[11])
             )
             self.__effect_obj_cache[effect_id] = effect
         return effect
@@ -164,9 +215,8 @@ class JsonCacheHandler(BaseCacheHandler):
         try:
             modifier = self.__modifier_obj_cache[modifier_id]
         except KeyError:
-            json_modifier_id = str(modifier_id)
             try:
-                modifier_data = self.__modifier_data_cache[json_modifier_id]
+                modifier_data = self.__get_data_row('modifiers', modifier_id)
             except KeyError as e:
                 raise ModifierFetchError(modifier_id) from e
             modifier = Modifier(
@@ -186,15 +236,36 @@ class JsonCacheHandler(BaseCacheHandler):
     def get_fingerprint(self):
         return self.__fingerprint
 
+    def get_obj_cache_stats(self):
+        """
+        Get object cache statistics.
+
+        Return value:
+        Dictionary in {table name: ObjectCacheStats} format
+        """
+        return {
+            'types': self.__type_obj_cache.stats,
+            'attributes': self.__attribute_obj_cache.stats,
+            'effects': self.__effect_obj_cache.stats,
+            'modifiers': self.__modifier_obj_cache.stats
+        }
+
     def update_cache(self, data, fingerprint):
         # Make light version of data and add fingerprint
         # to it
-        data = self.__strip_data(data)
+        data = self._strip_data(data)
         data['fingerprint'] = fingerprint
+        data['format_version'] = FORMAT_VERSION
         # Update disk cache
         cache_folder = os.path.dirname(self._cache_path)
         if os.path.isdir(cache_folder) is not True:
             os.makedirs(cache_folder, mode=0o755)
+        if self._lazy is True:
+            self.__close_lazy_file()
+            self.__write_lazy_cache(data)
+            header = self.__open_lazy_file()
+            self.__update_chunk_index(header)
+            return
         with bz2.BZ2File(self._cache_path, 'w') as file:
             json_data = json.dumps(data)
             file.write(json_data.encode('utf-8'))
@@ -205,71 +276,6 @@ class JsonCacheHandler(BaseCacheHandler):
         data = json.loads(json_data)
         self.__update_mem_cache(data)
 
-    def __strip_data(self, data):
-        """
-        Rework passed data, keying it and stripping dictionary
-        keys from rows for performance.
-        """
-        slim_data = {}
-
-        slim_types = {}
-        for type_row in data['types']:
-            type_id = type_row['type_id']
-            slim_types[type_id] = (
-                type_row['group'],
-                type_row['category'],
-                tuple(type_row['attributes'].items()),  # Dictionary -> tuple
-                tuple(type_row['effects']),  # List -> tuple
-                type_row['default_effect']
-            )
-        slim_data['types'] = slim_types
-
-        slim_attribs = {}
-        for attr_row in data['attributes']:
-            attribute_id = attr_row['attribute_id']
-            slim_attribs[attribute_id] = (
-                attr_row['max_attribute'],
-                attr_row['default_value'],
-                attr_row['high_is_good'],
-                attr_row['stackable']
-            )
-        slim_data['attributes'] = slim_attribs
-
-        slim_effects = {}
-        for effect_row in data['effects']:
-            effect_id = effect_row['effect_id']
-            slim_effects[effect_id] = (
-                effect_row['effect_category'],
-                effect_row['is_offensive'],
-                effect_row['is_assistance'],
-                effect_row['duration_attribute'],
-                effect_row['discharge_attribute'],
-                effect_row['range_attribute'],
-                effect_row['falloff_attribute'],
-                effect_row['tracking_speed_attribute'],
-                effect_row['fitting_usage_chance_attribute'],
-                effect_row['build_status'],
-                tuple(effect_row['modifiers'])  # List -> tuple
-            )
-        slim_data['effects'] = slim_effects
-
-        slim_modifiers = {}
-        for modifier_row in data['modifiers']:
-            modifier_id = modifier_row['modifier_id']
-            slim_modifiers[modifier_id] = (
-                modifier_row['state'],
-                modifier_row['scope'],
-                modifier_row['src_attr'],
-                modifier_row['operator'],
-                modifier_row['tgt_attr'],
-                modifier_row['domain'],
-                modifier_row['filter_type'],
-                modifier_row['filter_value']
-            )
-        slim_data['modifiers'] = slim_modifiers
-
-        return slim_data
-
     def __update_mem_cache(self, data):
         """
         Loads data into memory data cache.
@@ -277,14 +283,148 @@ class JsonCacheHandler(BaseCacheHandler):
         Required arguments:
         data -- dictionary with data to load
         """
-        self.__type_data_cache = data['types']
-        self.__attribute_data_cache = data['attributes']
-        self.__effect_data_cache = data['effects']
-        self.__modifier_data_cache = data['modifiers']
+        for table_name in TABLES:
+            self.__data_cache[table_name] = data[table_name]
         self.__fingerprint = data['fingerprint']
-        # Also clear object cache to make sure objects composed
-        # from old data are gone
+        self.__clear_obj_cache()
+
+    def __clear_obj_cache(self):
+        """
+        Clear object cache to make sure objects composed
+        from old data are gone.
+        """
         self.__type_obj_cache.clear()
         self.__attribute_obj_cache.clear()
         self.__effect_obj_cache.clear()
         self.__modifier_obj_cache.clear()
+
+    def __get_data_row(self, table_name, entity_id):
+        """
+        Get data row from memory data cache, loading
+        chunk which contains it in lazy mode.
+
+        Required arguments:
+        table_name -- name of table which contains row
+        entity_id -- integer ID of entity
+
+        Possible exceptions:
+        KeyError -- raised when row cannot be found, or
+        chunk which should contain it cannot be read
+        """
+        # We do str(int(id)) here because JSON dictionaries
+        # always have strings as key
+        json_entity_id = str(entity_id)
+        if self._lazy is not True:
+            return self.__data_cache[table_name][json_entity_id]
+        try:
+            first_ids, chunk_specs = self.__chunk_index[table_name]
+        except KeyError as e:
+            raise KeyError(entity_id) from e
+        # Find the only chunk which may contain requested ID
+        chunk_pos = bisect_right(first_ids, entity_id) - 1
+        if chunk_pos < 0:
+            raise KeyError(entity_id)
+        chunk_key = (table_name, chunk_pos)
+        try:
+            chunk = self.__chunk_cache[chunk_key]
+        except KeyError:
+            try:
+                chunk = self.__read_lazy_chunk(*chunk_specs[chunk_pos])
+            # Reading errors, and errors of decompression (OSError,
+            # EOFError) and parsing (ValueError) of damaged data
+            except (OSError, EOFError, ValueError) as e:
+                raise KeyError(entity_id) from e
+            self.__chunk_cache[chunk_key] = chunk
+        return chunk[json_entity_id]
+
+    def __write_lazy_cache(self, data):
+        """
+        Write stripped data to disk in chunked form.
+
+        Required arguments:
+        data -- stripped data with fingerprint
+
+        """
+        header = {'fingerprint': data['fingerprint'], 'format_version': data['format_version'], 'tables': {}}
+        chunks = []
+        chunk_offset = 0
+        for table_name in TABLES:
+            table = data[table_name]
+            entity_ids = sorted(table)
+            # Format: [[first entity ID, offset, length]]
+            table_index = []
+            for chunk_start in range(0, len(entity_ids), LAZY_CHUNK_SIZE):
+                chunk_ids = entity_ids[chunk_start:chunk_start + LAZY_CHUNK_SIZE]
+                chunk_data = {entity_id: table[entity_id] for entity_id in chunk_ids}
+                chunk = bz2.compress(json.dumps(chunk_data).encode('utf-8'))
+                table_index.append([chunk_ids[0], chunk_offset, len(chunk)])
+                chunks.append(chunk)
+                chunk_offset += len(chunk)
+            header['tables'][table_name] = table_index
+        header_data = bz2.compress(json.dumps(header).encode('utf-8'))
+        with open(self._cache_path, 'wb') as file:
+            file.write(LAZY_HEADER_LENGTH.pack(len(header_data)))
+            file.write(header_data)
+            for chunk in chunks:
+                file.write(chunk)
+
+    def __open_lazy_file(self):
+        """
+        Open cache file and read its header; file is
+        kept open to read chunks from it.
+
+        Return value:
+        Header with fingerprint and chunk index
+        """
+        file = open(self._cache_path, 'rb')
+        try:
+            header_length = LAZY_HEADER_LENGTH.unpack(file.read(LAZY_HEADER_LENGTH.size))[0]
+            header_data = file.read(header_length)
+            header = json.loads(bz2.decompress(header_data).decode('utf-8'))
+        except:
+            file.close()
+            raise
+        self.__lazy_file = file
+        self.__chunk_data_offset = LAZY_HEADER_LENGTH.size + header_length
+        return header
+
+    def __close_lazy_file(self):
+        """Close cache file, if it's open."""
+        if self.__lazy_file is not None:
+            self.__lazy_file.close()
+        self.__lazy_file = None
+        self.__chunk_data_offset = None
+
+    def __read_lazy_chunk(self, offset, length):
+        """
+        Read chunk from disk and parse it.
+
+        Required arguments:
+        offset -- offset of chunk relatively to end of header
+        length -- length of compressed chunk
+        """
+        file = self.__lazy_file
+        file.seek(self.__chunk_data_offset + offset)
+        chunk_data = file.read(length)
+        if len(chunk_data) != length:
+            raise EOFError('cache file is truncated')
+        return json.loads(bz2.decompress(chunk_data).decode('utf-8'))
+
+    def __update_chunk_index(self, header):
+        """
+        Loads chunk index into memory, dropping all chunks
+        which were loaded before.
+
+        Required arguments:
+        header -- dictionary with fingerprint and chunk index
+        """
+        chunk_index = {}
+        for table_name in TABLES:
+            table_index = header['tables'][table_name]
+            first_ids = [chunk_spec[0] for chunk_spec in table_index]
+            chunk_specs = [(chunk_spec[1], chunk_spec[2]) for chunk_spec in table_index]
+            chunk_index[table_name] = (first_ids, chunk_specs)
+        self.__chunk_index = chunk_index
+        self.__chunk_cache.clear()
+        self.__fingerprint = header['fingerprint']
+        self.__clear_obj_cache()
@@ -43,7 +43,8 @@ class Effect:
         tracking_speed_attribute=None,
         fitting_usage_chance_attribute=None,
         build_status=None,
-        modifiers=()
+        modifiers=(),
+        state=None
     ):
         self.id = effect_id
 
@@ -87,6 +88,10 @@ class Effect:
         # Stores Modifiers which are assigned to given effect
         self.modifiers = modifiers
 
+        # State can be precomputed at cache generation time
+        if state is not None:
+            self._state = state
+
     # Format: {effect category ID: state ID}
     __effect_state_map = {
         EffectCategory.passive: State.offline,
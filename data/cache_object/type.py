@@ -22,6 +22,7 @@
 from eos.const.eos import Slot, State
 from eos.const.eve import Attribute, Effect, EffectCategory
 from eos.util.cached_property import CachedProperty
+from eos.util.frozen_dict import FrozenDict
 
 
 class Type:
@@ -37,7 +38,12 @@ class Type:
         category=None,
         attributes=None,
         effects=(),
-        default_effect=None
+        default_effect=None,
+        required_skills=None,
+        slots=None,
+        max_state=None,
+        is_targeted=None,
+        modifiers=None
     ):
         self.id = type_id
 
@@ -59,14 +65,41 @@ class Type:
         # Default effect of item, which defines its several major properties
         self.default_effect = default_effect
 
-    @property
+        # Derived data can be precomputed at cache generation
+        # time; when it is passed, it takes precedence over
+        # values which are calculated on demand
+        if required_skills is not None:
+            self.required_skills = required_skills
+        if slots is not None:
+            self.slots = slots
+        if max_state is not None:
+            self.max_state = max_state
+        if is_targeted is not None:
+            self.is_targeted = is_targeted
+        if modifiers is not None:
+            self.modifiers = modifiers
+
+    @CachedProperty
     def modifiers(self):
         """ Get all modifiers spawned by item effects."""
         modifiers = []
         for effect in self.effects:
             for modifier in effect.modifiers:
                 modifiers.append(modifier)
-        return modifiers
+        return tuple(modifiers)
+
+    @CachedProperty
+    def modifier_table(self):
+        """
+        Get modifiers grouped by state and scope they require.
+
+        Return value:
+        Frozen dictionary in {(state, scope): (modifiers)} format
+        """
+        modifier_table = {}
+        for modifier in self.modifiers:
+            modifier_table.setdefault((modifier.state, modifier.scope), []).append(modifier)
+        return FrozenDict((key, tuple(modifiers)) for key, modifiers in modifier_table.items())
 
     # Define attributes which describe item skill requirement details
     # Format: {item attribute ID: level attribute ID}
@@ -46,6 +46,11 @@ class Eos:
     make_default -- fit objects during initialization need
     Eos instance; this can be avoided if you set any Eos
     instance as default using this flag.
+    cache_generator -- cache generator to use if cache needs
+    to be updated. Pass generator with memo path, or the same
+    generator to multiple Eos instances, to rebuild modifiers
+    only for effects which changed since its previous run. If
+    not specified, new generator is used.
     """
 
     # Keeps reference to default Eos instance
@@ -56,13 +61,14 @@ class Eos:
         data_handler,
         cache_handler,
         logger,
-        make_default=False
+        make_default=False,
+        cache_generator=None
     ):
         self._logger = logger
         logger.info('-' * 72)
         logger.info('session started')
 
-        self.__initialize_cache(data_handler, cache_handler)
+        self.__initialize_cache(data_handler, cache_handler, cache_generator)
 
         if make_default is True:
             Eos._default_instance = self
@@ -74,7 +80,7 @@ class Eos:
     def __exit__(self, *exc):
         return False
 
-    def __initialize_cache(self, data_handler, cache_handler):
+    def __initialize_cache(self, data_handler, cache_handler, cache_generator):
         """
         Check if the cache is outdated and, if necessary, compose it
         using passed data handler and cache handler.
@@ -95,6 +101,8 @@ class Eos:
                     cache_fp, current_fp)
             self._logger.info(msg)
             # Generate cache, apply customizations and write it
-            cache_data = CacheGenerator(self._logger).run(data_handler)
+            if cache_generator is None:
+                cache_generator = CacheGenerator(self._logger)
+            cache_data = cache_generator.run(data_handler)
             CacheCustomizer(self._logger).run_builtin(cache_data)
             cache_handler.update_cache(cache_data, current_fp)
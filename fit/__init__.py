@@ -19,4 +19,7 @@
 #===============================================================================
 
 
+from .character_profile import CharacterProfile
+from .export import EXPORTABLE_STATS, export_stats, export_stat_columns
 from .fit import Fit
+from .pool import FitPool, FitStats
@@ -20,4 +20,5 @@
 
 
 from .map import MutableAttributeMap
+from .penalty import penalize_values, penalize_batch
 from .tracker import LinkTracker
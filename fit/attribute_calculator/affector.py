@@ -19,10 +19,23 @@
 #===============================================================================
 
 
-from collections import namedtuple
+class Affector:
+    """
+    Pairs modifier with holder which carries it. Affectors
+    are created once per holder and modifier, and are then
+    reused for all register operations, thus they are compared
+    and hashed by identity.
 
+    Required arguments:
+    source_holder -- holder which carries modifier
+    modifier -- modifier which describes modification
+    """
 
-# Each affector must have 2 components - carrier holder (source data
-# for changes and unique identifier) and modifier (which describes whom and
-# how to modify), this tuple represents it
-Affector = namedtuple('Affector', ('source_holder', 'modifier'))
+    __slots__ = ('source_holder', 'modifier')
+
+    def __init__(self, source_holder, modifier):
+        self.source_holder = source_holder
+        self.modifier = modifier
+
+    def __repr__(self):
+        return 'Affector(source_holder={}, modifier={})'.format(self.source_holder, self.modifier)
@@ -19,18 +19,16 @@
 #===============================================================================
 
 
-from math import exp
+from collections import namedtuple
 
 from eos.const.eos import Operator
 from eos.const.eve import Category, Attribute
 from eos.data.cache_handler.exception import AttributeFetchError
 from eos.util.keyed_set import KeyedSet
 from .exception import BaseValueError, AttributeMetaError, OperatorError
+from .penalty import penalize_values, penalize_batch
 
 
-# Stacking penalty base constant, used in attribute calculations
-PENALTY_BASE = 1 / exp((1 / 2.67) ** 2)
-
 # Items belonging to these categories never have
 # their effects stacking penalized
 PENALTY_IMMUNE_CATEGORIES = (
@@ -79,6 +77,16 @@ MULTIPLICATIONS = (
     Operator.post_div,
     Operator.post_percent
 )
+# Multiplications applied before and after additions
+PRE_MULTIPLICATIONS = (
+    Operator.pre_mul,
+    Operator.pre_div
+)
+POST_MULTIPLICATIONS = (
+    Operator.post_mul,
+    Operator.post_div,
+    Operator.post_percent
+)
 
 # Following attributes have limited precision - only
 # to second number after point
@@ -90,6 +98,11 @@ LIMITED_PRECISION = (
 )
 
 
+# Calculation plan of single attribute on single holder
+# Format of buckets: ((operator, (normal sources), (penalized sources)))
+CalculationPlan = namedtuple('CalculationPlan', ('attr_meta', 'base_value', 'buckets'))
+
+
 class MutableAttributeMap:
     """
     Calculate, store and provide access to modified attribute values.
@@ -104,12 +117,19 @@ class MutableAttributeMap:
         # Actual container of calculated attributes
         # Format: {attribute ID: value}
         self.__modified_attributes = {}
+        # When True, container of calculated attributes is
+        # shared with other maps and has to be copied before
+        # any modification
+        self.__shared = False
         # This variable stores map of attributes which cap
         # something, and attributes capped by them. Initialized
         # to None to not waste memory, will be changed to dict
         # when needed.
         # Format {capping attribute ID: {capped attribute IDs}}
         self._cap_map = None
+        # Compiled calculation plans
+        # Format: {attribute ID: CalculationPlan}
+        self.__plans = {}
 
     def __getitem__(self, attr):
         # Special handling for skill level attribute
@@ -133,21 +153,7 @@ class MutableAttributeMap:
             val = self.__modified_attributes[attr]
         # Else, we have to run full calculation process
         except KeyError:
-            try:
-                val = self.__modified_attributes[attr] = self.__calculate(attr)
-            except BaseValueError as e:
-                msg = 'unable to find base value for attribute {} on item {}'.format(
-                    e.args[0], self.__holder.item.id)
-                signature = (type(e), self.__holder.item.id, e.args[0])
-                self.__holder._fit.eos._logger.warning(msg, child_name='attribute_calculator', signature=signature)
-                raise KeyError(attr) from e
-            except AttributeMetaError as e:
-                msg = 'unable to fetch metadata for attribute {}, requested for item {}'.format(
-                    e.args[0], self.__holder.item.id)
-                signature = (type(e), self.__holder.item.id, e.args[0])
-                self.__holder._fit.eos._logger.error(msg, child_name='attribute_calculator', signature=signature)
-                raise KeyError(attr) from e
-            self.__holder._fit._link_tracker.clear_holder_attribute_dependents(self.__holder, attr)
+            val = self.__calculate_and_store(attr)
         return val
 
     def __len__(self):
@@ -164,19 +170,15 @@ class MutableAttributeMap:
             yield k
 
     def __delitem__(self, attr):
-        # Clear the value in our calculated attributes dictionary
-        try:
-            del self.__modified_attributes[attr]
-        # Do nothing if it wasn't calculated
-        except KeyError:
-            pass
-        # And make sure all other attributes relying on it
-        # are cleared too
-        else:
+        # Clear the value in our calculated attributes dictionary,
+        # and make sure all other attributes relying on it are
+        # cleared too; do nothing if it wasn't calculated
+        if self._drop(attr) is True:
             self.__holder._fit._link_tracker.clear_holder_attribute_dependents(self.__holder, attr)
 
     def __setitem__(self, attr, value):
         # Write value and clear all attributes relying on it
+        self.__unshare()
         self.__modified_attributes[attr] = value
         self.__holder._fit._link_tracker.clear_holder_attribute_dependents(self.__holder, attr)
 
@@ -190,98 +192,225 @@ class MutableAttributeMap:
         # Return union of both dicts
         return self.__modified_attributes.keys() | self.__holder.item.attributes.keys()
 
+    def get_many(self, attrs):
+        """
+        Get values of multiple attributes in one pass. Affectors
+        for all requested attributes which are not calculated yet
+        are gathered at once, and stacking penalties of all of them
+        are calculated in single batch.
+
+        Required arguments:
+        attrs -- iterable with attribute IDs
+
+        Return value:
+        Dictionary in {attribute ID: value} format; attributes
+        whose value cannot be fetched are not included
+        """
+        values = {}
+        # Attributes which need to be calculated
+        to_calculate = []
+        for attr in attrs:
+            # Skill level and attributes of holders which are not
+            # assigned to fit are not calculated, use regular
+            # access method for them
+            if attr == Attribute.skill_level or self.__holder._fit is None:
+                try:
+                    values[attr] = self[attr]
+                except KeyError:
+                    pass
+                continue
+            try:
+                values[attr] = self.__modified_attributes[attr]
+            except KeyError:
+                to_calculate.append(attr)
+        if not to_calculate:
+            return values
+        fit = self.__holder._fit
+        # Format: {target attribute ID: [affectors]}
+        attr_affectors = {}
+        for affector in fit._link_tracker.get_affectors(self.__holder):
+            attr_affectors.setdefault(affector.modifier.tgt_attr, []).append(affector)
+        # Fetch metadata of all attributes in one pass; attributes
+        # without it are left to regular calculation process, which
+        # reports errors
+        # Format: {attribute ID: attribute metadata}
+        attr_metas = {}
+        try:
+            get_attribute = fit.eos._cache_handler.get_attribute
+        except AttributeError:
+            pass
+        else:
+            for attr in to_calculate:
+                try:
+                    attr_metas[attr] = get_attribute(attr)
+                except AttributeFetchError:
+                    pass
+        # Gather values of penalized sources of all attributes
+        # Format: [(attribute ID, operator)]
+        penalized_keys = []
+        # Format: [[penalized modification values]]
+        penalized_lists = []
+        for attr in to_calculate:
+            if attr in self.__modified_attributes:
+                continue
+            try:
+                plan = self.__get_plan(attr, affectors=attr_affectors.get(attr, ()), attr_meta=attr_metas.get(attr))
+            # Errors are logged when attribute is calculated
+            except (BaseValueError, AttributeMetaError):
+                continue
+            for operator, _, penalized_sources in plan.buckets:
+                if not penalized_sources:
+                    continue
+                penalized_list = self.__read_sources(penalized_sources)
+                if penalized_list:
+                    penalized_keys.append((attr, operator))
+                    penalized_lists.append(penalized_list)
+        # Format: {attribute ID: {operator: penalized factor}}
+        attr_penalized_factors = {attr: {} for attr in to_calculate}
+        for (attr, operator), factor in zip(penalized_keys, penalize_batch(penalized_lists)):
+            attr_penalized_factors[attr][operator] = factor
+        for attr in to_calculate:
+            # Attribute could've been calculated already, e.g.
+            # as cap of another attribute
+            try:
+                values[attr] = self.__modified_attributes[attr]
+                continue
+            except KeyError:
+                pass
+            try:
+                values[attr] = self.__calculate_and_store(
+                    attr, affectors=attr_affectors.get(attr, ()),
+                    penalized_factors=attr_penalized_factors[attr])
+            except KeyError:
+                pass
+        return values
+
+    def snapshot(self):
+        """
+        Get values of all attributes available on holder.
+
+        Return value:
+        Dictionary in {attribute ID: value} format
+        """
+        return self.get_many(self.keys())
+
     def clear(self):
         """Reset map to its initial state."""
-        self.__modified_attributes.clear()
+        self.__modified_attributes = {}
+        self.__shared = False
         self._cap_map = None
+        self.__plans.clear()
+
+    def _clone(self, holder):
+        """
+        Make map for copy of our holder. Calculated values are shared
+        between both maps until either of them is modified; calculation
+        plans refer to holders, thus they are not shared.
+
+        Required arguments:
+        holder -- holder, to which new map is assigned
+
+        Return value:
+        New map
+        """
+        clone = MutableAttributeMap(holder)
+        clone.__modified_attributes = self.__modified_attributes
+        clone.__shared = self.__shared = True
+        if self._cap_map is not None:
+            clone._cap_map = self._cap_map.remap(lambda attr: attr)
+        return clone
 
-    def __calculate(self, attr):
+    def __unshare(self):
+        """
+        Make sure container of calculated values belongs to
+        this map only; should be called before modifying it.
+        """
+        if self.__shared is True:
+            self.__modified_attributes = dict(self.__modified_attributes)
+            self.__shared = False
+
+    def __calculate_and_store(self, attr, affectors=None, penalized_factors=None):
+        """
+        Calculate attribute value, store it and clear
+        attributes which rely on it.
+
+        Required arguments:
+        attr -- ID of attribute to be calculated
+
+        Optional arguments:
+        affectors -- iterable with affectors influencing attribute;
+        if None, they are requested from link tracker (default None)
+        penalized_factors -- dictionary with precalculated aggregated
+        factors of penalized sources in {operator: factor} format;
+        if None, they are calculated (default None)
+
+        Return value:
+        Calculated attribute value
+
+        Possible exceptions:
+        KeyError -- raised when attribute cannot be calculated
+        """
+        self.__unshare()
+        try:
+            val = self.__modified_attributes[attr] = self.__calculate(
+                attr, affectors=affectors, penalized_factors=penalized_factors)
+        except BaseValueError as e:
+            msg = 'unable to find base value for attribute {} on item {}'.format(
+                e.args[0], self.__holder.item.id)
+            signature = (type(e), self.__holder.item.id, e.args[0])
+            self.__holder._fit.eos._logger.warning(msg, child_name='attribute_calculator', signature=signature)
+            raise KeyError(attr) from e
+        except AttributeMetaError as e:
+            msg = 'unable to fetch metadata for attribute {}, requested for item {}'.format(
+                e.args[0], self.__holder.item.id)
+            signature = (type(e), self.__holder.item.id, e.args[0])
+            self.__holder._fit.eos._logger.error(msg, child_name='attribute_calculator', signature=signature)
+            raise KeyError(attr) from e
+        self.__holder._fit._link_tracker.clear_holder_attribute_dependents(self.__holder, attr)
+        return val
+
+    def __calculate(self, attr, affectors=None, penalized_factors=None):
         """
         Run calculations to find the actual value of attribute.
 
         Required arguments:
         attr -- ID of attribute to be calculated
 
+        Optional arguments:
+        affectors -- iterable with affectors influencing attribute;
+        used only when calculation plan has to be compiled. If None,
+        they are requested from link tracker (default None)
+        penalized_factors -- dictionary with precalculated aggregated
+        factors of penalized sources in {operator: factor} format,
+        operators without penalized values should be absent; if None,
+        factors are calculated (default None)
+
         Return value:
         Calculated attribute value
 
         Possible exceptions:
         BaseValueError -- attribute cannot be calculated, as its
         base value is not available
+        AttributeMetaError -- attribute cannot be calculated, as its
+        metadata is not available
         """
-        # Attribute object for attribute being calculated
-        try:
-            attr_meta = self.__holder._fit.eos._cache_handler.get_attribute(attr)
-        # Raise error if we can't get to get_attribute method
-        # or it can't find requested attribute
-        except (AttributeError, AttributeFetchError) as e:
-            raise AttributeMetaError(attr) from e
-        # Base attribute value which we'll use for modification
-        try:
-            result = self.__holder.item.attributes[attr]
-        # If attribute isn't available on base item,
-        # base off its default value
-        except KeyError:
-            result = attr_meta.default_value
-            # If original attribute is not specified and default
-            # value isn't available, raise error - without valid
-            # base we can't go on
-            if result is None:
-                raise BaseValueError(attr)
-        # Container for non-penalized modifiers
-        # Format: {operator: [values]}
-        normal_mods = {}
-        # Container for penalized modifiers
-        # Format: {operator: [values]}
-        penalized_mods = {}
-        # Now, go through all affectors affecting our holder
-        for affector in self.__holder._fit._link_tracker.get_affectors(self.__holder, attr=attr):
-            try:
-                source_holder, modifier = affector
-                operator = modifier.operator
-                # Decide if it should be stacking penalized or not, based on stackable property,
-                # source item category and operator
-                penalize = (
-                    attr_meta.stackable is False and
-                    source_holder.item.category not in PENALTY_IMMUNE_CATEGORIES and
-                    operator in PENALIZABLE_OPERATORS
-                )
+        plan = self.__get_plan(attr, affectors=affectors)
+        attr_meta = plan.attr_meta
+        result = plan.base_value
+        # Fold modification values, according to operator order
+        for operator, normal_sources, penalized_sources in plan.buckets:
+            mod_list = self.__read_sources(normal_sources)
+            if penalized_factors is not None:
                 try:
-                    mod_value = source_holder.attributes[modifier.src_attr]
-                # Silently skip current affector: error should already
-                # be logged by map before it raised KeyError
+                    mod_list.append(penalized_factors[operator])
                 except KeyError:
-                    continue
-                # Normalize operations to just three types:
-                # assignments, additions, multiplications
-                try:
-                    normalization_func = NORMALIZATION_MAP[operator]
-                # Raise error on any unknown operator types
-                except KeyError as e:
-                    raise OperatorError(operator) from e
-                mod_value = normalization_func(mod_value)
-                # Add value to appropriate dictionary
-                if penalize is True:
-                    mod_list = penalized_mods.setdefault(operator, [])
-                else:
-                    mod_list = normal_mods.setdefault(operator, [])
-                mod_list.append(mod_value)
-            # Handle operator type failure
-            except OperatorError as e:
-                msg = 'malformed modifier on item {}: unknown operator {}'.format(
-                    source_holder.item.id, e.args[0])
-                signature = (type(e), source_holder.item.id, e.args[0])
-                self.__holder._fit.eos._logger.warning(msg, child_name='attribute_calculator', signature=signature)
+                    pass
+            elif penalized_sources:
+                penalized_list = self.__read_sources(penalized_sources)
+                if penalized_list:
+                    mod_list.append(penalize_values(penalized_list))
+            if not mod_list:
                 continue
-        # When data gathering is complete, process penalized modifiers
-        # They are penalized on per-operator basis
-        for operator, mod_list in penalized_mods.items():
-            penalized_value = self.__penalize_values(mod_list)
-            mod_list = normal_mods.setdefault(operator, [])
-            mod_list.append(penalized_value)
-        # Calculate result of normal dictionary, according to operator order
-        for operator in sorted(normal_mods):
-            mod_list = normal_mods[operator]
             # Pick best modifier for assignments, based on high_is_good value
             if operator in ASSIGNMENTS:
                 result = max(mod_list) if attr_meta.high_is_good is True else min(mod_list)
@@ -314,42 +443,307 @@ class MutableAttributeMap:
             result = round(result, 2)
         return result
 
-    def __penalize_values(self, mod_list):
+    def __get_plan(self, attr, affectors=None, attr_meta=None):
+        """
+        Get calculation plan for attribute, compiling
+        it if it's not available yet.
+
+        Required arguments:
+        attr -- ID of attribute
+
+        Optional arguments:
+        affectors -- iterable with affectors influencing attribute;
+        used only when plan has to be compiled. If None, they are
+        requested from link tracker (default None)
+        attr_meta -- metadata of attribute, used only when plan has
+        to be compiled. If None, it's requested from cache handler
+        (default None)
+
+        Return value:
+        CalculationPlan object
+
+        Possible exceptions:
+        BaseValueError, AttributeMetaError -- raised when plan
+        cannot be compiled, see __compile_plan
+        """
+        try:
+            return self.__plans[attr]
+        except KeyError:
+            plan = self.__plans[attr] = self.__compile_plan(attr, affectors, attr_meta)
+            return plan
+
+    def __compile_plan(self, attr, affectors=None, attr_meta=None):
+        """
+        Compose calculation plan for attribute. Plan contains everything
+        needed for calculation which doesn't change until set of affectors
+        influencing attribute changes: attribute metadata, base value and
+        modification sources, normalized and grouped into buckets in the
+        order in which operators are applied.
+
+        Required arguments:
+        attr -- ID of attribute for which plan is compiled
+
+        Optional arguments:
+        affectors -- iterable with affectors influencing attribute;
+        if None, they are requested from link tracker (default None)
+        attr_meta -- metadata of attribute; if None, it's requested
+        from cache handler (default None)
+
+        Return value:
+        CalculationPlan object
+
+        Possible exceptions:
+        BaseValueError -- attribute cannot be calculated, as its
+        base value is not available
+        AttributeMetaError -- attribute cannot be calculated, as its
+        metadata is not available
+        """
+        # Attribute object for attribute being calculated
+        if attr_meta is None:
+            try:
+                attr_meta = self.__holder._fit.eos._cache_handler.get_attribute(attr)
+            # Raise error if we can't get to get_attribute method
+            # or it can't find requested attribute
+            except (AttributeError, AttributeFetchError) as e:
+                raise AttributeMetaError(attr) from e
+        # Base attribute value which we'll use for modification
+        try:
+            base_value = self.__holder.item.attributes[attr]
+        # If attribute isn't available on base item,
+        # base off its default value
+        except KeyError:
+            base_value = attr_meta.default_value
+            # If original attribute is not specified and default
+            # value isn't available, raise error - without valid
+            # base we can't go on
+            if base_value is None:
+                raise BaseValueError(attr)
+        # Container for non-penalized modification sources
+        # Format: {operator: [(source holder, source attribute ID, normalization function, affector)]}
+        normal_sources = {}
+        # Container for penalized modification sources
+        # Format: {operator: [(source holder, source attribute ID, normalization function, affector)]}
+        penalized_sources = {}
+        if affectors is None:
+            affectors = self.__holder._fit._link_tracker.get_affectors(self.__holder, attr=attr)
+        # Now, go through all affectors affecting our holder
+        for affector in affectors:
+            source_holder = affector.source_holder
+            modifier = affector.modifier
+            operator = modifier.operator
+            # Normalize operations to just three types:
+            # assignments, additions, multiplications
+            try:
+                normalization_func = NORMALIZATION_MAP[operator]
+            # Log and skip affectors with unknown operator types
+            except KeyError:
+                msg = 'malformed modifier on item {}: unknown operator {}'.format(
+                    source_holder.item.id, operator)
+                signature = (OperatorError, source_holder.item.id, operator)
+                self.__holder._fit.eos._logger.warning(msg, child_name='attribute_calculator', signature=signature)
+                continue
+            # Decide if it should be stacking penalized or not, based on stackable property,
+            # source item category and operator
+            penalize = (
+                attr_meta.stackable is False and
+                source_holder.item.category not in PENALTY_IMMUNE_CATEGORIES and
+                operator in PENALIZABLE_OPERATORS
+            )
+            sources = penalized_sources if penalize is True else normal_sources
+            sources.setdefault(operator, []).append((source_holder, modifier.src_attr, normalization_func, affector))
+        buckets = []
+        for operator in sorted(normal_sources.keys() | penalized_sources.keys()):
+            buckets.append((
+                operator,
+                tuple(normal_sources.get(operator, ())),
+                tuple(penalized_sources.get(operator, ()))
+            ))
+        return CalculationPlan(attr_meta, base_value, tuple(buckets))
+
+    def __read_sources(self, sources):
+        """
+        Read values of modification sources.
+
+        Required arguments:
+        sources -- iterable with (source holder, source attribute ID,
+        normalization function, affector) tuples
+
+        Return value:
+        List with normalized modification values
         """
-        Calculate aggregated factor of passed factors, taking into
-        consideration stacking penalty.
+        values = []
+        for source_holder, src_attr, normalization_func, _ in sources:
+            try:
+                mod_value = source_holder.attributes[src_attr]
+            # Silently skip current source: error should already
+            # be logged by map before it raised KeyError
+            except KeyError:
+                continue
+            values.append(normalization_func(mod_value))
+        return values
 
-        Positional argument:
-        mod_list -- list of factors
+    def _dump(self):
+        """
+        Get calculated attribute values.
 
         Return value:
-        Final aggregated factor of passed mod_list
+        List with (attribute ID, value) pairs
+        """
+        return [[attr, value] for attr, value in self.__modified_attributes.items()]
+
+    def _load(self, values):
+        """
+        Store passed values as calculated, without running
+        calculations. Values which have been calculated
+        already are kept intact.
+
+        Required arguments:
+        values -- iterable with (attribute ID, value) pairs
         """
-        # Gather positive modifiers into one chain, negative
-        # into another
-        chain_positive = []
-        chain_negative = []
-        for mod_val in mod_list:
-            # Transform value into form of multiplier - 1 for ease of
-            # stacking chain calculation
-            mod_val -= 1
-            if mod_val >= 0:
-                chain_positive.append(mod_val)
+        self.__unshare()
+        cache_handler = self.__holder._fit.eos._cache_handler
+        for attr, value in values:
+            if attr in self.__modified_attributes:
+                continue
+            self.__modified_attributes[attr] = value
+            # Values capped by other attributes have to be
+            # cleared when capping value changes
+            try:
+                attr_meta = cache_handler.get_attribute(attr)
+            except AttributeFetchError:
+                continue
+            if attr_meta.max_attribute is not None:
+                if self._cap_map is None:
+                    self._cap_map = KeyedSet()
+                self._cap_map.add_data(attr_meta.max_attribute, attr)
+
+    def _drop(self, attr):
+        """
+        Remove calculated value of attribute, without touching
+        attributes which rely on it.
+
+        Required arguments:
+        attr -- ID of attribute
+
+        Return value:
+        True if value was removed, False if it wasn't calculated
+        """
+        if attr not in self.__modified_attributes:
+            return False
+        self.__unshare()
+        del self.__modified_attributes[attr]
+        return True
+
+    def _apply_affector(self, affector, enable):
+        """
+        Apply or revert modification of affector directly to
+        calculated value of attribute, and update calculation plan
+        accordingly. It is possible only when value and its plan are
+        available, and operator of affector is not mixed with other
+        operators in a way which makes result depend on order, i.e. for
+        additions without multiplications after them, multiplications
+        without additions after them and non-penalized multiplications
+        applied after additions.
+
+        Required arguments:
+        affector -- affector which is being enabled or disabled
+        enable -- True if affector is being enabled, False if
+        it is being disabled
+
+        Return value:
+        True if value has been updated, False if it has not been
+        touched and has to be recalculated
+        """
+        modifier = affector.modifier
+        attr = modifier.tgt_attr
+        operator = modifier.operator
+        plan = self.__plans.get(attr)
+        if plan is None or attr not in self.__modified_attributes:
+            return False
+        attr_meta = plan.attr_meta
+        # Capped and rounded values cannot be updated incrementally
+        if attr_meta.max_attribute is not None or attr in LIMITED_PRECISION:
+            return False
+        try:
+            normalization_func = NORMALIZATION_MAP[operator]
+        except KeyError:
+            return False
+        source_holder = affector.source_holder
+        if (
+            attr_meta.stackable is False and
+            source_holder.item.category not in PENALTY_IMMUNE_CATEGORIES and
+            operator in PENALIZABLE_OPERATORS
+        ):
+            return False
+        plan_operators = set(bucket[0] for bucket in plan.buckets)
+        if plan_operators.intersection(ASSIGNMENTS):
+            return False
+        if operator in ADDITIONS:
+            if plan_operators.intersection(POST_MULTIPLICATIONS):
+                return False
+        elif operator in PRE_MULTIPLICATIONS:
+            if plan_operators.intersection(ADDITIONS):
+                return False
+        elif operator not in POST_MULTIPLICATIONS:
+            return False
+        # Compose updated plan; sources carry affector, which is compared
+        # by identity, thus multiple modifiers with the same source
+        # attribute, operator and target on the same holder are not
+        # mixed up with each other
+        source = (source_holder, modifier.src_attr, normalization_func, affector)
+        buckets = []
+        found = False
+        for bucket_operator, normal_sources, penalized_sources in plan.buckets:
+            if bucket_operator == operator:
+                found = True
+                if enable is True:
+                    # Plan might have been compiled after registration
+                    # of this very affector, then value already reflects it
+                    if source in normal_sources:
+                        return True
+                    normal_sources += (source,)
+                else:
+                    if source not in normal_sources:
+                        return False
+                    normal_sources = tuple(s for s in normal_sources if s != source)
+            if normal_sources or penalized_sources:
+                buckets.append((bucket_operator, normal_sources, penalized_sources))
+        if found is False:
+            if enable is not True:
+                return False
+            buckets.append((operator, (source,), ()))
+            buckets.sort(key=lambda bucket: bucket[0])
+        # Reading source value may trigger calculations which
+        # clear our value, thus check it only afterwards
+        try:
+            mod_value = normalization_func(source_holder.attributes[modifier.src_attr])
+        except KeyError:
+            mod_value = None
+        try:
+            value = self.__modified_attributes[attr]
+        except KeyError:
+            return False
+        if mod_value is not None:
+            if operator in ADDITIONS:
+                value = value + mod_value if enable is True else value - mod_value
+            elif enable is True:
+                value *= mod_value
+            # Multiplication by zero cannot be reverted
+            elif mod_value == 0:
+                return False
             else:
-                chain_negative.append(mod_val)
-        # Strongest modifiers always go first
-        chain_positive.sort(reverse=True)
-        chain_negative.sort()
-        # Base final multiplier on 1
-        list_result = 1
-        for chain in (chain_positive, chain_negative):
-            # Same for intermediate per-chain result
-            chain_result = 1
-            for position, modifier in enumerate(chain):
-                # Ignore 12th modifier and further as non-significant
-                if position > 10:
-                    break
-                # Apply stacking penalty based on modifier position
-                chain_result *= 1 + modifier * PENALTY_BASE ** (position ** 2)
-            list_result *= chain_result
-        return list_result
+                value /= mod_value
+        self.__unshare()
+        self.__modified_attributes[attr] = value
+        self.__plans[attr] = CalculationPlan(attr_meta, plan.base_value, tuple(buckets))
+        return True
+
+    def _clear_plan(self, attr):
+        """
+        Remove calculation plan of attribute; should be called
+        when set of affectors influencing attribute changes.
+
+        Required arguments:
+        attr -- ID of attribute
+        """
+        self.__plans.pop(attr, None)
@@ -0,0 +1,115 @@
+#===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+#===============================================================================
+
+
+from math import exp
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+# Stacking penalty base constant, used in attribute calculations
+PENALTY_BASE = 1 / exp((1 / 2.67) ** 2)
+
+# Modifiers beyond this position in penalty chain are ignored
+# as non-significant
+PENALTY_CHAIN_LENGTH = 11
+
+# Precalculated penalty coefficients for each position in chain
+PENALTY_FACTORS = tuple(PENALTY_BASE ** (position ** 2) for position in range(PENALTY_CHAIN_LENGTH))
+
+# Minimal amount of lists for which vectorized processing is
+# used; for fewer lists, overhead of NumPy calls is higher than
+# time saved on calculations
+BATCH_VECTORIZE_THRESHOLD = 24
+
+
+def penalize_values(mod_list):
+    """
+    Calculate aggregated factor of passed factors, taking into
+    consideration stacking penalty.
+
+    Required arguments:
+    mod_list -- iterable with factors
+
+    Return value:
+    Final aggregated factor of passed factors
+    """
+    # Gather positive modifiers into one chain, negative
+    # into another
+    chain_positive = []
+    chain_negative = []
+    for mod_val in mod_list:
+        # Transform value into form of multiplier - 1 for ease of
+        # stacking chain calculation
+        mod_val -= 1
+        if mod_val >= 0:
+            chain_positive.append(mod_val)
+        else:
+            chain_negative.append(mod_val)
+    # Strongest modifiers always go first
+    chain_positive.sort(reverse=True)
+    chain_negative.sort()
+    # Base final multiplier on 1
+    list_result = 1
+    for chain in (chain_positive, chain_negative):
+        # Same for intermediate per-chain result; zip ignores
+        # modifiers which do not fit into coefficient table
+        chain_result = 1
+        for modifier, factor in zip(chain, PENALTY_FACTORS):
+            chain_result *= 1 + modifier * factor
+        list_result *= chain_result
+    return list_result
+
+
+def penalize_batch(mod_lists):
+    """
+    Calculate aggregated factors for multiple lists of factors
+    at once. When NumPy is available and there are enough lists,
+    all lists are processed in single vectorized pass, else they
+    are processed one by one.
+
+    Required arguments:
+    mod_lists -- sequence with iterables of factors, e.g. factors
+    of the same attribute on multiple holders or fits
+
+    Return value:
+    List with final aggregated factors, in the same order as
+    passed lists
+    """
+    mod_lists = [tuple(mod_list) for mod_list in mod_lists]
+    if numpy is None or len(mod_lists) < BATCH_VECTORIZE_THRESHOLD:
+        return [penalize_values(mod_list) for mod_list in mod_lists]
+    lengths = numpy.fromiter((len(mod_list) for mod_list in mod_lists), dtype=int, count=len(mod_lists))
+    width = max(int(lengths.max()), PENALTY_CHAIN_LENGTH)
+    # Values which do not change final result (zeros in chains after
+    # subtracting 1) are used to pad rows to the same length
+    values = numpy.zeros((len(mod_lists), width))
+    flat_values = numpy.fromiter(
+        (mod_val for mod_list in mod_lists for mod_val in mod_list), dtype=float, count=int(lengths.sum()))
+    values[numpy.arange(width) < lengths[:, None]] = flat_values - 1
+    factors = numpy.array(PENALTY_FACTORS)
+    # Strongest modifiers go first in each chain
+    chain_positive = -numpy.sort(-numpy.where(values > 0, values, 0), axis=1)[:, :PENALTY_CHAIN_LENGTH]
+    chain_negative = numpy.sort(numpy.where(values < 0, values, 0), axis=1)[:, :PENALTY_CHAIN_LENGTH]
+    result = numpy.prod(1 + chain_positive * factors, axis=1) * numpy.prod(1 + chain_negative * factors, axis=1)
+    return result.tolist()
@@ -70,11 +70,45 @@ class LinkRegister:
         # Format: {targetHolder: {affectors}}
         self.__active_direct_affectors = KeyedSet()
 
+        # Following maps contain the same affectors as maps above, but
+        # additionally keyed by ID of attribute they modify, so that
+        # affectors of single attribute can be fetched quickly
+        # Format: {(domain, targetAttributeID): {affectors}}
+        self.__affector_domain_attr = KeyedSet()
+
+        # Format: {(domain, group, targetAttributeID): {affectors}}
+        self.__affector_domain_group_attr = KeyedSet()
+
+        # Format: {(domain, skill, targetAttributeID): {affectors}}
+        self.__affector_domain_skill_attr = KeyedSet()
+
+        # Format: {(targetHolder, targetAttributeID): {affectors}}
+        self.__active_direct_affectors_attr = KeyedSet()
+
         # Keep track of affectors which influence something directly,
         # but are disabled as their target domain is not available
         # Format: {source_holder: {affectors}}
         self.__disabled_direct_affectors = KeyedSet()
 
+    def _clone(self, fit, replace):
+        """
+        Make copy of register for another fit.
+
+        Required arguments:
+        fit -- fit, to which new register is bound
+        replace -- function which takes key or data object of
+        register maps and returns object which should be used
+        in its place in new register
+
+        Return value:
+        New register
+        """
+        register = LinkRegister(fit)
+        for attr_name, value in vars(self).items():
+            if isinstance(value, KeyedSet):
+                setattr(register, attr_name, value.remap(replace))
+        return register
+
     def register_affectee(self, target_holder):
         """
         Add passed target holder to register's maps, so it can be affected by
@@ -125,9 +159,9 @@ class LinkRegister:
         affector -- affector to register
         """
         try:
-            key, affector_map = self.__get_affector_map(affector)
-            # Actually add data to map
-            affector_map.add_data(key, affector)
+            for key, affector_map in self.__get_affector_maps(affector):
+                # Actually add data to map
+                affector_map.add_data(key, affector)
         except Exception as e:
             self.__handle_affector_errors(e, affector)
 
@@ -140,8 +174,8 @@ class LinkRegister:
         affector -- affector to unregister
         """
         try:
-            key, affector_map = self.__get_affector_map(affector)
-            affector_map.rm_data(key, affector)
+            for key, affector_map in self.__get_affector_maps(affector):
+                affector_map.rm_data(key, affector)
         # Following block handles exceptions; all of them must be handled
         # when registering affector too, thus they won't appear in log
         # if logger's handler suppresses messages with duplicate
@@ -159,7 +193,8 @@ class LinkRegister:
         Return value:
         Set with holders, being influenced by affector
         """
-        source_holder, modifier = affector
+        source_holder = affector.source_holder
+        modifier = affector.modifier
         affectees = set()
         try:
             # For direct modification, make set out of single target domain
@@ -208,7 +243,7 @@ class LinkRegister:
             self.__handle_affector_errors(e, affector)
         return affectees
 
-    def get_affectors(self, target_holder):
+    def get_affectors(self, target_holder, attr=None):
         """
         Get all affectors, which influence passed holder.
 
@@ -216,9 +251,16 @@ class LinkRegister:
         target_holder -- holder, for which we're seeking for affecting it
         affectors
 
+        Optional arguments:
+        attr -- target attribute ID filter; only affectors which
+        influence attribute with this ID will be returned. If None,
+        all affectors influencing holder are returned (default None)
+
         Return value:
         Set with affectors, incluencing target_holder
         """
+        if attr is not None:
+            return self.__get_attr_affectors(target_holder, attr)
         affectors = set()
         # Add all affectors which directly affect it
         affectors.update(self.__active_direct_affectors.get(target_holder) or set())
@@ -233,6 +275,29 @@ class LinkRegister:
             affectors.update(self.__affector_domain_skill.get((domain, skill)) or set())
         return affectors
 
+    def __get_attr_affectors(self, target_holder, attr):
+        """
+        Get all affectors, which influence specific attribute
+        of passed holder.
+
+        Required arguments:
+        target_holder -- holder, for which we're seeking for affecting it
+        affectors
+        attr -- ID of target attribute
+
+        Return value:
+        Set with affectors, incluencing attribute of target_holder
+        """
+        affectors = set()
+        affectors.update(self.__active_direct_affectors_attr.get((target_holder, attr)) or set())
+        domain = target_holder._domain
+        affectors.update(self.__affector_domain_attr.get((domain, attr)) or set())
+        group = target_holder.item.group
+        affectors.update(self.__affector_domain_group_attr.get((domain, group, attr)) or set())
+        for skill in target_holder.item.required_skills:
+            affectors.update(self.__affector_domain_skill_attr.get((domain, skill, attr)) or set())
+        return affectors
+
     # General-purpose auxiliary methods
     def __get_affectee_maps(self, target_holder):
         """
@@ -257,16 +322,16 @@ class LinkRegister:
                 affectee_maps.append(((domain, skill), self.__affectee_domain_skill))
         return affectee_maps
 
-    def __get_affector_map(self, affector):
+    def __get_affector_maps(self, affector):
         """
         Helper for affector register/unregister methods.
 
         Required arguments:
-        affector -- affector, for which affector map are requested
+        affector -- affector, for which affector maps are requested
 
         Return value:
-        (key, affector_map) tuple, where key should be used to access
-        data set (appropriate to passed affector) in affector_map
+        List of (key, affector_map) tuples, where key should be used to
+        access data set (appropriate to passed affector) in affector_map
 
         Possible exceptions:
         FilteredSelfReferenceError -- raised if affector's modifier specifies
@@ -279,67 +344,62 @@ class LinkRegister:
         FilterTypeError -- raised when affector's modifier filter type is not
         supported
         """
-        source_holder, modifier = affector
-        # For each filter type, define affector map and key to use
+        source_holder = affector.source_holder
+        modifier = affector.modifier
+        tgt_attr = modifier.tgt_attr
+        # For each filter type, define affector maps and keys to use
         if modifier.filter_type is None:
             # For direct modifications, we need to properly pick
             # target holder (it's key) based on domain
             if modifier.domain == Domain.self_:
-                affector_map = self.__active_direct_affectors
-                key = source_holder
+                target_holder = source_holder
             elif modifier.domain == Domain.character:
-                char = self._fit.character
-                if char is not None:
-                    affector_map = self.__active_direct_affectors
-                    key = char
-                else:
-                    affector_map = self.__disabled_direct_affectors
-                    key = source_holder
+                target_holder = self._fit.character
             elif modifier.domain == Domain.ship:
-                ship = self._fit.ship
-                if ship is not None:
-                    affector_map = self.__active_direct_affectors
-                    key = ship
-                else:
-                    affector_map = self.__disabled_direct_affectors
-                    key = source_holder
+                target_holder = self._fit.ship
             # When other domain is referenced, it means direct reference to module's charge
             # or to charge's module-container
             elif modifier.domain == Domain.other:
-                other_holder = self.__get_other_linked_holder(source_holder)
-                if other_holder is not None:
-                    affector_map = self.__active_direct_affectors
-                    key = other_holder
-                # When no reference available, it means that e.g. charge may be
-                # unavailable for now; use disabled affectors map for these
-                else:
-                    affector_map = self.__disabled_direct_affectors
-                    key = source_holder
+                target_holder = self.__get_other_linked_holder(source_holder)
             else:
                 raise DirectDomainError(modifier.domain)
+            if target_holder is not None:
+                affector_maps = [
+                    (target_holder, self.__active_direct_affectors),
+                    ((target_holder, tgt_attr), self.__active_direct_affectors_attr)
+                ]
+            # When no target is available, it means that e.g. charge may be
+            # unavailable for now; use disabled affectors map for these
+            else:
+                affector_maps = [(source_holder, self.__disabled_direct_affectors)]
         # For filtered modifications, compose key, making sure reference to self
         # is converted into appropriate real domain
         elif modifier.filter_type == FilterType.all_:
-            affector_map = self.__affector_domain
             domain = self.__contextize_filter_domain(affector)
-            key = domain
+            affector_maps = [
+                (domain, self.__affector_domain),
+                ((domain, tgt_attr), self.__affector_domain_attr)
+            ]
         elif modifier.filter_type == FilterType.group:
-            affector_map = self.__affector_domain_group
-            domain = self.__contextize_filter_domain(affector)
-            key = (domain, modifier.filter_value)
-        elif modifier.filter_type == FilterType.skill:
-            affector_map = self.__affector_domain_skill
             domain = self.__contextize_filter_domain(affector)
-            skill = affector.modifier.filter_value
-            key = (domain, skill)
-        elif modifier.filter_type == FilterType.skill_self:
-            affector_map = self.__affector_domain_skill
+            group = modifier.filter_value
+            affector_maps = [
+                ((domain, group), self.__affector_domain_group),
+                ((domain, group, tgt_attr), self.__affector_domain_group_attr)
+            ]
+        elif modifier.filter_type in (FilterType.skill, FilterType.skill_self):
             domain = self.__contextize_filter_domain(affector)
-            skill = affector.source_holder.item.id
-            key = (domain, skill)
+            if modifier.filter_type == FilterType.skill:
+                skill = modifier.filter_value
+            else:
+                skill = source_holder.item.id
+            affector_maps = [
+                ((domain, skill), self.__affector_domain_skill),
+                ((domain, skill, tgt_attr), self.__affector_domain_skill_attr)
+            ]
         else:
             raise FilterTypeError(modifier.filter_type)
-        return key, affector_map
+        return affector_maps
 
     def __handle_affector_errors(self, error, affector):
         """
@@ -467,7 +527,7 @@ class LinkRegister:
         # Move all of them to direct modification dictionary
         for source_holder, affectors in affectors_to_enable.items():
             self.__disabled_direct_affectors.rm_data_set(source_holder, affectors)
-            self.__active_direct_affectors.add_data_set(target_holder, affectors)
+            self.__add_active_direct_affectors(target_holder, affectors)
 
     def __disable_direct_spec(self, target_holder):
         """
@@ -489,7 +549,7 @@ class LinkRegister:
             return
         # Move data from map to map
         for source_holder, affectors in affectors_to_disable.items():
-            self.__active_direct_affectors.rm_data_set(target_holder, affectors)
+            self.__rm_active_direct_affectors(target_holder, affectors)
             self.__disabled_direct_affectors.add_data_set(source_holder, affectors)
 
     def __enable_direct_other(self, target_holder):
@@ -515,7 +575,7 @@ class LinkRegister:
         if not affectors_to_enable:
             return
         # Move all of them to direct modification dictionary
-        self.__active_direct_affectors.add_data_set(target_holder, affectors_to_enable)
+        self.__add_active_direct_affectors(target_holder, affectors_to_enable)
         self.__disabled_direct_affectors.rm_data_set(other_holder, affectors_to_enable)
 
     def __disable_direct_other(self, target_holder):
@@ -541,7 +601,31 @@ class LinkRegister:
             return
         # If we have, move them from map to map
         self.__disabled_direct_affectors.add_data_set(other_holder, affectors_to_disable)
-        self.__active_direct_affectors.rm_data_set(target_holder, affectors_to_disable)
+        self.__rm_active_direct_affectors(target_holder, affectors_to_disable)
+
+    def __add_active_direct_affectors(self, target_holder, affectors):
+        """
+        Add affectors to maps of active direct affectors.
+
+        Required arguments:
+        target_holder -- holder which is influenced by affectors
+        affectors -- iterable with affectors
+        """
+        self.__active_direct_affectors.add_data_set(target_holder, affectors)
+        for affector in affectors:
+            self.__active_direct_affectors_attr.add_data((target_holder, affector.modifier.tgt_attr), affector)
+
+    def __rm_active_direct_affectors(self, target_holder, affectors):
+        """
+        Remove affectors from maps of active direct affectors.
+
+        Required arguments:
+        target_holder -- holder which is influenced by affectors
+        affectors -- iterable with affectors
+        """
+        self.__active_direct_affectors.rm_data_set(target_holder, affectors)
+        for affector in affectors:
+            self.__active_direct_affectors_attr.rm_data((target_holder, affector.modifier.tgt_attr), affector)
 
     def __get_other_linked_holder(self, holder):
         """
@@ -19,7 +19,10 @@
 #===============================================================================
 
 
+from weakref import WeakSet
+
 from eos.const.eos import Scope
+from eos.util.keyed_set import KeyedSet
 from .affector import Affector
 from .register import LinkRegister
 
@@ -34,11 +37,71 @@ class LinkTracker:
 
     Required arguments:
     fit -- Fit object to which tracker is assigned
+
+    Optional arguments:
+    eager -- when True, on state switches modification of affected
+    attribute values is applied or reverted in place wherever operator
+    allows it, instead of dropping the values; values which cannot
+    be updated this way are dropped as usual. Default is False.
     """
 
-    def __init__(self, fit):
+    def __init__(self, fit, eager=False):
         self._fit = fit
         self._register = LinkRegister(fit)
+        self.eager = eager
+
+        # Keep track of enabled affectors which use certain
+        # attribute of their source holder as data source
+        # Format: {(source holder, source attribute ID): {affectors}}
+        self.__src_attr_affectors = KeyedSet()
+
+        # Affectors are created once per holder when it is added,
+        # and then reused; they are grouped the same way as
+        # modifiers in holder's item modifier table
+        # Format: {holder: {(state, scope): (affectors)}}
+        self.__holder_affectors = {}
+
+        # Tracker made as copy of other tracker refers to maps of
+        # that tracker until either of them is changed, translating
+        # holders and affectors on access
+        # Format: (source tracker, {source holder: holder copy},
+        # {holder copy: source holder})
+        self.__share = None
+        # Affectors of holder copies, made on demand while maps
+        # are shared
+        # Format: {source affector: affector copy}
+        self.__affector_copies = {}
+        # Format: {affector copy: source affector}
+        self.__affector_sources = {}
+        # Trackers which refer to maps of this tracker
+        self.__sharing_trackers = WeakSet()
+
+    def _clone(self, fit, holder_map):
+        """
+        Make copy of tracker for another fit, which contains copies
+        of holders tracked by this tracker. Holders do not need to be
+        registered again, and links are not copied until either of
+        trackers is changed.
+
+        Required arguments:
+        fit -- fit, to which new tracker is bound
+        holder_map -- dictionary in {holder: holder copy} format,
+        should include all holders tracked by this tracker
+
+        Return value:
+        New tracker
+        """
+        tracker = LinkTracker(fit, eager=self.eager)
+        if self.__share is None:
+            source = self
+            copies = holder_map
+        else:
+            # Copy of copy refers to the same maps as its source
+            source, source_copies, _ = self.__share
+            copies = {holder: holder_map[holder_copy] for holder, holder_copy in source_copies.items()}
+        tracker.__share = (source, copies, {holder_copy: holder for holder, holder_copy in copies.items()})
+        source.__sharing_trackers.add(tracker)
+        return tracker
 
     def get_affectors(self, holder, attr=None):
         """
@@ -56,14 +119,11 @@ class LinkTracker:
         Return value:
         Set with Affector objects
         """
-        if attr is None:
-            affectors = self._register.get_affectors(holder)
-        else:
-            affectors = set()
-            for affector in self._register.get_affectors(holder):
-                if affector.modifier.tgt_attr == attr:
-                    affectors.add(affector)
-        return affectors
+        if self.__share is not None:
+            source, _, sources = self.__share
+            return {self.__get_affector_copy(affector)
+                    for affector in source.get_affectors(sources[holder], attr=attr)}
+        return self._register.get_affectors(holder, attr=attr)
 
     def get_affectees(self, affector):
         """
@@ -75,6 +135,9 @@ class LinkTracker:
         Return value:
         Set with holders
         """
+        if self.__share is not None:
+            source, copies, _ = self.__share
+            return {copies[holder] for holder in source.get_affectees(self.__affector_sources[affector])}
         return self._register.get_affectees(affector)
 
     def add_holder(self, holder):
@@ -85,6 +148,11 @@ class LinkTracker:
         Required arguments:
         holder -- holder which is added to tracker
         """
+        self.__unshare()
+        holder_affectors = {}
+        for key, modifiers in holder.item.modifier_table.items():
+            holder_affectors[key] = tuple(Affector(holder, modifier) for modifier in modifiers)
+        self.__holder_affectors[holder] = holder_affectors
         self._register.register_affectee(holder)
 
     def remove_holder(self, holder):
@@ -95,7 +163,9 @@ class LinkTracker:
         Required arguments:
         holder -- holder which is removed from tracker
         """
+        self.__unshare()
         self._register.unregister_affectee(holder)
+        del self.__holder_affectors[holder]
 
     def enable_states(self, holder, states):
         """
@@ -106,13 +176,23 @@ class LinkTracker:
         states -- iterable with states, which are passed
         during state switch, except for initial state
         """
+        self.__unshare()
         processed_scopes = (Scope.local,)
         enabled_affectors = self.__generate_affectors(
             holder, state_filter=states, scope_filter=processed_scopes)
         # Clear attributes only after registration jobs
         for affector in enabled_affectors:
             self._register.register_affector(affector)
-        self.__clear_affectors_dependents(enabled_affectors)
+        update = self.eager is True and self.__has_chained_affectors(enabled_affectors) is not True
+        if update is True:
+            # Affectors are not indexed by source attribute yet,
+            # thus calculating source value during update won't
+            # drop values which are being updated
+            self.__update_affectors_dependents(enabled_affectors, True)
+        for affector in enabled_affectors:
+            self.__src_attr_affectors.add_data((holder, affector.modifier.src_attr), affector)
+        if update is not True:
+            self.__clear_affectors_dependents(enabled_affectors)
 
     def disable_states(self, holder, states):
         """
@@ -123,38 +203,36 @@ class LinkTracker:
         states -- iterable with states, which are passed
         during state switch, except for final state
         """
+        self.__unshare()
         processed_scopes = (Scope.local,)
         disabled_affectors = self.__generate_affectors(
             holder, state_filter=states, scope_filter=processed_scopes)
         # Clear attributes before unregistering, otherwise
         # we won't clean them up properly
-        self.__clear_affectors_dependents(disabled_affectors)
+        if self.eager is True and self.__has_chained_affectors(disabled_affectors) is not True:
+            for affector in disabled_affectors:
+                self.__src_attr_affectors.rm_data((holder, affector.modifier.src_attr), affector)
+            self.__update_affectors_dependents(disabled_affectors, False)
+        else:
+            self.__clear_affectors_dependents(disabled_affectors)
+            for affector in disabled_affectors:
+                self.__src_attr_affectors.rm_data((holder, affector.modifier.src_attr), affector)
         for affector in disabled_affectors:
             self._register.unregister_affector(affector)
 
     def clear_holder_attribute_dependents(self, holder, attr):
         """
-        Clear calculated attributes relying on passed attribute.
+        Clear calculated attributes relying on passed attribute,
+        directly or through other attributes.
 
         Required arguments:
         holder -- holder, which carries attribute in question
         attr -- ID of attribute
+
+        Return value:
+        Number of calculated values which were dropped
         """
-        # Clear attributes capped by this attribute
-        cap_map = holder.attributes._cap_map
-        if cap_map is not None:
-            for capped_attr in (cap_map.get(attr) or ()):
-                del holder.attributes[capped_attr]
-        # Clear attributes using this attribute as data source
-        for affector in self.__generate_affectors(holder):
-            modifier = affector.modifier
-            # Skip affectors which do not use attribute being damaged as source
-            if modifier.src_attr != attr:
-                continue
-            # Go through all holders targeted by modifier
-            for target_holder in self.get_affectees(affector):
-                # And remove target attribute
-                del target_holder.attributes[modifier.tgt_attr]
+        return self.__clear_dependents(self.__get_dependents(holder, attr), visited={(holder, attr)})
 
     def __clear_affectors_dependents(self, affectors):
         """
@@ -162,37 +240,232 @@ class LinkTracker:
 
         Required arguments:
         affectors -- iterable with affectors in question
+
+        Return value:
+        Number of calculated values which were dropped
         """
+        dependents = []
         for affector in affectors:
+            tgt_attr = affector.modifier.tgt_attr
             # Go through all holders targeted by modifier
             for target_holder in self.get_affectees(affector):
-                # And remove target attribute
-                del target_holder.attributes[affector.modifier.tgt_attr]
+                # Set of affectors influencing target attribute changes,
+                # thus its calculation plan has to be recompiled
+                target_holder.attributes._clear_plan(tgt_attr)
+                dependents.append((target_holder, tgt_attr))
+        return self.__clear_dependents(dependents)
 
-    def __generate_affectors(self, holder, state_filter=None, scope_filter=None):
+    def __update_affectors_dependents(self, affectors, enable):
         """
-        Get all affectors spawned by holder.
+        Update calculated attributes relying on affectors in place
+        where possible, and clear them otherwise.
 
         Required arguments:
-        holder -- holder, for which affectors are generated
+        affectors -- iterable with affectors in question
+        enable -- True if affectors are being enabled, False
+        if they are being disabled
+
+        Return value:
+        Number of calculated values which were dropped
+        """
+        dependents = []
+        for affector in affectors:
+            tgt_attr = affector.modifier.tgt_attr
+            for target_holder in self.get_affectees(affector):
+                target_attributes = target_holder.attributes
+                # If value has been updated, it stays, but everything
+                # relying on it has to be cleared
+                if target_attributes._apply_affector(affector, enable) is True:
+                    dependents.extend(self.__get_dependents(target_holder, tgt_attr))
+                else:
+                    target_attributes._clear_plan(tgt_attr)
+                    dependents.append((target_holder, tgt_attr))
+        return self.__clear_dependents(dependents)
+
+    def __has_chained_affectors(self, affectors):
+        """
+        Check if any of passed affectors uses as data source attribute,
+        which relies on any of passed affectors, directly or through
+        other attributes. Such affectors cannot be applied in place,
+        as values they are applied to are changed by the very same
+        state switch.
+
+        Required arguments:
+        affectors -- iterable with affectors in question
+
+        Return value:
+        True if chained affectors are found, else False
+        """
+        # Format: {(source holder, source attribute ID)}
+        sources = set((affector.source_holder, affector.modifier.src_attr) for affector in affectors)
+        stack = []
+        for affector in affectors:
+            tgt_attr = affector.modifier.tgt_attr
+            for target_holder in self.get_affectees(affector):
+                stack.append((target_holder, tgt_attr))
+        visited = set()
+        while stack:
+            dependent = stack.pop()
+            if dependent in visited:
+                continue
+            visited.add(dependent)
+            if dependent in sources:
+                return True
+            stack.extend(self.__get_dependents(*dependent))
+        return False
+
+    def __clear_dependents(self, dependents, visited=None):
+        """
+        Drop calculated values of passed attributes and of all
+        attributes relying on them. Dependency graph is walked
+        iteratively, and each attribute is visited only once.
+
+        Required arguments:
+        dependents -- iterable with (holder, attribute ID) tuples
 
         Optional arguments:
-        state_filter -- filter results by affector's required state,
-        which should be in this iterable; if None, no filtering
-        occurs (default None)
-        scope_filter -- filter results by affector's required state,
-        which should be in this iterable; if None, no filtering
-        occurs (default None)
+        visited -- set with (holder, attribute ID) tuples which should
+        not be visited; it is updated in place (default None)
 
         Return value:
-        Set with Affector objects, satisfying passed filters
+        Number of calculated values which were dropped
         """
-        affectors = set()
-        for modifier in holder.item.modifiers:
-            if state_filter is not None and modifier.state not in state_filter:
+        if visited is None:
+            visited = set()
+        dropped = 0
+        stack = list(dependents)
+        while stack:
+            dependent = stack.pop()
+            if dependent in visited:
                 continue
-            if scope_filter is not None and modifier.scope not in scope_filter:
+            visited.add(dependent)
+            holder, attr = dependent
+            # Attributes which were not calculated cannot
+            # be data source for calculated attributes
+            if holder.attributes._drop(attr) is not True:
                 continue
-            affector = Affector(holder, modifier)
-            affectors.add(affector)
+            dropped += 1
+            stack.extend(self.__get_dependents(holder, attr))
+        return dropped
+
+    def __get_dependents(self, holder, attr):
+        """
+        Get attributes which directly rely on passed attribute.
+
+        Required arguments:
+        holder -- holder, which carries attribute in question
+        attr -- ID of attribute
+
+        Return value:
+        List with (holder, attribute ID) tuples
+        """
+        dependents = []
+        # Attributes capped by this attribute
+        cap_map = holder.attributes._cap_map
+        if cap_map is not None:
+            for capped_attr in (cap_map.get(attr) or ()):
+                dependents.append((holder, capped_attr))
+        # Attributes using this attribute as data source
+        for affector in self.__get_src_attr_affectors(holder, attr):
+            tgt_attr = affector.modifier.tgt_attr
+            # Go through all holders targeted by modifier
+            for target_holder in self.get_affectees(affector):
+                dependents.append((target_holder, tgt_attr))
+        return dependents
+
+    def __generate_affectors(self, holder, state_filter, scope_filter):
+        """
+        Get affectors of holder.
+
+        Required arguments:
+        holder -- holder, for which affectors are generated
+        state_filter -- iterable with states; only affectors
+        whose modifiers require one of them are generated
+        scope_filter -- iterable with scopes; only affectors
+        whose modifiers have one of them are generated
+
+        Return value:
+        Set with Affector objects, satisfying passed filters
+        """
+        affectors = set()
+        holder_affectors = self.__holder_affectors[holder]
+        for state in state_filter:
+            for scope in scope_filter:
+                affectors.update(holder_affectors.get((state, scope), ()))
         return affectors
+
+    def __get_src_attr_affectors(self, holder, attr):
+        """
+        Get enabled affectors which use passed attribute
+        as data source.
+
+        Required arguments:
+        holder -- holder, which carries attribute in question
+        attr -- ID of attribute
+
+        Return value:
+        Iterable with Affector objects
+        """
+        if self.__share is not None:
+            source, _, sources = self.__share
+            return [self.__get_affector_copy(affector)
+                    for affector in source.__src_attr_affectors.get((sources[holder], attr)) or ()]
+        return self.__src_attr_affectors.get((holder, attr)) or ()
+
+    def __get_affector_copy(self, affector):
+        """
+        Get affector of holder copy, which corresponds to
+        affector taken from shared maps.
+
+        Required arguments:
+        affector -- affector of source tracker
+
+        Return value:
+        Affector object
+        """
+        try:
+            return self.__affector_copies[affector]
+        except KeyError:
+            affector_copy = Affector(self.__share[1][affector.source_holder], affector.modifier)
+            self.__affector_copies[affector] = affector_copy
+            self.__affector_sources[affector_copy] = affector
+            return affector_copy
+
+    def __unshare(self):
+        """
+        Make sure maps of this tracker are not shared with
+        other trackers; should be called before changing them.
+        """
+        if self.__share is not None:
+            self.__copy_shared_maps()
+        for tracker in tuple(self.__sharing_trackers):
+            tracker.__copy_shared_maps()
+
+    def __copy_shared_maps(self):
+        """
+        Replace references to maps of source tracker with
+        their copies, where holders and affectors are replaced
+        with their copies too.
+        """
+        source, copies, _ = self.__share
+        for holder, holder_affectors in source.__holder_affectors.items():
+            affectors_copy = {}
+            for key, affectors in holder_affectors.items():
+                affectors_copy[key] = tuple(self.__get_affector_copy(affector) for affector in affectors)
+            self.__holder_affectors[copies[holder]] = affectors_copy
+        # Format: {holder or affector: its copy}
+        replacements = dict(copies)
+        replacements.update(self.__affector_copies)
+
+        def replace(obj):
+            # Keys of some maps are tuples, which include holders
+            if type(obj) is tuple:
+                return tuple(replacements.get(element, element) for element in obj)
+            return replacements.get(obj, obj)
+
+        self.__src_attr_affectors = source.__src_attr_affectors.remap(replace)
+        self._register = source._register._clone(self._fit, replace)
+        source.__sharing_trackers.discard(self)
+        self.__share = None
+        self.__affector_copies = {}
+        self.__affector_sources = {}
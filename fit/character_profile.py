@@ -0,0 +1,73 @@
+#===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+#===============================================================================
+
+
+from eos.util.frozen_dict import FrozenDict
+from .fit import Fit
+from .holder.item import Skill
+
+
+class CharacterProfile:
+    """
+    Immutable set of skills of single character, intended to be
+    applied to many fits. Skills are added to template fit once,
+    and fits made using profile are clones of the template. Each
+    of them has its own copies of skill holders.
+
+    Required arguments:
+    skills -- mapping in {skill type ID: skill level} format
+
+    Optional arguments:
+    eos -- eos instance within which fits will operate. If not
+    specified, eos.default_instance is used.
+
+    Possible exceptions:
+    TypeError -- raised when any of skill levels is not integer
+    """
+
+    def __init__(self, skills, eos=None):
+        for level in skills.values():
+            if not isinstance(level, int):
+                raise TypeError('skill level must be integer, got {}'.format(type(level).__name__))
+        self.__skills = FrozenDict(skills)
+        self.__eos = eos
+        # Fit with profile's skills, which serves as template for
+        # all fits made using profile; created on first request
+        self.__template_fit = None
+
+    @property
+    def skills(self):
+        return self.__skills
+
+    def fit_from_template(self):
+        """
+        Make new fit with skills of this profile by cloning template
+        fit. Fit is independent from profile, i.e. changes to its
+        skills do not affect profile and other fits.
+
+        Return value:
+        New fit
+        """
+        if self.__template_fit is None:
+            template_fit = Fit(eos=self.__eos)
+            for type_id, level in self.__skills.items():
+                template_fit.skills.add(Skill(type_id, level=level))
+            self.__template_fit = template_fit
+        return self.__template_fit.clone()
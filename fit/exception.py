@@ -53,3 +53,11 @@ class HolderFitMismatchError(HolderRemoveError):
     fit holder being removed from.
     """
     pass
+
+
+class SnapshotFingerprintError(EosError):
+    """
+    Raised on attempt to restore fit from snapshot,
+    which was made using different data.
+    """
+    pass
@@ -0,0 +1,113 @@
+#===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+#===============================================================================
+
+
+from array import array
+
+
+def _resource_getters(name):
+    return (
+        ('{}_used'.format(name), lambda fit: getattr(fit.stats, name).used),
+        ('{}_output'.format(name), lambda fit: getattr(fit.stats, name).output)
+    )
+
+
+def _slot_getters(name):
+    return (
+        ('{}_used'.format(name), lambda fit: getattr(fit.stats, name).used),
+        ('{}_total'.format(name), lambda fit: getattr(fit.stats, name).total)
+    )
+
+
+# Stats which can be exported, and functions which
+# fetch them from fit; all of them are numbers or None
+# Format: {stat name: function(fit)}
+EXPORTABLE_STATS = dict((
+    *_resource_getters('cpu'),
+    *_resource_getters('powergrid'),
+    *_resource_getters('calibration'),
+    *_resource_getters('dronebay'),
+    *_resource_getters('drone_bandwidth'),
+    *_slot_getters('high_slots'),
+    *_slot_getters('med_slots'),
+    *_slot_getters('low_slots'),
+    *_slot_getters('rig_slots'),
+    *_slot_getters('subsystem_slots'),
+    *_slot_getters('turret_slots'),
+    *_slot_getters('launcher_slots'),
+    *_slot_getters('launched_drones'),
+    ('hp_hull', lambda fit: fit.stats.hp.hull),
+    ('hp_armor', lambda fit: fit.stats.hp.armor),
+    ('hp_shield', lambda fit: fit.stats.hp.shield),
+    ('hp', lambda fit: fit.stats.hp.total),
+    ('ehp', lambda fit: fit.stats.worst_case_ehp.total),
+    ('volley', lambda fit: fit.stats.get_nominal_volley().total),
+    ('dps', lambda fit: fit.stats.get_nominal_dps().total),
+    ('agility_factor', lambda fit: fit.stats.agility_factor),
+    ('align_time', lambda fit: fit.stats.align_time)
+))
+
+
+def export_stats(fits, stats):
+    """
+    Export stats of multiple fits as flat records. Fits are processed
+    one by one as records are requested, thus when fits are supplied
+    by generator, memory consumption does not depend on number of fits.
+
+    Required arguments:
+    fits -- iterable with fits
+    stats -- iterable with names of stats to export, from
+    EXPORTABLE_STATS
+
+    Return value:
+    Generator over tuples with stat values, in order of stat names
+
+    Possible exceptions:
+    KeyError -- raised when unknown stat name is requested
+    """
+    getters = tuple(EXPORTABLE_STATS[stat] for stat in stats)
+    return (tuple(getter(fit) for getter in getters) for fit in fits)
+
+
+def export_stat_columns(fits, stats):
+    """
+    Export stats of multiple fits as columns. Values are kept in
+    arrays of doubles instead of separate python objects, thus they
+    can be used as buffers by e.g. numpy without copying. Missing
+    values are exported as NaN.
+
+    Required arguments:
+    fits -- iterable with fits
+    stats -- iterable with names of stats to export, from
+    EXPORTABLE_STATS
+
+    Return value:
+    Dictionary in {stat name: array with values} format
+
+    Possible exceptions:
+    KeyError -- raised when unknown stat name is requested
+    """
+    stats = tuple(stats)
+    columns = tuple(array('d') for _ in stats)
+    nan = float('nan')
+    for record in export_stats(fits, stats):
+        for column, value in zip(columns, record):
+            column.append(nan if value is None else value)
+    return dict(zip(stats, columns))
@@ -19,17 +19,30 @@
 #===============================================================================
 
 
+from contextlib import contextmanager
+
 from eos import Eos
 from eos.const.eos import State
 from eos.const.eve import Type
 from .attribute_calculator import LinkTracker
-from .exception import HolderAlreadyAssignedError, HolderFitMismatchError
+from .exception import HolderAlreadyAssignedError, HolderFitMismatchError, SnapshotFingerprintError
 from .holder.container import HolderDescriptorOnFit, HolderList, HolderRestrictedSet, HolderSet, ModuleRacks
 from .holder.item import *
 from .restriction_tracker import RestrictionTracker
 from .stat_tracker import StatTracker
 
 
+def _unpack_spec_entry(entry, size):
+    """
+    Convert holder entry of fit spec, which is either type ID
+    or tuple starting with type ID, into tuple of given size,
+    padding it with Nones.
+    """
+    if isinstance(entry, int):
+        entry = (entry,)
+    return tuple(entry) + (None,) * (size - len(entry))
+
+
 class Fit:
     """
     Fit holds all fit items and facilities to calculate their attributes.
@@ -37,9 +50,12 @@ class Fit:
     Optional arguments:
     eos -- eos instance within which fit will operate. If not specified,
     eos.default_instance is used.
+    eager_calculation -- when True, attribute values affected by holder
+    state switches are updated in place where possible, instead of being
+    recalculated on next access. Default is False.
     """
 
-    def __init__(self, eos=None):
+    def __init__(self, eos=None, eager_calculation=False):
         # Eos instance within which this fit exists; use default
         # if not specified explicitly
         if eos is None:
@@ -62,19 +78,383 @@ class Fit:
         # Service containers
         self._holders = set()
         self._volatile_holders = set()
+        # How many batch contexts are currently entered, and
+        # if volatile data cleanup was requested within them
+        self.__batch_depth = 0
+        self.__cleanup_pending = False
         # Initialize services
-        self._link_tracker = LinkTracker(self)  # Tracks links between holders assigned to fit
-        self._restriction_tracker = RestrictionTracker(self)  # Tracks various restrictions related to given fitting
-        self.stats = StatTracker(self)  # Access point for all the fitting stats
+        self._link_tracker = LinkTracker(self, eager=eager_calculation)  # Tracks links between holders assigned to fit
+        self.__restriction_tracker = RestrictionTracker(self)  # Tracks various restrictions related to given fitting
+        self.__stats = StatTracker(self)  # Access point for all the fitting stats
+        # Holders of cloned fit, which are yet to be registered
+        # in restriction and stat trackers
+        self.__untracked_holders = ()
         # As character object shouldn't change in any sane
         # cases, initialize it here
         self.character = Character(Type.character_static)
 
+    @classmethod
+    def from_spec(cls, spec, eos=None, eager_calculation=False):
+        """
+        Make fit using compact description of its contents. All
+        holders are added to fit before it's attached to eos, and
+        then are registered in fit services in single pass, which
+        is faster than adding holders one by one.
+
+        Required arguments:
+        spec -- mapping with fit description. All keys are optional:
+        ship, stance, effect_beacon -- type ID
+        modules -- mapping with 'high', 'med' and 'low' keys, whose
+        values are lists with module entries, or Nones for empty
+        slots; module entry is type ID, or sequence in (type ID, state)
+        or (type ID, state, charge type ID) format
+        rigs -- list with type IDs, or Nones for empty slots
+        subsystems, implants, boosters -- iterables with type IDs
+        drones -- iterable with drone entries, type ID or sequence
+        in (type ID, state) format
+        skills -- mapping in {skill type ID: skill level} format,
+        or iterable with (skill type ID, skill level) pairs
+
+        Optional arguments:
+        eos -- eos instance within which fit will operate. If not
+        specified, eos.default_instance is used.
+        eager_calculation -- enable eager calculation mode, see Fit
+        description for details. Default is False.
+
+        Return value:
+        New fit
+        """
+        fit, _ = cls._build_from_spec(spec, eos, eager_calculation)
+        return fit
+
+    @classmethod
+    def from_snapshot(cls, snapshot, eos=None, eager_calculation=False):
+        """
+        Make fit from snapshot. Calculated attribute values are taken
+        from snapshot, thus they do not need to be calculated again.
+
+        Required arguments:
+        snapshot -- snapshot data, as returned by make_snapshot method
+
+        Optional arguments:
+        eos -- eos instance within which fit will operate. If not
+        specified, eos.default_instance is used.
+        eager_calculation -- enable eager calculation mode, see Fit
+        description for details. Default is False.
+
+        Return value:
+        New fit
+
+        Possible exceptions:
+        SnapshotFingerprintError -- raised when snapshot has been made
+        using data different from data of eos instance
+        """
+        fit_eos = eos if eos is not None else Eos._default_instance
+        fingerprint = fit_eos._cache_handler.get_fingerprint()
+        if snapshot['fingerprint'] != fingerprint:
+            raise SnapshotFingerprintError(snapshot['fingerprint'], fingerprint)
+        fit, holders = cls._build_from_spec(snapshot['spec'], fit_eos, eager_calculation)
+        for holder, values in zip(holders, snapshot['attributes']):
+            holder.attributes._load(values)
+        return fit
+
+    def make_snapshot(self):
+        """
+        Make snapshot of fit, which contains description of fit
+        contents, calculated attribute values of all its holders
+        and fingerprint of data used for calculation. Snapshot
+        consists of basic python types only, thus can be stored
+        e.g. as JSON.
+
+        Return value:
+        Mapping with snapshot data
+        """
+        spec, holders = self._make_spec()
+        return {
+            'fingerprint': self.eos._cache_handler.get_fingerprint(),
+            'spec': spec,
+            'attributes': [holder.attributes._dump() if holder is not None else [] for holder in holders]
+        }
+
+    def to_spec(self):
+        """
+        Get compact description of fit contents.
+
+        Return value:
+        Mapping with fit description, in format accepted
+        by from_spec method
+        """
+        spec, _ = self._make_spec()
+        return spec
+
+    @classmethod
+    def _build_from_spec(cls, spec, eos, eager_calculation):
+        """
+        Make fit using compact description of its contents.
+
+        Return value:
+        Tuple with new fit and list with its holders, in order
+        of their appearance in spec, preceded by character
+        """
+        fit = cls(eos=eos, eager_calculation=eager_calculation)
+        fit_eos = fit.eos
+        holders = [fit.character]
+        # Fill fit while it has no eos assigned, to avoid
+        # registration of holders one by one
+        fit.__eos = None
+        for attr_name, holder_class in (
+            ('ship', Ship),
+            ('stance', Stance),
+            ('effect_beacon', EffectBeacon)
+        ):
+            type_id = spec.get(attr_name)
+            if type_id is not None:
+                holder = holder_class(type_id)
+                setattr(fit, attr_name, holder)
+                holders.append(holder)
+        module_specs = spec.get('modules', {})
+        for rack_name, module_class in (
+            ('high', ModuleHigh),
+            ('med', ModuleMed),
+            ('low', ModuleLow)
+        ):
+            rack = getattr(fit.modules, rack_name)
+            for index, entry in enumerate(module_specs.get(rack_name, ())):
+                if entry is None:
+                    continue
+                type_id, state, charge_type_id = _unpack_spec_entry(entry, 3)
+                charge = Charge(charge_type_id) if charge_type_id is not None else None
+                module = module_class(type_id, state=State(state or State.offline), charge=charge)
+                rack.place(index, module)
+                holders.append(module)
+                if charge is not None:
+                    holders.append(charge)
+        for index, type_id in enumerate(spec.get('rigs', ())):
+            if type_id is not None:
+                holder = Rig(type_id)
+                fit.rigs.place(index, holder)
+                holders.append(holder)
+        for container_name, holder_class in (
+            ('subsystems', Subsystem),
+            ('implants', Implant),
+            ('boosters', Booster)
+        ):
+            container = getattr(fit, container_name)
+            for type_id in spec.get(container_name, ()):
+                holder = holder_class(type_id)
+                container.add(holder)
+                holders.append(holder)
+        for entry in spec.get('drones', ()):
+            type_id, state = _unpack_spec_entry(entry, 2)
+            holder = Drone(type_id, state=State(state or State.offline))
+            fit.drones.add(holder)
+            holders.append(holder)
+        skill_specs = spec.get('skills', ())
+        if hasattr(skill_specs, 'items'):
+            skill_specs = skill_specs.items()
+        for type_id, level in skill_specs:
+            holder = Skill(type_id, level=level)
+            fit.skills.add(holder)
+            holders.append(holder)
+        fit.__eos = fit_eos
+        if fit_eos is None:
+            return fit, holders
+        # Character has been added with services enabled already
+        new_holders = holders[1:]
+        for holder in new_holders:
+            holder._refresh_context()
+        # Make link tracker aware of all holders before any
+        # of them starts affecting others
+        for holder in new_holders:
+            fit._link_tracker.add_holder(holder)
+        # Format: {holder state: {states passed to reach it}}
+        states_map = {}
+        for holder in new_holders:
+            try:
+                enabled_states = states_map[holder.state]
+            except KeyError:
+                enabled_states = states_map[holder.state] = set(filter(lambda s: s <= holder.state, State))
+            if len(enabled_states) > 0:
+                fit._link_tracker.enable_states(holder, enabled_states)
+                fit._restriction_tracker.enable_states(holder, enabled_states)
+                fit.stats._enable_states(holder, enabled_states)
+        fit._request_volatile_cleanup()
+        return fit, holders
+
+    def _make_spec(self):
+        """
+        Make compact description of fit contents.
+
+        Return value:
+        Tuple with spec, which consists of basic python types only,
+        and list with fit holders, in the same order as
+        _build_from_spec returns them
+        """
+        spec = {}
+        holders = [self.character]
+        for attr_name in ('ship', 'stance', 'effect_beacon'):
+            holder = getattr(self, attr_name)
+            if holder is not None:
+                spec[attr_name] = holder._type_id
+                holders.append(holder)
+        module_specs = {}
+        for rack_name in ('high', 'med', 'low'):
+            rack_spec = []
+            for module in getattr(self.modules, rack_name):
+                if module is None:
+                    rack_spec.append(None)
+                    continue
+                charge = module.charge
+                if charge is None:
+                    rack_spec.append([module._type_id, int(module.state)])
+                else:
+                    rack_spec.append([module._type_id, int(module.state), charge._type_id])
+                holders.append(module)
+                if charge is not None:
+                    holders.append(charge)
+            if rack_spec:
+                module_specs[rack_name] = rack_spec
+        if module_specs:
+            spec['modules'] = module_specs
+        rig_specs = []
+        for holder in self.rigs:
+            if holder is None:
+                rig_specs.append(None)
+                continue
+            rig_specs.append(holder._type_id)
+            holders.append(holder)
+        if rig_specs:
+            spec['rigs'] = rig_specs
+        for container_name in ('subsystems', 'implants', 'boosters'):
+            container_specs = []
+            for holder in getattr(self, container_name):
+                container_specs.append(holder._type_id)
+                holders.append(holder)
+            if container_specs:
+                spec[container_name] = container_specs
+        drone_specs = []
+        for holder in self.drones:
+            drone_specs.append([holder._type_id, int(holder.state)])
+            holders.append(holder)
+        if drone_specs:
+            spec['drones'] = drone_specs
+        skill_specs = []
+        for holder in self.skills:
+            skill_specs.append([holder._type_id, holder.level])
+            holders.append(holder)
+        if skill_specs:
+            spec['skills'] = skill_specs
+        return spec, holders
+
     ship = HolderDescriptorOnFit('_ship', Ship)
     stance = HolderDescriptorOnFit('_stance', Stance)
     character = HolderDescriptorOnFit('_character', Character)
     effect_beacon = HolderDescriptorOnFit('_effect_beacon', EffectBeacon)
 
+    def clone(self):
+        """
+        Make copy of fit with copies of all its holders. Links between
+        holders are not established anew: fit copy refers to links of
+        this fit until either of fits changes, and holder copies share
+        calculated attribute values with original holders until either
+        of them changes. Holder copies are registered in restriction
+        and stat trackers on first access to them.
+
+        Return value:
+        New fit
+        """
+        fit = Fit(eos=self.eos, eager_calculation=self._link_tracker.eager)
+        fit.character = None
+        # Fill fit while it has no eos assigned, to avoid
+        # registration of holders in services
+        fit.__eos = None
+        # Format: {holder: holder copy}
+        holder_map = {}
+
+        def copy_holder(holder):
+            holder_copy = holder._clone()
+            holder_map[holder] = holder_copy
+            charge = getattr(holder, 'charge', None)
+            if charge is not None:
+                holder_map[charge] = holder_copy.charge
+            return holder_copy
+
+        for attr_name in ('character', 'ship', 'stance', 'effect_beacon'):
+            holder = getattr(self, attr_name)
+            if holder is not None:
+                setattr(fit, attr_name, copy_holder(holder))
+        for container_name in ('skills', 'implants', 'boosters', 'subsystems', 'drones'):
+            container_copy = getattr(fit, container_name)
+            for holder in getattr(self, container_name):
+                container_copy.add(copy_holder(holder))
+        for container, container_copy in (
+            (self.modules.high, fit.modules.high),
+            (self.modules.med, fit.modules.med),
+            (self.modules.low, fit.modules.low),
+            (self.rigs, fit.rigs)
+        ):
+            for index, holder in enumerate(container):
+                if holder is not None:
+                    container_copy.place(index, copy_holder(holder))
+        fit.__eos = self.eos
+        if self.eos is None:
+            return fit
+        for holder, holder_copy in holder_map.items():
+            holder_copy._refresh_context()
+            holder_copy.attributes = holder.attributes._clone(holder_copy)
+        fit._link_tracker = self._link_tracker._clone(fit, holder_map)
+        fit.__untracked_holders = tuple(holder_map.values())
+        return fit
+
+    @property
+    def stats(self):
+        """Access point for all the fitting stats."""
+        self.__track_cloned_holders()
+        return self.__stats
+
+    @property
+    def _restriction_tracker(self):
+        self.__track_cloned_holders()
+        return self.__restriction_tracker
+
+    def __track_cloned_holders(self):
+        """
+        Register holders, which were added to fit during
+        cloning, in restriction and stat trackers.
+        """
+        holders = self.__untracked_holders
+        if len(holders) == 0:
+            return
+        self.__untracked_holders = ()
+        # Format: {holder state: {states passed to reach it}}
+        states_map = {}
+        for holder in holders:
+            try:
+                enabled_states = states_map[holder.state]
+            except KeyError:
+                enabled_states = states_map[holder.state] = set(filter(lambda s: s <= holder.state, State))
+            if len(enabled_states) > 0:
+                self.__restriction_tracker.enable_states(holder, enabled_states)
+                self.__stats._enable_states(holder, enabled_states)
+
+    @contextmanager
+    def batch(self):
+        """
+        Context manager for bulk changes to fit. Cleanup of volatile
+        data, requested by changes within the context, is done once
+        on exit instead of after every change; thus volatile stats
+        accessed within the context may be outdated. Contexts
+        can be nested.
+        """
+        self.__batch_depth += 1
+        try:
+            yield self
+        finally:
+            self.__batch_depth -= 1
+            if self.__batch_depth == 0 and self.__cleanup_pending is True:
+                self.__cleanup_pending = False
+                self._request_volatile_cleanup(eos_check=False)
+
     def validate(self, skip_checks=()):
         """
         Run fit validation.
@@ -99,6 +479,9 @@ class Fit:
         """
         if eos_check is True and self.eos is None:
             return
+        if self.__batch_depth > 0:
+            self.__cleanup_pending = True
+            return
         self.stats._clear_volatile_attrs()
         for holder in self._volatile_holders:
             holder._clear_volatile_attrs()
@@ -133,7 +516,13 @@ class Fit:
         if self.eos is not None:
             self._disable_services(holder)
         self._holders.remove(holder)
-        self._volatile_holders.discard(holder)
+        if holder in self._volatile_holders:
+            self._volatile_holders.remove(holder)
+            # Within batch, cleanup is deferred until exit, when
+            # holder won't be reachable anymore; thus we clean it
+            # right away
+            if self.__batch_depth > 0:
+                holder._clear_volatile_attrs()
         holder._fit = None
 
     def _enable_services(self, holder):
@@ -45,6 +45,7 @@ class ChargeableMixin(CooperativeVolatileMixin):
 
     Cooperative methods:
     __init__
+    _setup_clone
     """
 
     def __init__(self, charge, **kwargs):
@@ -53,6 +54,30 @@ class ChargeableMixin(CooperativeVolatileMixin):
 
     charge = HolderDescriptorOnHolder('_charge', 'container', Charge)
 
+    def _setup_clone(self, clone):
+        """
+        Load copy of charge into holder copy.
+
+        Attempt to call next method in MRO, do nothing
+        on failure to find it.
+
+        Required arguments:
+        clone -- holder copy
+        """
+        # Copy refers to our charge, unlink it without
+        # touching the charge itself
+        clone._charge = None
+        charge = self.charge
+        if charge is not None:
+            clone.charge = charge._clone()
+        next_in_mro = super()
+        try:
+            method = next_in_mro._setup_clone
+        except AttributeError:
+            pass
+        else:
+            method(clone)
+
     @VolatileProperty
     def charge_quantity_max(self):
         """
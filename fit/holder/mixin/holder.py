@@ -19,6 +19,8 @@
 #===============================================================================
 
 
+from copy import copy
+
 from eos.fit.attribute_calculator import MutableAttributeMap
 
 
@@ -33,6 +35,7 @@ class HolderBase:
 
     Cooperative methods:
     __init__
+    _setup_clone
     """
 
     def __init__(self, type_id, **kwargs):
@@ -70,6 +73,40 @@ class HolderBase:
         else:
             self.item = cache_handler.get_type(self._type_id)
 
+    def _clone(self):
+        """
+        Make copy of holder, which is not assigned to any fit.
+        Calculated attribute values are not copied.
+
+        Return value:
+        Holder copy
+        """
+        clone = copy(self)
+        clone.__fit = None
+        clone.item = None
+        clone.attributes = MutableAttributeMap(clone)
+        self._setup_clone(clone)
+        return clone
+
+    def _setup_clone(self, clone):
+        """
+        Adjust holder copy, which shares all instance data
+        with this holder right after copying.
+
+        Attempt to call next method in MRO, do nothing
+        on failure to find it.
+
+        Required arguments:
+        clone -- holder copy
+        """
+        next_in_mro = super()
+        try:
+            method = next_in_mro._setup_clone
+        except AttributeError:
+            pass
+        else:
+            method(clone)
+
     def _request_volatile_cleanup(self):
         """
         Request fit to clear all fit volatile data.
@@ -0,0 +1,141 @@
+#===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+#===============================================================================
+
+
+import multiprocessing
+from collections import namedtuple
+
+from .export import EXPORTABLE_STATS
+from .fit import Fit
+from .restriction_tracker.exception import ValidationError
+
+
+# Stats of single fit, as returned by pool
+# Format of validation_errors: ((holder type ID, restriction type), ...)
+FitStats = namedtuple('FitStats', (
+    'dps',
+    'ehp',
+    'cpu_used',
+    'cpu_output',
+    'powergrid_used',
+    'powergrid_output',
+    'validation_errors'
+))
+
+
+# Eos instance used by worker process; workers are forked,
+# thus it's inherited from parent process with all loaded data
+_worker_eos = None
+# Validation checks skipped by worker process
+_worker_skip_checks = ()
+
+
+def _init_worker(eos, skip_checks):
+    global _worker_eos, _worker_skip_checks
+    _worker_eos = eos
+    _worker_skip_checks = skip_checks
+
+
+def _evaluate_spec(spec):
+    """
+    Build fit from spec and collect its stats.
+
+    Required arguments:
+    spec -- fit description, in format accepted by Fit.from_spec
+
+    Return value:
+    FitStats object
+    """
+    fit = Fit.from_spec(spec, eos=_worker_eos)
+    try:
+        fit.validate(_worker_skip_checks)
+    except ValidationError as e:
+        validation_errors = tuple(sorted(
+            (holder._type_id, restriction_type)
+            for holder, holder_errors in e.args[0].items()
+            for restriction_type in holder_errors
+        ))
+    else:
+        validation_errors = ()
+    values = (EXPORTABLE_STATS[stat](fit) for stat in FitStats._fields[:-1])
+    return FitStats(*values, validation_errors=validation_errors)
+
+
+class FitPool:
+    """
+    Pool of worker processes which evaluate fits. Workers are forked
+    from current process, thus eos instance with all its loaded data
+    is shared with them copy-on-write, instead of being loaded by
+    each worker. Should be created after eos instance is initialized,
+    and is available only on platforms which support forking.
+
+    Required arguments:
+    eos -- eos instance within which fits will be evaluated
+
+    Optional arguments:
+    processes -- number of worker processes. If None, number of
+    CPUs is used. Default is None.
+    chunk_size -- number of fits sent to worker at once. Default is 64.
+    skip_checks -- iterable with validation checks to be skipped.
+    Default is empty tuple.
+
+    Possible exceptions:
+    ValueError -- raised when forking is not supported
+    """
+
+    def __init__(self, eos, processes=None, chunk_size=64, skip_checks=()):
+        context = multiprocessing.get_context('fork')
+        self.__pool = context.Pool(
+            processes=processes,
+            initializer=_init_worker,
+            initargs=(eos, tuple(skip_checks))
+        )
+        self.__chunk_size = chunk_size
+
+    def evaluate(self, specs):
+        """
+        Evaluate fits in worker processes.
+
+        Required arguments:
+        specs -- iterable with fit descriptions, in format
+        accepted by Fit.from_spec
+
+        Return value:
+        Iterator over FitStats objects, in the same order as
+        fit descriptions were passed
+        """
+        return self.__pool.imap(_evaluate_spec, specs, chunksize=self.__chunk_size)
+
+    def close(self):
+        """Wait for all submitted work to complete and stop workers."""
+        self.__pool.close()
+        self.__pool.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # Do not wait for pending work if we're exiting
+        # due to error
+        if exc_type is not None:
+            self.__pool.terminate()
+            self.__pool.join()
+        else:
+            self.close()
@@ -37,5 +37,6 @@ class AttrCalcTestCase(EosTestCase):
         self.fit = Fit(self.ch)
 
     def assert_link_buffers_empty(self, fit):
-        register = fit._link_tracker._register
-        EosTestCase.assert_object_buffers_empty(self, register)
+        tracker = fit._link_tracker
+        EosTestCase.assert_object_buffers_empty(self, tracker)
+        EosTestCase.assert_object_buffers_empty(self, tracker._register)
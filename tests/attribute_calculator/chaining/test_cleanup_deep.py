@@ -0,0 +1,68 @@
+#===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+#===============================================================================
+
+
+import sys
+
+from eos.const.eos import State, Domain, Scope, Operator
+from eos.const.eve import EffectCategory
+from eos.data.cache_object.modifier import Modifier
+from eos.tests.attribute_calculator.attrcalc_testcase import AttrCalcTestCase
+from eos.tests.attribute_calculator.environment import ShipItem
+
+
+class TestCleanupChainDeep(AttrCalcTestCase):
+    """Check that cleanup of long dependency chains is not limited by recursion depth"""
+
+    def test_attribute(self):
+        chain_length = sys.getrecursionlimit() + 100
+        modifiers = []
+        for attr_id in range(1, chain_length):
+            self.ch.attribute(attribute_id=attr_id)
+            modifier = Modifier()
+            modifier.state = State.offline
+            modifier.scope = Scope.local
+            modifier.src_attr = attr_id
+            modifier.operator = Operator.mod_add
+            modifier.tgt_attr = attr_id + 1
+            modifier.domain = Domain.self_
+            modifier.filter_type = None
+            modifier.filter_value = None
+            modifiers.append(modifier)
+        self.ch.attribute(attribute_id=chain_length)
+        effect = self.ch.effect(effect_id=1, category=EffectCategory.passive)
+        effect.modifiers = tuple(modifiers)
+        attributes = {attr_id: 0 for attr_id in range(2, chain_length + 1)}
+        attributes[1] = 1
+        holder = ShipItem(self.ch.type_(type_id=1, effects=(effect,), attributes=attributes))
+        self.fit.ship = holder
+        # Calculate attributes one by one, so that calculation
+        # itself doesn't go deep
+        for attr_id in range(1, chain_length + 1):
+            self.assertEqual(holder.attributes[attr_id], 1)
+        tracker = self.fit._link_tracker
+        self.assertEqual(tracker.clear_holder_attribute_dependents(holder, 1), chain_length - 1)
+        # Nothing is left to clear
+        self.assertEqual(tracker.clear_holder_attribute_dependents(holder, 1), 0)
+        holder.attributes[1] = 3
+        self.assertEqual(holder.attributes[2], 3)
+        self.fit.ship = None
+        self.assertEqual(len(self.log), 0)
+        self.assert_link_buffers_empty(self.fit)
@@ -0,0 +1,226 @@
+#===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+#===============================================================================
+
+
+from eos.const.eos import State, Domain, Scope, FilterType, Operator
+from eos.const.eve import EffectCategory
+from eos.data.cache_object.modifier import Modifier
+from eos.tests.attribute_calculator.attrcalc_testcase import AttrCalcTestCase
+from eos.tests.attribute_calculator.environment import IndependentItem, ShipItem
+
+
+class TestEager(AttrCalcTestCase):
+    """Check that eager mode updates values in place where possible"""
+
+    def setUp(self):
+        AttrCalcTestCase.setUp(self)
+        self.fit._link_tracker.eager = True
+        self.src_attr = self.ch.attribute(attribute_id=1)
+        self.tgt_attr = self.ch.attribute(attribute_id=2)
+        self.dep_attr = self.ch.attribute(attribute_id=3)
+        self.ship = ShipItem(self.ch.type_(type_id=1, attributes={self.tgt_attr.id: 100, self.dep_attr.id: 1}))
+        self.fit.ship = self.ship
+
+    def make_source(self, type_id, operator, value, tgt_attr=None):
+        modifier = Modifier()
+        modifier.state = State.active
+        modifier.scope = Scope.local
+        modifier.src_attr = self.src_attr.id
+        modifier.operator = operator
+        modifier.tgt_attr = self.tgt_attr.id if tgt_attr is None else tgt_attr
+        modifier.domain = Domain.ship
+        modifier.filter_type = None
+        modifier.filter_value = None
+        effect = self.ch.effect(effect_id=type_id, category=EffectCategory.active)
+        effect.modifiers = (modifier,)
+        holder = IndependentItem(self.ch.type_(type_id=type_id, effects=(effect,), attributes={self.src_attr.id: value}))
+        self.fit.items.add(holder)
+        return holder
+
+    def is_stored(self, attr):
+        return attr in self.ship.attributes._MutableAttributeMap__modified_attributes
+
+    def test_addition(self):
+        holder1 = self.make_source(2, Operator.mod_add, 10)
+        holder2 = self.make_source(3, Operator.post_mul, 2)
+        holder2.state = State.active
+        self.assertAlmostEqual(self.ship.attributes[self.tgt_attr.id], 200)
+        # Addition cannot be applied when value is multiplied
+        # afterwards
+        holder1.state = State.active
+        self.assertFalse(self.is_stored(self.tgt_attr.id))
+        self.assertAlmostEqual(self.ship.attributes[self.tgt_attr.id], 220)
+        holder2.state = State.offline
+        self.assertTrue(self.is_stored(self.tgt_attr.id))
+        self.assertAlmostEqual(self.ship.attributes[self.tgt_attr.id], 110)
+        holder1.state = State.offline
+        self.assertTrue(self.is_stored(self.tgt_attr.id))
+        self.assertAlmostEqual(self.ship.attributes[self.tgt_attr.id], 100)
+        holder1.state = State.active
+        self.assertTrue(self.is_stored(self.tgt_attr.id))
+        self.assertAlmostEqual(self.ship.attributes[self.tgt_attr.id], 110)
+        self.fit.items.remove(holder1)
+        self.fit.items.remove(holder2)
+        self.fit.ship = None
+        self.assertEqual(len(self.log), 0)
+        self.assert_link_buffers_empty(self.fit)
+
+    def test_multiplication(self):
+        holder1 = self.make_source(2, Operator.post_percent, 50)
+        holder2 = self.make_source(3, Operator.post_mul, 2)
+        self.assertAlmostEqual(self.ship.attributes[self.tgt_attr.id], 100)
+        holder1.state = State.active
+        holder2.state = State.active
+        self.assertTrue(self.is_stored(self.tgt_attr.id))
+        self.assertAlmostEqual(self.ship.attributes[self.tgt_attr.id], 300)
+        holder1.state = State.offline
+        self.assertTrue(self.is_stored(self.tgt_attr.id))
+        self.assertAlmostEqual(self.ship.attributes[self.tgt_attr.id], 200)
+        self.fit.items.remove(holder1)
+        self.fit.items.remove(holder2)
+        self.fit.ship = None
+        self.assertEqual(len(self.log), 0)
+        self.assert_link_buffers_empty(self.fit)
+
+    def test_penalized(self):
+        self.tgt_attr.stackable = False
+        holder = self.make_source(2, Operator.post_percent, 50)
+        self.assertAlmostEqual(self.ship.attributes[self.tgt_attr.id], 100)
+        holder.state = State.active
+        self.assertFalse(self.is_stored(self.tgt_attr.id))
+        self.assertAlmostEqual(self.ship.attributes[self.tgt_attr.id], 150)
+        self.fit.items.remove(holder)
+        self.fit.ship = None
+        self.assertEqual(len(self.log), 0)
+        self.assert_link_buffers_empty(self.fit)
+
+    def test_dependents(self):
+        holder = self.make_source(2, Operator.mod_add, 10)
+        # Ship attribute relies on modified attribute
+        modifier = Modifier()
+        modifier.state = State.offline
+        modifier.scope = Scope.local
+        modifier.src_attr = self.tgt_attr.id
+        modifier.operator = Operator.post_mul
+        modifier.tgt_attr = self.dep_attr.id
+        modifier.domain = Domain.self_
+        modifier.filter_type = None
+        modifier.filter_value = None
+        effect = self.ch.effect(effect_id=4, category=EffectCategory.passive)
+        effect.modifiers = (modifier,)
+        ship = ShipItem(self.ch.type_(
+            type_id=4, effects=(effect,), attributes={self.tgt_attr.id: 100, self.dep_attr.id: 1}))
+        self.fit.ship = ship
+        self.ship = ship
+        self.assertAlmostEqual(ship.attributes[self.dep_attr.id], 100)
+        holder.state = State.active
+        self.assertTrue(self.is_stored(self.tgt_attr.id))
+        self.assertFalse(self.is_stored(self.dep_attr.id))
+        self.assertAlmostEqual(ship.attributes[self.dep_attr.id], 110)
+        self.fit.items.remove(holder)
+        self.fit.ship = None
+        self.assertEqual(len(self.log), 0)
+        self.assert_link_buffers_empty(self.fit)
+
+    def test_duplicate_source(self):
+        # Two modifiers with the same source attribute, operator
+        # and target attribute on the same holder
+        modifiers = []
+        for state in (State.offline, State.active):
+            modifier = Modifier()
+            modifier.state = state
+            modifier.scope = Scope.local
+            modifier.src_attr = self.src_attr.id
+            modifier.operator = Operator.mod_add
+            modifier.tgt_attr = self.tgt_attr.id
+            modifier.domain = Domain.ship
+            modifier.filter_type = None
+            modifier.filter_value = None
+            modifiers.append(modifier)
+        effect = self.ch.effect(effect_id=2, category=EffectCategory.active)
+        effect.modifiers = tuple(modifiers)
+        holder = IndependentItem(self.ch.type_(type_id=2, effects=(effect,), attributes={self.src_attr.id: 10}))
+        self.fit.items.add(holder)
+        self.assertAlmostEqual(self.ship.attributes[self.tgt_attr.id], 110)
+        holder.state = State.active
+        self.assertTrue(self.is_stored(self.tgt_attr.id))
+        self.assertAlmostEqual(self.ship.attributes[self.tgt_attr.id], 120)
+        holder.state = State.offline
+        self.assertTrue(self.is_stored(self.tgt_attr.id))
+        self.assertAlmostEqual(self.ship.attributes[self.tgt_attr.id], 110)
+        holder.attributes[self.src_attr.id] = 20
+        self.assertAlmostEqual(self.ship.attributes[self.tgt_attr.id], 120)
+        self.fit.items.remove(holder)
+        self.fit.ship = None
+        self.assertEqual(len(self.log), 0)
+        self.assert_link_buffers_empty(self.fit)
+
+    def check_chained(self, reverse):
+        # Holder modifies its own attribute, which is used
+        # as source by another modifier of the same holder
+        modifier_self = Modifier()
+        modifier_self.state = State.active
+        modifier_self.scope = Scope.local
+        modifier_self.src_attr = self.src_attr.id
+        modifier_self.operator = Operator.post_mul
+        modifier_self.tgt_attr = self.tgt_attr.id
+        modifier_self.domain = Domain.self_
+        modifier_self.filter_type = None
+        modifier_self.filter_value = None
+        modifier_ship = Modifier()
+        modifier_ship.state = State.active
+        modifier_ship.scope = Scope.local
+        modifier_ship.src_attr = self.tgt_attr.id
+        modifier_ship.operator = Operator.mod_add
+        modifier_ship.tgt_attr = self.dep_attr.id
+        modifier_ship.domain = Domain.ship
+        modifier_ship.filter_type = None
+        modifier_ship.filter_value = None
+        modifiers = (modifier_self, modifier_ship)
+        if reverse is True:
+            modifiers = tuple(reversed(modifiers))
+        effect = self.ch.effect(effect_id=2, category=EffectCategory.active)
+        effect.modifiers = modifiers
+        holder = IndependentItem(self.ch.type_(
+            type_id=2, effects=(effect,), attributes={self.src_attr.id: 3, self.tgt_attr.id: 5}))
+        self.fit.items.add(holder)
+        ship = ShipItem(self.ch.type_(type_id=3, attributes={self.dep_attr.id: 100}))
+        self.fit.ship = ship
+        self.ship = ship
+        self.assertAlmostEqual(holder.attributes[self.tgt_attr.id], 5)
+        self.assertAlmostEqual(ship.attributes[self.dep_attr.id], 100)
+        holder.state = State.active
+        self.assertAlmostEqual(holder.attributes[self.tgt_attr.id], 15)
+        self.assertAlmostEqual(ship.attributes[self.dep_attr.id], 115)
+        holder.state = State.offline
+        self.assertAlmostEqual(holder.attributes[self.tgt_attr.id], 5)
+        self.assertAlmostEqual(ship.attributes[self.dep_attr.id], 100)
+        holder.state = State.active
+        self.assertAlmostEqual(ship.attributes[self.dep_attr.id], 115)
+        self.fit.items.remove(holder)
+        self.fit.ship = None
+        self.assertEqual(len(self.log), 0)
+        self.assert_link_buffers_empty(self.fit)
+
+    def test_chained(self):
+        self.check_chained(reverse=False)
+
+    def test_chained_reversed(self):
+        self.check_chained(reverse=True)
@@ -0,0 +1,154 @@
+#===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+#===============================================================================
+
+
+from unittest.mock import patch
+
+from eos.const.eos import State, Domain, Scope, FilterType, Operator
+from eos.const.eve import EffectCategory
+from eos.data.cache_object.modifier import Modifier
+from eos.fit.attribute_calculator import penalty
+from eos.tests.attribute_calculator.attrcalc_testcase import AttrCalcTestCase
+from eos.tests.attribute_calculator.environment import IndependentItem, ShipItem
+
+
+class TestGetMany(AttrCalcTestCase):
+    """Check that batch attribute fetching gives the same results as regular access"""
+
+    def setUp(self):
+        AttrCalcTestCase.setUp(self)
+        self.src_attr = self.ch.attribute(attribute_id=1)
+        self.tgt_attr1 = self.ch.attribute(attribute_id=2)
+        self.tgt_attr2 = self.ch.attribute(attribute_id=3, max_attribute=4)
+        self.cap_attr = self.ch.attribute(attribute_id=4)
+        self.untouched_attr = self.ch.attribute(attribute_id=5)
+        modifiers = []
+        for tgt_attr in (self.tgt_attr1, self.tgt_attr2):
+            modifier = Modifier()
+            modifier.state = State.offline
+            modifier.scope = Scope.local
+            modifier.src_attr = self.src_attr.id
+            modifier.operator = Operator.post_percent
+            modifier.tgt_attr = tgt_attr.id
+            modifier.domain = Domain.ship
+            modifier.filter_type = None
+            modifier.filter_value = None
+            modifiers.append(modifier)
+        effect = self.ch.effect(effect_id=1, category=EffectCategory.passive)
+        effect.modifiers = tuple(modifiers)
+        self.influence_source = IndependentItem(self.ch.type_(
+            type_id=1, effects=(effect,), attributes={self.src_attr.id: 20}))
+        self.fit.items.add(self.influence_source)
+        self.influence_target = ShipItem(self.ch.type_(type_id=2, attributes={
+            self.tgt_attr1.id: 50, self.tgt_attr2.id: 100, self.cap_attr.id: 110, self.untouched_attr.id: 8}))
+        self.fit.ship = self.influence_target
+
+    def test_get_many(self):
+        attr_ids = (self.tgt_attr1.id, self.tgt_attr2.id, self.cap_attr.id, self.untouched_attr.id)
+        values = self.influence_target.attributes.get_many(attr_ids)
+        self.assertAlmostEqual(values[self.tgt_attr1.id], 60)
+        self.assertAlmostEqual(values[self.tgt_attr2.id], 110)
+        self.assertAlmostEqual(values[self.cap_attr.id], 110)
+        self.assertAlmostEqual(values[self.untouched_attr.id], 8)
+        # Values should stay valid for regular access and
+        # be properly invalidated
+        self.influence_source.attributes[self.src_attr.id] = 40
+        values = self.influence_target.attributes.get_many(attr_ids)
+        self.assertAlmostEqual(values[self.tgt_attr1.id], 70)
+        self.assertAlmostEqual(values[self.tgt_attr2.id], 110)
+        self.assertAlmostEqual(self.influence_target.attributes[self.tgt_attr1.id], 70)
+        self.fit.items.remove(self.influence_source)
+        self.assertAlmostEqual(self.influence_target.attributes.get_many(attr_ids)[self.tgt_attr1.id], 50)
+        self.fit.ship = None
+        self.assertEqual(len(self.log), 0)
+        self.assert_link_buffers_empty(self.fit)
+
+    def test_metadata(self):
+        attr_ids = (self.tgt_attr1.id, self.tgt_attr2.id, self.cap_attr.id, self.untouched_attr.id)
+        with patch.object(self.ch, 'get_attribute', wraps=self.ch.get_attribute) as get_attribute:
+            self.influence_target.attributes.get_many(attr_ids)
+        # Metadata of each requested attribute is fetched once
+        fetched = [call[1][0] for call in get_attribute.mock_calls]
+        for attr_id in attr_ids:
+            self.assertEqual(fetched.count(attr_id), 1)
+        self.fit.items.remove(self.influence_source)
+        self.fit.ship = None
+        self.assertEqual(len(self.log), 0)
+        self.assert_link_buffers_empty(self.fit)
+
+    def test_snapshot(self):
+        snapshot = self.influence_target.attributes.snapshot()
+        self.assertEqual(len(snapshot), 4)
+        for attr_id, value in snapshot.items():
+            self.assertAlmostEqual(value, self.influence_target.attributes[attr_id])
+        self.fit.items.remove(self.influence_source)
+        self.fit.ship = None
+        self.assertEqual(len(self.log), 0)
+        self.assert_link_buffers_empty(self.fit)
+
+    def add_penalized_sources(self):
+        penalized_attrs = (
+            self.ch.attribute(attribute_id=6, stackable=False),
+            self.ch.attribute(attribute_id=7, stackable=False)
+        )
+        modifiers = []
+        for tgt_attr in penalized_attrs:
+            modifier = Modifier()
+            modifier.state = State.offline
+            modifier.scope = Scope.local
+            modifier.src_attr = self.src_attr.id
+            modifier.operator = Operator.post_percent
+            modifier.tgt_attr = tgt_attr.id
+            modifier.domain = Domain.ship
+            modifier.filter_type = None
+            modifier.filter_value = None
+            modifiers.append(modifier)
+        effect = self.ch.effect(effect_id=2, category=EffectCategory.passive)
+        effect.modifiers = tuple(modifiers)
+        sources = (
+            IndependentItem(self.ch.type_(type_id=3, effects=(effect,), attributes={self.src_attr.id: 20})),
+            IndependentItem(self.ch.type_(type_id=4, effects=(effect,), attributes={self.src_attr.id: 50}))
+        )
+        for source in sources:
+            self.fit.items.add(source)
+        target = ShipItem(self.ch.type_(type_id=5, attributes={6: 100, 7: 10}))
+        self.fit.ship = target
+        return target, sources
+
+    def check_penalized(self):
+        target, sources = self.add_penalized_sources()
+        values = target.attributes.get_many((6, 7))
+        factor = 1.5 * (1 + 0.2 * penalty.PENALTY_BASE)
+        self.assertAlmostEqual(values[6], 100 * factor)
+        self.assertAlmostEqual(values[7], 10 * factor)
+        self.assertAlmostEqual(target.attributes[6], 100 * factor)
+        for source in sources:
+            self.fit.items.remove(source)
+        self.fit.items.remove(self.influence_source)
+        self.fit.ship = None
+        self.assertEqual(len(self.log), 0)
+        self.assert_link_buffers_empty(self.fit)
+
+    def test_penalized(self):
+        self.check_penalized()
+
+    def test_penalized_vectorized(self):
+        with patch.object(penalty, 'BATCH_VECTORIZE_THRESHOLD', 1):
+            self.check_penalized()
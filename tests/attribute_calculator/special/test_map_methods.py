@@ -85,3 +85,18 @@ class TestMapMethods(AttrCalcTestCase):
         self.fit.items.remove(self.holder)
         self.assertEqual(len(self.log), 0)
         self.assert_link_buffers_empty(self.fit)
+
+    def test_get_many(self):
+        values = self.holder.attributes.get_many((self.attr1.id, self.attr2.id, 1008))
+        self.assertEqual(values, {self.attr1.id: 5, self.attr2.id: 20})
+        self.fit.items.remove(self.holder)
+        # Attempt to fetch non-existent attribute generates
+        # error, which is not related to this test
+        self.assertEqual(len(self.log), 1)
+        self.assert_link_buffers_empty(self.fit)
+
+    def test_snapshot(self):
+        self.assertEqual(self.holder.attributes.snapshot(), {self.attr1.id: 5, self.attr2.id: 20, self.attr3.id: 40})
+        self.fit.items.remove(self.holder)
+        self.assertEqual(len(self.log), 0)
+        self.assert_link_buffers_empty(self.fit)
@@ -0,0 +1,76 @@
+#===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+#===============================================================================
+
+
+from math import exp
+from unittest.mock import patch
+
+from eos.fit.attribute_calculator import penalty, penalize_values, penalize_batch
+from eos.tests.eos_testcase import EosTestCase
+
+
+class TestPenalty(EosTestCase):
+    """Check stacking penalty helpers"""
+
+    def reference(self, mod_list):
+        base = 1 / exp((1 / 2.67) ** 2)
+        result = 1
+        positive = sorted((val - 1 for val in mod_list if val >= 1), reverse=True)
+        negative = sorted(val - 1 for val in mod_list if val < 1)
+        for chain in (positive, negative):
+            for position, val in enumerate(chain[:11]):
+                result *= 1 + val * base ** (position ** 2)
+        return result
+
+    def setUp(self):
+        EosTestCase.setUp(self)
+        self.mod_lists = [
+            (),
+            (1.25,),
+            (0.7, 1.1, 1.3, 0.9, 1.0, 1.5),
+            tuple(1 + 0.01 * i for i in range(15)),
+            tuple(1 - 0.02 * i for i in range(1, 14))
+        ]
+
+    def test_single(self):
+        for mod_list in self.mod_lists:
+            self.assertAlmostEqual(penalize_values(mod_list), self.reference(mod_list))
+
+    def test_batch(self):
+        result = penalize_batch(self.mod_lists)
+        self.assertEqual(len(result), len(self.mod_lists))
+        for value, mod_list in zip(result, self.mod_lists):
+            self.assertAlmostEqual(value, self.reference(mod_list))
+
+    def test_batch_vectorized(self):
+        mod_lists = self.mod_lists * penalty.BATCH_VECTORIZE_THRESHOLD
+        result = penalize_batch(mod_lists)
+        self.assertEqual(len(result), len(mod_lists))
+        for value, mod_list in zip(result, mod_lists):
+            self.assertAlmostEqual(value, self.reference(mod_list))
+
+    def test_batch_no_numpy(self):
+        with patch.object(penalty, 'numpy', None):
+            result = penalize_batch(self.mod_lists)
+        for value, mod_list in zip(result, self.mod_lists):
+            self.assertAlmostEqual(value, self.reference(mod_list))
+
+    def test_batch_empty(self):
+        self.assertEqual(penalize_batch([]), [])
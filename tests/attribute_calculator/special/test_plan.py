@@ -0,0 +1,82 @@
+#===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+#===============================================================================
+
+
+from eos.const.eos import State, Domain, Scope, FilterType, Operator
+from eos.const.eve import EffectCategory
+from eos.data.cache_object.modifier import Modifier
+from eos.tests.attribute_calculator.attrcalc_testcase import AttrCalcTestCase
+from eos.tests.attribute_calculator.environment import IndependentItem, ShipItem
+
+
+class TestCalculationPlan(AttrCalcTestCase):
+    """Check that calculation plans are reused and recompiled when needed"""
+
+    def setUp(self):
+        AttrCalcTestCase.setUp(self)
+        self.src_attr = self.ch.attribute(attribute_id=1)
+        self.tgt_attr = self.ch.attribute(attribute_id=2, stackable=False)
+        modifier = Modifier()
+        modifier.state = State.active
+        modifier.scope = Scope.local
+        modifier.src_attr = self.src_attr.id
+        modifier.operator = Operator.post_percent
+        modifier.tgt_attr = self.tgt_attr.id
+        modifier.domain = Domain.ship
+        modifier.filter_type = None
+        modifier.filter_value = None
+        effect = self.ch.effect(effect_id=1, category=EffectCategory.active)
+        effect.modifiers = (modifier,)
+        self.influence_source = IndependentItem(self.ch.type_(
+            type_id=1, effects=(effect,), attributes={self.src_attr.id: 20}))
+        self.influence_source.state = State.active
+        self.influence_target = ShipItem(self.ch.type_(type_id=2, attributes={self.tgt_attr.id: 100}))
+        self.fit.ship = self.influence_target
+        self.fit.items.add(self.influence_source)
+
+    def get_plan(self):
+        return self.influence_target.attributes._MutableAttributeMap__plans.get(self.tgt_attr.id)
+
+    def test_source_change(self):
+        self.assertAlmostEqual(self.influence_target.attributes[self.tgt_attr.id], 120)
+        plan = self.get_plan()
+        self.assertIsNotNone(plan)
+        # Change of source value doesn't change set of affectors,
+        # thus plan should be reused
+        self.influence_source.attributes[self.src_attr.id] = 50
+        self.assertAlmostEqual(self.influence_target.attributes[self.tgt_attr.id], 150)
+        self.assertIs(self.get_plan(), plan)
+        self.fit.items.remove(self.influence_source)
+        self.fit.ship = None
+        self.assertEqual(len(self.log), 0)
+        self.assert_link_buffers_empty(self.fit)
+
+    def test_state_switch(self):
+        self.assertAlmostEqual(self.influence_target.attributes[self.tgt_attr.id], 120)
+        self.influence_source.state = State.online
+        self.assertIsNone(self.get_plan())
+        self.assertAlmostEqual(self.influence_target.attributes[self.tgt_attr.id], 100)
+        self.influence_source.state = State.active
+        self.assertIsNone(self.get_plan())
+        self.assertAlmostEqual(self.influence_target.attributes[self.tgt_attr.id], 120)
+        self.fit.items.remove(self.influence_source)
+        self.fit.ship = None
+        self.assertEqual(len(self.log), 0)
+        self.assert_link_buffers_empty(self.fit)
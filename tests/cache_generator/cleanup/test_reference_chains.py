@@ -0,0 +1,154 @@
+#===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+#===============================================================================
+
+
+from unittest.mock import patch
+
+from eos.data.cache_generator import CacheGenerator
+from eos.tests.cache_generator.generator_testcase import GeneratorTestCase
+from eos.tests.environment import Logger
+
+
+@patch('eos.data.cache_generator.converter.ModifierBuilder')
+class TestReferenceChains(GeneratorTestCase):
+    """
+    Check that rows restored by cleaner pull in
+    data they refer to in turn.
+    """
+
+    def __add_attribute(self, attribute_id, max_attribute_id=None):
+        self.dh.data['dgmattribs'].append({
+            'attributeID': attribute_id, 'maxAttributeID': max_attribute_id, 'defaultValue': 0.0,
+            'highIsGood': False, 'stackable': False, 'attributeName': ''
+        })
+
+    def __add_effect(self, effect_id, pre_expression=None, modifier_info=None):
+        self.dh.data['dgmeffects'].append({
+            'effectID': effect_id, 'effectCategory': 0, 'isOffensive': False, 'isAssistance': False,
+            'fittingUsageChanceAttributeID': None, 'preExpression': pre_expression, 'postExpression': None,
+            'durationAttributeID': None, 'dischargeAttributeID': None, 'rangeAttributeID': None,
+            'falloffAttributeID': None, 'trackingSpeedAttributeID': None, 'modifierInfo': modifier_info
+        })
+
+    def __add_expression(self, expression_id, arg1=None, type_id=None):
+        self.dh.data['dgmexpressions'].append({
+            'expressionID': expression_id, 'operandID': 6, 'arg1': arg1, 'arg2': None,
+            'expressionValue': None, 'expressionTypeID': type_id,
+            'expressionGroupID': None, 'expressionAttributeID': None
+        })
+
+    def __add_unlinked(self):
+        # Weak type which nothing refers to, should be
+        # removed with its attribute
+        self.dh.data['invtypes'].append({'typeID': 3, 'groupID': 7, 'typeName': ''})
+        self.dh.data['invgroups'].append({'groupID': 7, 'categoryID': 51, 'groupName': ''})
+        self.dh.data['dgmtypeattribs'].append({'typeID': 3, 'attributeID': 1020, 'value': 1.0})
+        self.__add_attribute(1020)
+
+    def __check_log(self):
+        self.assertEqual(len(self.log), 2)
+        literal_stats = self.log[0]
+        self.assertEqual(literal_stats.name, 'eos_test.cache_generator')
+        self.assertEqual(literal_stats.levelno, Logger.INFO)
+        clean_stats = self.log[1]
+        self.assertEqual(clean_stats.name, 'eos_test.cache_generator')
+        self.assertEqual(clean_stats.levelno, Logger.INFO)
+
+    def test_expression_chain(self, mod_builder):
+        # Strong type, whose effect refers to expression, which
+        # refers to another expression, which refers to weak type
+        self.dh.data['invtypes'].append({'typeID': 1, 'groupID': 5, 'typeName': ''})
+        self.dh.data['invgroups'].append({'groupID': 5, 'categoryID': 16, 'groupName': ''})
+        self.dh.data['dgmtypeeffects'].append({'typeID': 1, 'effectID': 200, 'isDefault': False})
+        self.__add_effect(200, pre_expression=100)
+        self.__add_expression(100, arg1=101)
+        self.__add_expression(101, type_id=2)
+        # Weak type, whose attribute refers to another attribute
+        self.dh.data['invtypes'].append({'typeID': 2, 'groupID': 6, 'typeName': ''})
+        self.dh.data['invgroups'].append({'groupID': 6, 'categoryID': 50, 'groupName': ''})
+        self.dh.data['dgmtypeattribs'].append({'typeID': 2, 'attributeID': 1010, 'value': 5.0})
+        self.__add_attribute(1010, max_attribute_id=1011)
+        self.__add_attribute(1011)
+        self.__add_unlinked()
+        mod_builder.return_value.build.return_value = ([], 0)
+        data = self.run_generator()
+        self.__check_log()
+        self.assertEqual(set(data['types']), {1, 2})
+        self.assertEqual(data['types'][2]['category'], 50)
+        self.assertEqual(data['types'][2]['attributes'], {1010: 5.0})
+        self.assertEqual(set(data['attributes']), {1010, 1011})
+        self.assertEqual(set(data['effects']), {200})
+        expressions = mod_builder.mock_calls[0][1][0]
+        self.assertEqual(set(row['expressionID'] for row in expressions), {100, 101})
+
+    def test_modifier_info_type(self, mod_builder):
+        # Strong type, whose effect refers to weak type
+        # via modifier info
+        self.dh.data['invtypes'].append({'typeID': 1, 'groupID': 5, 'typeName': ''})
+        self.dh.data['invgroups'].append({'groupID': 5, 'categoryID': 16, 'groupName': ''})
+        self.dh.data['dgmtypeeffects'].append({'typeID': 1, 'effectID': 201, 'isDefault': False})
+        self.__add_effect(201, modifier_info=(
+            '- domain: shipID\n  func: LocationRequiredSkillModifier\n  modifiedAttributeID: 1009\n'
+            '  modifyingAttributeID: 1008\n  operator: 6\n  skillTypeID: 4\n'
+        ))
+        self.__add_attribute(1008)
+        self.__add_attribute(1009)
+        # Auxiliary rows of weak type should be restored
+        # along with it, as well as data they refer to
+        self.dh.data['invtypes'].append({'typeID': 4, 'groupID': 8, 'typeName': ''})
+        self.dh.data['invgroups'].append({'groupID': 8, 'categoryID': 52, 'groupName': ''})
+        self.dh.data['dgmtypeattribs'].append({'typeID': 4, 'attributeID': 1013, 'value': 2.0})
+        self.__add_attribute(1013)
+        self.dh.data['dgmtypeeffects'].append({'typeID': 4, 'effectID': 203, 'isDefault': False})
+        self.__add_effect(203, pre_expression=104)
+        self.__add_expression(104)
+        self.__add_unlinked()
+        mod_builder.return_value.build.return_value = ([], 0)
+        data = self.run_generator()
+        self.__check_log()
+        self.assertEqual(set(data['types']), {1, 4})
+        self.assertEqual(data['types'][4]['category'], 52)
+        self.assertEqual(data['types'][4]['attributes'], {1013: 2.0})
+        self.assertEqual(set(data['attributes']), {1008, 1009, 1013})
+        self.assertEqual(set(data['effects']), {201, 203})
+        expressions = mod_builder.mock_calls[0][1][0]
+        self.assertEqual(set(row['expressionID'] for row in expressions), {104})
+
+    def test_modifier_info_reused_generator(self, mod_builder):
+        # Generator which is run again should see references
+        # from modifier info of new data, not of old one
+        self.dh.data['invtypes'].append({'typeID': 1, 'groupID': 5, 'typeName': ''})
+        self.dh.data['invgroups'].append({'groupID': 5, 'categoryID': 16, 'groupName': ''})
+        self.dh.data['dgmtypeeffects'].append({'typeID': 1, 'effectID': 201, 'isDefault': False})
+        self.__add_effect(201, modifier_info=(
+            '- domain: shipID\n  func: ItemModifier\n  modifiedAttributeID: 1009\n  operator: 6\n'
+        ))
+        self.__add_attribute(1009)
+        self.__add_attribute(1010)
+        mod_builder.return_value.build.return_value = ([], 0)
+        generator = CacheGenerator(Logger())
+        data1 = self.run_generator(generator=generator)
+        self.assertEqual(set(data1['attributes']), {1009})
+        self.dh.data['dgmeffects'][0]['modifierInfo'] = (
+            '- domain: shipID\n  func: ItemModifier\n  modifiedAttributeID: 1010\n  operator: 6\n'
+        )
+        data2 = self.run_generator(generator=generator)
+        self.assertEqual(set(data2['attributes']), {1010})
+        self.assertEqual(data2, self.run_generator())
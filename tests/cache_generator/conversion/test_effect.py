@@ -62,6 +62,7 @@ class TestConversionEffect(GeneratorTestCase):
             'is_assistance': False, 'duration_attribute': 781,
             'discharge_attribute': 72, 'range_attribute': 2,
             'falloff_attribute': 3, 'tracking_speed_attribute': 6,
-            'fitting_usage_chance_attribute': 96, 'build_status': 29, 'modifiers': [1]
+            'fitting_usage_chance_attribute': 96, 'build_status': 29, 'modifiers': [1],
+            'state': None
         }
         self.assertEqual(data['effects'][112], expected)
@@ -0,0 +1,174 @@
+#===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+#===============================================================================
+
+
+import json
+import os.path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from eos.data.cache_generator import CacheGenerator
+from eos.tests.cache_generator.generator_testcase import GeneratorTestCase
+from eos.tests.environment import Logger
+
+
+@patch('eos.data.cache_generator.converter.ModifierBuilder')
+class TestConversionIncremental(GeneratorTestCase):
+    """
+    When generator is run again, modifiers should be rebuilt
+    only for effects whose data changed.
+    """
+
+    def setUp(self):
+        GeneratorTestCase.setUp(self)
+        self.dh.data['invtypes'].append({'typeID': 1, 'groupID': 1, 'typeName': ''})
+        for effect_id, pre_expression, modifier_info in (
+            (111, 10, None),
+            (222, 20, None),
+            (333, None, 'YAML stuff')
+        ):
+            self.dh.data['dgmtypeeffects'].append({'typeID': 1, 'effectID': effect_id})
+            self.dh.data['dgmeffects'].append({
+                'effectID': effect_id, 'preExpression': pre_expression,
+                'postExpression': None, 'effectCategory': 0,
+                'modifierInfo': modifier_info
+            })
+        for expression_id, arg1 in ((10, 11), (11, None), (20, None)):
+            self.dh.data['dgmexpressions'].append({
+                'expressionID': expression_id, 'operandID': None, 'arg1': arg1, 'arg2': None,
+                'expressionValue': None, 'expressionTypeID': None,
+                'expressionGroupID': None, 'expressionAttributeID': None
+            })
+        self.generator = CacheGenerator(Logger())
+
+    def setup_builder(self, mod_builder):
+        built = []
+
+        def build(effect_row):
+            effect_id = effect_row['effect_id']
+            built.append(effect_id)
+            builder_logger = mod_builder.call_args[0][1]
+            builder_logger.warning('building {}'.format(effect_id), child_name='test', signature=effect_id)
+            modifier = self.mod(
+                state=2, scope=3, src_attr=effect_id, operator=5,
+                tgt_attr=6, domain=7, filter_type=None, filter_value=None
+            )
+            return [modifier], 0
+        mod_builder.return_value.build.side_effect = build
+        return built
+
+    def get_warnings(self):
+        return [record.getMessage() for record in self.log if record.levelno == Logger.WARNING]
+
+    def test_unchanged(self, mod_builder):
+        built = self.setup_builder(mod_builder)
+        data1 = self.run_generator(generator=self.generator)
+        self.assertEqual(sorted(built), [111, 222, 333])
+        self.assertEqual(self.get_warnings(), ['building 111', 'building 222', 'building 333'])
+        del built[:]
+        self.log.clear()
+        data2 = self.run_generator(generator=self.generator)
+        self.assertEqual(built, [])
+        self.assertEqual(data2, data1)
+        self.assertIn('rebuilding modifiers for 0 of 3 effects', [record.getMessage() for record in self.log])
+
+    def test_changed_effect(self, mod_builder):
+        built = self.setup_builder(mod_builder)
+        self.run_generator(generator=self.generator)
+        del built[:]
+        self.dh.data['dgmeffects'][2]['modifierInfo'] = 'other YAML stuff'
+        self.run_generator(generator=self.generator)
+        self.assertEqual(built, [333])
+
+    def test_changed_expression(self, mod_builder):
+        # Change in any expression of tree should
+        # trigger rebuild of effect which uses it
+        built = self.setup_builder(mod_builder)
+        self.run_generator(generator=self.generator)
+        del built[:]
+        self.dh.data['dgmexpressions'][1]['expressionValue'] = 'value'
+        self.run_generator(generator=self.generator)
+        self.assertEqual(built, [111])
+
+    def test_added_effect(self, mod_builder):
+        built = self.setup_builder(mod_builder)
+        data1 = self.run_generator(generator=self.generator)
+        del built[:]
+        self.dh.data['dgmtypeeffects'].append({'typeID': 1, 'effectID': 444})
+        self.dh.data['dgmeffects'].append({
+            'effectID': 444, 'preExpression': 20,
+            'postExpression': None, 'effectCategory': 0,
+            'modifierInfo': None
+        })
+        data2 = self.run_generator(generator=self.generator)
+        self.assertEqual(built, [444])
+        self.assertEqual(data2['effects'][111], data1['effects'][111])
+        self.assertEqual(len(data2['modifiers']), 4)
+
+    def test_same_data_as_fresh_run(self, mod_builder):
+        self.setup_builder(mod_builder)
+        self.run_generator(generator=self.generator)
+        self.dh.data['dgmexpressions'][2]['expressionValue'] = 'value'
+        incremental_data = self.run_generator(generator=self.generator)
+        fresh_data = self.run_generator()
+        self.assertEqual(incremental_data, fresh_data)
+
+    def test_saved_results(self, mod_builder):
+        # Results are reused by generator in another
+        # session via file
+        built = self.setup_builder(mod_builder)
+        with TemporaryDirectory() as tmp_dir:
+            memo_path = os.path.join(tmp_dir, 'cache', 'modifiers.json')
+            data1 = self.run_generator(generator=CacheGenerator(Logger(), memo_path=memo_path))
+            self.assertEqual(sorted(built), [111, 222, 333])
+            del built[:]
+            self.dh.data['dgmeffects'][0]['modifierInfo'] = 'other YAML stuff'
+            self.log.clear()
+            data2 = self.run_generator(generator=CacheGenerator(Logger(), memo_path=memo_path))
+            self.assertEqual(built, [111])
+            self.assertEqual(data2['modifiers'], data1['modifiers'])
+            # Messages logged during building are replayed for
+            # effects whose results were loaded
+            self.assertEqual(self.get_warnings(), ['building 111', 'building 222', 'building 333'])
+            # Results are stored as plain data
+            with open(memo_path, 'r', encoding='utf-8') as file:
+                self.assertEqual(set(json.load(file)['memo']), {'111', '222', '333'})
+
+    def test_saved_results_builder_changed(self, mod_builder):
+        # Results of older modifier builder are not reused
+        built = self.setup_builder(mod_builder)
+        with TemporaryDirectory() as tmp_dir:
+            memo_path = os.path.join(tmp_dir, 'modifiers.json')
+            self.run_generator(generator=CacheGenerator(Logger(), memo_path=memo_path))
+            del built[:]
+            with patch('eos.data.cache_generator.converter.MODIFIER_BUILDER_VERSION', -1):
+                self.run_generator(generator=CacheGenerator(Logger(), memo_path=memo_path))
+            self.assertEqual(sorted(built), [111, 222, 333])
+
+    def test_saved_results_corrupt(self, mod_builder):
+        built = self.setup_builder(mod_builder)
+        with TemporaryDirectory() as tmp_dir:
+            memo_path = os.path.join(tmp_dir, 'modifiers.json')
+            with open(memo_path, 'wb') as file:
+                file.write(b'garbage')
+            self.run_generator(generator=CacheGenerator(Logger(), memo_path=memo_path))
+            self.assertEqual(sorted(built), [111, 222, 333])
+            messages = [record.getMessage() for record in self.log if record.levelno == Logger.WARNING]
+            self.assertIn('error during reading modifier build results, rebuilding all modifiers', messages)
@@ -0,0 +1,84 @@
+#===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+#===============================================================================
+
+
+import multiprocessing
+from unittest import skipIf
+from unittest.mock import patch
+
+from eos.tests.cache_generator.generator_testcase import GeneratorTestCase
+from eos.tests.environment import Logger
+
+
+@skipIf('fork' not in multiprocessing.get_all_start_methods(), 'fork start method is not available')
+@patch('eos.data.cache_generator.converter.ModifierBuilder')
+class TestConversionParallel(GeneratorTestCase):
+    """
+    Modifiers built in worker processes should produce
+    exactly the same data and log as serial building.
+    """
+
+    def setUp(self):
+        GeneratorTestCase.setUp(self)
+        self.dh.data['invtypes'].append({'typeID': 1, 'groupID': 1, 'typeName': ''})
+        for effect_id in range(100, 110):
+            self.dh.data['dgmtypeeffects'].append({'typeID': 1, 'effectID': effect_id})
+            self.dh.data['dgmeffects'].append({
+                'effectID': effect_id, 'preExpression': 1,
+                'postExpression': 11, 'effectCategory': 111,
+                'modifierInfo': 'YAML stuff'
+            })
+
+    def setup_builder(self, mod_builder):
+        def build(effect_row):
+            effect_id = effect_row['effect_id']
+            # Logger is passed to builder as second argument
+            builder_logger = mod_builder.call_args[0][1]
+            builder_logger.warning('building {}'.format(effect_id), child_name='test', signature=effect_id)
+            # Odd effects share the same modifier
+            mod1 = self.mod(
+                state=effect_id % 2, scope=3, src_attr=4, operator=5,
+                tgt_attr=6, domain=7, filter_type=8, filter_value=9
+            )
+            mod2 = self.mod(
+                state=2, scope=3, src_attr=effect_id, operator=5,
+                tgt_attr=6, domain=7, filter_type=None, filter_value=None
+            )
+            return [mod1, mod2], effect_id % 3
+        mod_builder.return_value.build.side_effect = build
+
+    def test_same_data(self, mod_builder):
+        self.setup_builder(mod_builder)
+        serial_data = self.run_generator()
+        parallel_data = self.run_generator(processes=3)
+        self.assertEqual(len(serial_data['modifiers']), 12)
+        self.assertEqual(parallel_data, serial_data)
+
+    def test_same_log(self, mod_builder):
+        self.setup_builder(mod_builder)
+        self.run_generator()
+        serial_log = [(record.levelno, record.getMessage()) for record in self.log]
+        self.log.clear()
+        self.run_generator(processes=3)
+        parallel_log = [(record.levelno, record.getMessage()) for record in self.log]
+        self.assertEqual(len(serial_log), 12)
+        self.assertEqual(serial_log[2], (Logger.WARNING, 'building 100'))
+        self.assertEqual(serial_log[11], (Logger.WARNING, 'building 109'))
+        self.assertEqual(parallel_log, serial_log)
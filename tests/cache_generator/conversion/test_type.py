@@ -19,6 +19,7 @@
 #===============================================================================
 
 
+from eos.const.eos import State, Slot
 from eos.tests.cache_generator.generator_testcase import GeneratorTestCase
 from eos.tests.environment import Logger
 
@@ -55,7 +56,7 @@ class TestConversionType(GeneratorTestCase):
         self.assertEqual(len(data['types']), 1)
         self.assertIn(1, data['types'])
         type_row = data['types'][1]
-        self.assertEqual(len(type_row), 6)
+        self.assertEqual(len(type_row), 11)
         self.assertEqual(type_row['group'], 6)
         self.assertEqual(type_row['category'], 16)
         type_attributes = type_row['attributes']
@@ -68,3 +69,32 @@ class TestConversionType(GeneratorTestCase):
         self.assertIn(1111, type_effects)
         type_defeff = type_row['default_effect']
         self.assertEqual(type_defeff, 111)
+
+    def test_derived(self):
+        self.dh.data['invtypes'].append({'typeID': 1, 'groupID': 6, 'typeName': ''})
+        self.dh.data['invgroups'].append({'categoryID': 16, 'groupID': 6, 'groupName': ''})
+        self.dh.data['dgmtypeattribs'].append({'typeID': 1, 'attributeID': 182, 'value': 3300.0})
+        self.dh.data['dgmtypeattribs'].append({'typeID': 1, 'attributeID': 277, 'value': 3.0})
+        self.dh.data['dgmtypeeffects'].append({'typeID': 1, 'effectID': 11, 'isDefault': False})
+        self.dh.data['dgmtypeeffects'].append({'typeID': 1, 'effectID': 1002, 'isDefault': False})
+        self.dh.data['dgmtypeeffects'].append({'typeID': 1, 'effectID': 111, 'isDefault': False})
+        self.dh.data['dgmeffects'].append({
+            'effectID': 11, 'effectCategory': 0, 'preExpression': None, 'postExpression': None
+        })
+        self.dh.data['dgmeffects'].append({
+            'effectID': 1002, 'effectCategory': 2, 'preExpression': None, 'postExpression': None
+        })
+        self.dh.data['dgmeffects'].append({
+            'effectID': 111, 'effectCategory': 85, 'preExpression': None, 'postExpression': None
+        })
+        data = self.run_generator()
+        self.assertEqual(len(self.log), 2)
+        type_row = data['types'][1]
+        self.assertEqual(type_row['required_skills'], {3300: 3})
+        self.assertEqual(type_row['slots'], [Slot.module_low])
+        self.assertEqual(type_row['max_state'], State.active)
+        self.assertIs(type_row['is_targeted'], True)
+        self.assertEqual(type_row['modifiers'], [])
+        self.assertEqual(data['effects'][11]['state'], State.offline)
+        self.assertEqual(data['effects'][1002]['state'], State.active)
+        self.assertIsNone(data['effects'][111]['state'])
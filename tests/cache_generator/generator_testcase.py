@@ -37,12 +37,13 @@ class GeneratorTestCase(EosTestCase):
         EosTestCase.setUp(self)
         self.dh = DataHandler()
 
-    def run_generator(self):
+    def run_generator(self, processes=1, generator=None):
         """
         Run generator and rework data structure into
         keyed tables so it's easier to check.
         """
-        generator = CacheGenerator(Logger())
+        if generator is None:
+            generator = CacheGenerator(Logger(), processes=processes)
         data = generator.run(self.dh)
         keys = {
             'types': 'type_id',
@@ -0,0 +1,168 @@
+#===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+#===============================================================================
+
+
+import os.path
+from tempfile import TemporaryDirectory
+
+from eos.const.eos import State, Slot
+from eos.data.cache_handler import BinaryCacheHandler
+from eos.data.cache_handler.binary_cache_handler import HEADER, SECTION, SECTIONS
+from eos.data.cache_handler.exception import TypeFetchError, AttributeFetchError, EffectFetchError, ModifierFetchError
+from eos.tests.environment import Logger
+from eos.tests.eos_testcase import EosTestCase
+
+
+class TestBinaryCacheHandler(EosTestCase):
+    """Check that data survives round trip through binary cache file"""
+
+    def setUp(self):
+        EosTestCase.setUp(self)
+        self.tmp_dir = TemporaryDirectory()
+        self.cache_path = os.path.join(self.tmp_dir.name, 'cache', 'eos.bin')
+        self.data = {
+            'types': [
+                {'type_id': 1, 'group': 6, 'category': 16, 'attributes': {5: 10.0, 80: 180},
+                 'effects': [111], 'default_effect': 111, 'required_skills': {3300: 1},
+                 'slots': [3], 'max_state': 1, 'is_targeted': False, 'modifiers': [7]},
+                {'type_id': 2, 'group': None, 'category': None, 'attributes': {},
+                 'effects': [], 'default_effect': None, 'required_skills': {},
+                 'slots': [], 'max_state': 1, 'is_targeted': False, 'modifiers': []}
+            ],
+            'attributes': [
+                {'attribute_id': 5, 'max_attribute': 80, 'default_value': 0.5,
+                 'high_is_good': True, 'stackable': False}
+            ],
+            'effects': [
+                {'effect_id': 111, 'effect_category': 0, 'is_offensive': False, 'is_assistance': True,
+                 'duration_attribute': None, 'discharge_attribute': 5, 'range_attribute': None,
+                 'falloff_attribute': None, 'tracking_speed_attribute': None,
+                 'fitting_usage_chance_attribute': None, 'build_status': 4, 'modifiers': [7],
+                 'state': 1}
+            ],
+            'modifiers': [
+                {'modifier_id': 7, 'state': 1, 'scope': 1, 'src_attr': 5, 'operator': 6,
+                 'tgt_attr': 80, 'domain': 3, 'filter_type': 2, 'filter_value': 55}
+            ]
+        }
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+        EosTestCase.tearDown(self)
+
+    def test_update(self):
+        cache_handler = BinaryCacheHandler(self.cache_path, Logger())
+        self.assertIsNone(cache_handler.get_fingerprint())
+        cache_handler.update_cache(self.data, 'fp_1')
+        self.assertEqual(cache_handler.get_fingerprint(), 'fp_1')
+        type_ = cache_handler.get_type(1)
+        self.assertEqual(type_.group, 6)
+        self.assertEqual(type_.category, 16)
+        self.assertEqual(type_.attributes, {5: 10.0, 80: 180})
+        self.assertEqual(len(type_.effects), 1)
+        self.assertIs(type_.default_effect, type_.effects[0])
+        self.assertEqual(type_.required_skills, {3300: 1})
+        self.assertEqual(type_.slots, {Slot.module_low})
+        self.assertIs(type_.max_state, State.offline)
+        self.assertIs(type_.is_targeted, False)
+        self.assertEqual(len(type_.modifiers), 1)
+        self.assertIs(type_.modifiers[0], type_.effects[0].modifiers[0])
+        self.assertIs(type_.effects[0]._state, State.offline)
+        self.assertEqual(len(self.log), 0)
+
+    def test_reload(self):
+        BinaryCacheHandler(self.cache_path, Logger()).update_cache(self.data, 'fp_1')
+        cache_handler = BinaryCacheHandler(self.cache_path, Logger())
+        self.assertEqual(cache_handler.get_fingerprint(), 'fp_1')
+        attribute = cache_handler.get_attribute(5)
+        self.assertEqual(attribute.max_attribute, 80)
+        self.assertEqual(attribute.default_value, 0.5)
+        self.assertIs(attribute.high_is_good, True)
+        self.assertIs(attribute.stackable, False)
+        effect = cache_handler.get_effect(111)
+        self.assertEqual(effect.category, 0)
+        self.assertIs(effect.is_assistance, True)
+        self.assertEqual(effect.discharge_attribute, 5)
+        self.assertIsNone(effect.range_attribute)
+        self.assertEqual(effect.build_status, 4)
+        modifier = effect.modifiers[0]
+        self.assertIs(modifier, cache_handler.get_modifier(7))
+        self.assertEqual(modifier.src_attr, 5)
+        self.assertEqual(modifier.tgt_attr, 80)
+        self.assertEqual(modifier.filter_value, 55)
+        type_ = cache_handler.get_type(2)
+        self.assertIsNone(type_.group)
+        self.assertEqual(type_.effects, ())
+        self.assertEqual(len(self.log), 0)
+
+    def test_missing(self):
+        cache_handler = BinaryCacheHandler(self.cache_path, Logger())
+        self.assertRaises(TypeFetchError, cache_handler.get_type, 1)
+        cache_handler.update_cache(self.data, 'fp_1')
+        self.assertRaises(TypeFetchError, cache_handler.get_type, 3)
+        self.assertRaises(TypeFetchError, cache_handler.get_type, None)
+        self.assertRaises(AttributeFetchError, cache_handler.get_attribute, 4)
+        self.assertRaises(EffectFetchError, cache_handler.get_effect, 112)
+        self.assertRaises(ModifierFetchError, cache_handler.get_modifier, 0)
+        self.assertEqual(len(self.log), 0)
+
+    def test_corrupt(self):
+        os.makedirs(os.path.dirname(self.cache_path))
+        with open(self.cache_path, 'wb') as file:
+            file.write(b'garbage')
+        cache_handler = BinaryCacheHandler(self.cache_path, Logger())
+        self.assertIsNone(cache_handler.get_fingerprint())
+        self.assertRaises(TypeFetchError, cache_handler.get_type, 1)
+        self.assertEqual(len(self.log), 1)
+        log_record = self.log[0]
+        self.assertEqual(log_record.name, 'eos_test.cache_handler')
+        self.assertEqual(log_record.levelno, Logger.ERROR)
+
+    def test_truncated_record(self):
+        # Header is intact, but last record is cut off
+        BinaryCacheHandler(self.cache_path, Logger()).update_cache(self.data, 'fp_1')
+        with open(self.cache_path, 'rb') as file:
+            binary_data = file.read()
+        with open(self.cache_path, 'wb') as file:
+            file.write(binary_data[:-1])
+        cache_handler = BinaryCacheHandler(self.cache_path, Logger())
+        self.assertEqual(cache_handler.get_fingerprint(), 'fp_1')
+        self.assertEqual(cache_handler.get_attribute(5).max_attribute, 80)
+        self.assertRaises(ModifierFetchError, cache_handler.get_modifier, 7)
+        self.assertEqual(len(self.log), 1)
+        log_record = self.log[0]
+        self.assertEqual(log_record.name, 'eos_test.cache_handler')
+        self.assertEqual(log_record.levelno, Logger.ERROR)
+
+    def test_truncated_index(self):
+        # Header and section table are intact, but
+        # index is cut off in the middle of first entry
+        BinaryCacheHandler(self.cache_path, Logger()).update_cache(self.data, 'fp_1')
+        with open(self.cache_path, 'rb') as file:
+            binary_data = file.read()
+        with open(self.cache_path, 'wb') as file:
+            file.write(binary_data[:HEADER.size + len('fp_1') + SECTION.size * len(SECTIONS) + 4])
+        cache_handler = BinaryCacheHandler(self.cache_path, Logger())
+        self.assertEqual(cache_handler.get_fingerprint(), 'fp_1')
+        self.assertRaises(TypeFetchError, cache_handler.get_type, 1)
+        self.assertEqual(len(self.log), 1)
+        log_record = self.log[0]
+        self.assertEqual(log_record.name, 'eos_test.cache_handler')
+        self.assertEqual(log_record.levelno, Logger.ERROR)
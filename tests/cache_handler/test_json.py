@@ -0,0 +1,183 @@
+#===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+#===============================================================================
+
+
+import bz2
+import json
+import os.path
+import struct
+from tempfile import TemporaryDirectory
+
+from eos.const.eos import State
+from eos.data.cache_handler import JsonCacheHandler
+from eos.data.cache_handler.exception import TypeFetchError, EffectFetchError
+from eos.tests.environment import Logger
+from eos.tests.eos_testcase import EosTestCase
+
+
+class TestJsonCacheHandler(EosTestCase):
+    """Check that data survives round trip through JSON cache file"""
+
+    def setUp(self):
+        EosTestCase.setUp(self)
+        self.tmp_dir = TemporaryDirectory()
+        self.cache_path = os.path.join(self.tmp_dir.name, 'cache', 'eos.json.bz2')
+        types = []
+        for type_id in range(1, 1201):
+            types.append({'type_id': type_id, 'group': type_id * 2, 'category': 16,
+                          'attributes': {5: float(type_id)}, 'effects': [111], 'default_effect': None,
+                          'required_skills': {}, 'slots': [], 'max_state': 1, 'is_targeted': False,
+                          'modifiers': [7]})
+        self.data = {
+            'types': types,
+            'attributes': [
+                {'attribute_id': 5, 'max_attribute': None, 'default_value': 0.0,
+                 'high_is_good': True, 'stackable': True}
+            ],
+            'effects': [
+                {'effect_id': 111, 'effect_category': 0, 'is_offensive': False, 'is_assistance': False,
+                 'duration_attribute': None, 'discharge_attribute': None, 'range_attribute': None,
+                 'falloff_attribute': None, 'tracking_speed_attribute': None,
+                 'fitting_usage_chance_attribute': None, 'build_status': 4, 'modifiers': [7],
+                 'state': 1}
+            ],
+            'modifiers': [
+                {'modifier_id': 7, 'state': 1, 'scope': 1, 'src_attr': 5, 'operator': 6,
+                 'tgt_attr': 5, 'domain': 1, 'filter_type': None, 'filter_value': None}
+            ]
+        }
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+        EosTestCase.tearDown(self)
+
+    def __check_data(self, cache_handler):
+        self.assertEqual(cache_handler.get_fingerprint(), 'fp_1')
+        for type_id in (1, 500, 501, 1200):
+            type_ = cache_handler.get_type(type_id)
+            self.assertEqual(type_.group, type_id * 2)
+            self.assertEqual(type_.attributes, {5: float(type_id)})
+            self.assertEqual(type_.effects[0].modifiers[0].tgt_attr, 5)
+            self.assertIs(type_.max_state, State.offline)
+            self.assertEqual(type_.modifiers, type_.effects[0].modifiers)
+        self.assertRaises(TypeFetchError, cache_handler.get_type, 0)
+        self.assertRaises(TypeFetchError, cache_handler.get_type, 1201)
+        self.assertRaises(EffectFetchError, cache_handler.get_effect, 112)
+
+    def test_regular(self):
+        JsonCacheHandler(self.cache_path, Logger()).update_cache(self.data, 'fp_1')
+        self.__check_data(JsonCacheHandler(self.cache_path, Logger()))
+        self.assertEqual(len(self.log), 0)
+
+    def test_lazy_update(self):
+        cache_handler = JsonCacheHandler(self.cache_path, Logger(), lazy=True)
+        self.assertIsNone(cache_handler.get_fingerprint())
+        self.assertRaises(TypeFetchError, cache_handler.get_type, 1)
+        cache_handler.update_cache(self.data, 'fp_1')
+        self.__check_data(cache_handler)
+        self.assertEqual(len(self.log), 0)
+
+    def test_lazy_reload(self):
+        JsonCacheHandler(self.cache_path, Logger(), lazy=True).update_cache(self.data, 'fp_1')
+        self.__check_data(JsonCacheHandler(self.cache_path, Logger(), lazy=True))
+        self.assertEqual(len(self.log), 0)
+
+    def test_lazy_truncated(self):
+        JsonCacheHandler(self.cache_path, Logger(), lazy=True).update_cache(self.data, 'fp_1')
+        # Leave only header in file
+        with open(self.cache_path, 'rb') as file:
+            header_length = struct.unpack('<Q', file.read(8))[0]
+        os.truncate(self.cache_path, 8 + header_length)
+        cache_handler = JsonCacheHandler(self.cache_path, Logger(), lazy=True)
+        self.assertEqual(cache_handler.get_fingerprint(), 'fp_1')
+        self.assertRaises(TypeFetchError, cache_handler.get_type, 1)
+        self.assertRaises(EffectFetchError, cache_handler.get_effect, 111)
+        self.assertEqual(len(self.log), 0)
+
+    def test_lazy_damaged(self):
+        JsonCacheHandler(self.cache_path, Logger(), lazy=True).update_cache(self.data, 'fp_1')
+        # Overwrite start of the first chunk
+        with open(self.cache_path, 'r+b') as file:
+            header_length = struct.unpack('<Q', file.read(8))[0]
+            file.seek(8 + header_length)
+            file.write(b'\x00' * 64)
+        cache_handler = JsonCacheHandler(self.cache_path, Logger(), lazy=True)
+        self.assertRaises(TypeFetchError, cache_handler.get_type, 1)
+        self.assertEqual(len(self.log), 0)
+
+    def test_lazy_format_mismatch(self):
+        # Regular cache file cannot be used in lazy mode
+        JsonCacheHandler(self.cache_path, Logger()).update_cache(self.data, 'fp_1')
+        cache_handler = JsonCacheHandler(self.cache_path, Logger(), lazy=True)
+        self.assertIsNone(cache_handler.get_fingerprint())
+        self.assertEqual(len(self.log), 1)
+        log_record = self.log[0]
+        self.assertEqual(log_record.name, 'eos_test.cache_handler')
+        self.assertEqual(log_record.levelno, Logger.ERROR)
+
+    def test_outdated_format(self):
+        # Cache written with older row layout has no format
+        # version and should not be loaded
+        os.makedirs(os.path.dirname(self.cache_path))
+        with bz2.BZ2File(self.cache_path, 'w') as file:
+            old_data = {'fingerprint': 'fp_1', 'types': {}, 'attributes': {}, 'effects': {}, 'modifiers': {}}
+            file.write(json.dumps(old_data).encode('utf-8'))
+        cache_handler = JsonCacheHandler(self.cache_path, Logger())
+        self.assertIsNone(cache_handler.get_fingerprint())
+        self.assertRaises(TypeFetchError, cache_handler.get_type, 1)
+        self.assertEqual(len(self.log), 1)
+        log_record = self.log[0]
+        self.assertEqual(log_record.name, 'eos_test.cache_handler')
+        self.assertEqual(log_record.levelno, Logger.ERROR)
+
+    def test_obj_cache_pinning(self):
+        cache_handler = JsonCacheHandler(self.cache_path, Logger(), obj_cache_size=2)
+        cache_handler.update_cache(self.data, 'fp_1')
+        type_id = id(cache_handler.get_type(1))
+        # Nothing references type anymore, but it is still
+        # among recently used ones
+        self.assertEqual(id(cache_handler.get_type(1)), type_id)
+        type_stats = cache_handler.get_obj_cache_stats()['types']
+        self.assertEqual(type_stats.hits, 1)
+        self.assertEqual(type_stats.misses, 1)
+        self.assertEqual(type_stats.size, 1)
+        # Push it out of the cache
+        cache_handler.get_type(2)
+        cache_handler.get_type(3)
+        type_stats = cache_handler.get_obj_cache_stats()['types']
+        self.assertEqual(type_stats.misses, 3)
+        self.assertEqual(type_stats.size, 2)
+        cache_handler.get_type(1)
+        type_stats = cache_handler.get_obj_cache_stats()['types']
+        self.assertEqual(type_stats.hits, 1)
+        self.assertEqual(type_stats.misses, 4)
+        self.assertEqual(len(self.log), 0)
+
+    def test_obj_cache_weak(self):
+        cache_handler = JsonCacheHandler(self.cache_path, Logger(), obj_cache_size=0)
+        cache_handler.update_cache(self.data, 'fp_1')
+        type_ = cache_handler.get_type(1)
+        self.assertIs(cache_handler.get_type(1), type_)
+        del type_
+        cache_handler.get_type(1)
+        type_stats = cache_handler.get_obj_cache_stats()['types']
+        self.assertEqual(type_stats.hits, 1)
+        self.assertEqual(type_stats.misses, 2)
+        self.assertEqual(len(self.log), 0)
@@ -0,0 +1,56 @@
+#===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+#===============================================================================
+
+
+from eos.const.eos import State, Scope
+from eos.data.cache_object import Effect, Modifier, Type
+from eos.tests.eos_testcase import EosTestCase
+
+
+class TestTypeModifierTable(EosTestCase):
+    """Check that type groups modifiers by state and scope"""
+
+    def test_grouping(self):
+        modifier1 = Modifier(modifier_id=1, state=State.offline, scope=Scope.local)
+        modifier2 = Modifier(modifier_id=2, state=State.active, scope=Scope.local)
+        modifier3 = Modifier(modifier_id=3, state=State.offline, scope=Scope.local)
+        modifier4 = Modifier(modifier_id=4, state=State.offline, scope=Scope.projected)
+        effect1 = Effect(effect_id=1, modifiers=(modifier1, modifier2))
+        effect2 = Effect(effect_id=2, modifiers=(modifier3, modifier4))
+        type_ = Type(type_id=1, effects=(effect1, effect2))
+        modifier_table = type_.modifier_table
+        self.assertEqual(len(modifier_table), 3)
+        self.assertEqual(modifier_table[(State.offline, Scope.local)], (modifier1, modifier3))
+        self.assertEqual(modifier_table[(State.active, Scope.local)], (modifier2,))
+        self.assertEqual(modifier_table[(State.offline, Scope.projected)], (modifier4,))
+        for modifiers in modifier_table.values():
+            self.assertIsInstance(modifiers, tuple)
+
+    def test_precomputed_modifiers(self):
+        # Table is built from modifiers passed to type,
+        # when they are available
+        modifier1 = Modifier(modifier_id=1, state=State.online, scope=Scope.gang)
+        modifier2 = Modifier(modifier_id=2, state=State.online, scope=Scope.gang)
+        type_ = Type(type_id=1, effects=(), modifiers=(modifier1, modifier2))
+        self.assertEqual(dict(type_.modifier_table), {(State.online, Scope.gang): (modifier1, modifier2)})
+
+    def test_empty(self):
+        type_ = Type(type_id=1, effects=())
+        self.assertEqual(len(type_.modifier_table), 0)
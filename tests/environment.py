@@ -74,6 +74,7 @@ class CacheHandler:
         self.__type_data = {}
         self.__attribute_data = {}
         self.__effect_data = {}
+        self.fingerprint = 'test_fingerprint'
 
     def type_(self, **kwargs):
         type_ = Type(**kwargs)
@@ -113,3 +114,6 @@ class CacheHandler:
             return self.__effect_data[eff_id]
         except KeyError:
             raise EffectFetchError(eff_id)
+
+    def get_fingerprint(self):
+        return self.fingerprint
@@ -0,0 +1,125 @@
+#===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+#===============================================================================
+
+
+from unittest.mock import Mock
+
+from eos.const.eos import State
+from eos.fit.holder.container import HolderSet
+from eos.tests.fit.environment import BaseHolder, CachingHolder
+from eos.tests.fit.fit_testcase import FitTestCase
+
+
+class TestFitBatch(FitTestCase):
+
+    def make_fit(self, *args, **kwargs):
+        fit = super().make_fit(*args, **kwargs)
+        fit.container = HolderSet(fit, BaseHolder)
+        return fit
+
+    def test_cleanup_deferred(self):
+        fit = self.make_fit(eos=Mock())
+        holder1 = Mock(_fit=None, state=State.offline, spec_set=CachingHolder(1))
+        holder2 = Mock(_fit=None, state=State.offline, spec_set=CachingHolder(1))
+        st_cleans_before = len(fit.stats._clear_volatile_attrs.mock_calls)
+        # Action
+        with fit.batch():
+            fit.container.add(holder1)
+            fit.container.add(holder2)
+            # Checks
+            self.assertEqual(len(fit.stats._clear_volatile_attrs.mock_calls), st_cleans_before)
+            self.assertEqual(len(holder1._clear_volatile_attrs.mock_calls), 0)
+            self.assertEqual(len(fit.lt), 2)
+        self.assertEqual(len(fit.stats._clear_volatile_attrs.mock_calls) - st_cleans_before, 1)
+        self.assertEqual(len(holder1._clear_volatile_attrs.mock_calls), 1)
+        self.assertEqual(len(holder2._clear_volatile_attrs.mock_calls), 1)
+        # Misc
+        fit.container.remove(holder1)
+        fit.container.remove(holder2)
+        self.assert_fit_buffers_empty(fit)
+        self.assert_object_buffers_empty(fit.container)
+
+    def test_removal(self):
+        fit = self.make_fit(eos=Mock())
+        holder1 = Mock(_fit=None, state=State.offline, spec_set=CachingHolder(1))
+        holder2 = Mock(_fit=None, state=State.offline, spec_set=CachingHolder(1))
+        fit.container.add(holder1)
+        fit.container.add(holder2)
+        h1_cleans_before = len(holder1._clear_volatile_attrs.mock_calls)
+        h2_cleans_before = len(holder2._clear_volatile_attrs.mock_calls)
+        # Action
+        with fit.batch():
+            fit.container.remove(holder1)
+            # Checks
+            self.assertEqual(len(holder1._clear_volatile_attrs.mock_calls) - h1_cleans_before, 1)
+            self.assertEqual(len(holder2._clear_volatile_attrs.mock_calls), h2_cleans_before)
+        self.assertEqual(len(holder1._clear_volatile_attrs.mock_calls) - h1_cleans_before, 1)
+        self.assertEqual(len(holder2._clear_volatile_attrs.mock_calls) - h2_cleans_before, 1)
+        # Misc
+        fit.container.remove(holder2)
+        self.assert_fit_buffers_empty(fit)
+        self.assert_object_buffers_empty(fit.container)
+
+    def test_nested(self):
+        fit = self.make_fit(eos=Mock())
+        holder1 = Mock(_fit=None, state=State.offline, spec_set=CachingHolder(1))
+        holder2 = Mock(_fit=None, state=State.offline, spec_set=CachingHolder(1))
+        st_cleans_before = len(fit.stats._clear_volatile_attrs.mock_calls)
+        # Action
+        with fit.batch():
+            with fit.batch():
+                fit.container.add(holder1)
+            self.assertEqual(len(fit.stats._clear_volatile_attrs.mock_calls), st_cleans_before)
+            fit.container.add(holder2)
+        # Checks
+        self.assertEqual(len(fit.stats._clear_volatile_attrs.mock_calls) - st_cleans_before, 1)
+        # Misc
+        fit.container.remove(holder1)
+        fit.container.remove(holder2)
+        self.assert_fit_buffers_empty(fit)
+        self.assert_object_buffers_empty(fit.container)
+
+    def test_no_changes(self):
+        fit = self.make_fit(eos=Mock())
+        st_cleans_before = len(fit.stats._clear_volatile_attrs.mock_calls)
+        # Action
+        with fit.batch():
+            pass
+        # Checks
+        self.assertEqual(len(fit.stats._clear_volatile_attrs.mock_calls), st_cleans_before)
+        # Misc
+        self.assert_fit_buffers_empty(fit)
+
+    def test_exception(self):
+        fit = self.make_fit(eos=Mock())
+        holder = Mock(_fit=None, state=State.offline, spec_set=CachingHolder(1))
+        st_cleans_before = len(fit.stats._clear_volatile_attrs.mock_calls)
+        # Action
+        with self.assertRaises(ValueError):
+            with fit.batch():
+                fit.container.add(holder)
+                raise ValueError
+        # Checks
+        self.assertEqual(len(fit.stats._clear_volatile_attrs.mock_calls) - st_cleans_before, 1)
+        fit.container.remove(holder)
+        self.assertEqual(len(fit.stats._clear_volatile_attrs.mock_calls) - st_cleans_before, 2)
+        # Misc
+        self.assert_fit_buffers_empty(fit)
+        self.assert_object_buffers_empty(fit.container)
@@ -0,0 +1,92 @@
+#===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+#===============================================================================
+
+
+from unittest.mock import Mock
+
+from eos.const.eos import State, Domain, Scope, Operator
+from eos.const.eve import Attribute, EffectCategory, Type
+from eos.data.cache_object.modifier import Modifier
+from eos.fit import CharacterProfile
+from eos.fit.holder.item import Ship
+from eos.tests.eos_testcase import EosTestCase
+from eos.tests.environment import Logger
+
+
+class TestCharacterProfile(EosTestCase):
+
+    def setUp(self):
+        EosTestCase.setUp(self)
+        self.ch.type_(type_id=Type.character_static)
+        self.ch.attribute(attribute_id=Attribute.skill_level)
+        self.tgt_attr = self.ch.attribute(attribute_id=2)
+        modifier = Modifier()
+        modifier.state = State.offline
+        modifier.scope = Scope.local
+        modifier.src_attr = Attribute.skill_level
+        modifier.operator = Operator.mod_add
+        modifier.tgt_attr = self.tgt_attr.id
+        modifier.domain = Domain.ship
+        modifier.filter_type = None
+        modifier.filter_value = None
+        effect = self.ch.effect(effect_id=1, category=EffectCategory.passive)
+        effect.modifiers = (modifier,)
+        self.ch.type_(type_id=1, attributes={self.tgt_attr.id: 100})
+        self.ch.type_(type_id=2, effects=(effect,))
+        self.ch.type_(type_id=3)
+        self.eos = Mock(_cache_handler=self.ch, _logger=Logger(), spec_set=('_cache_handler', '_logger'))
+
+    def test_skills(self):
+        profile = CharacterProfile({2: 5, 3: 1}, eos=self.eos)
+        self.assertEqual(profile.skills, {2: 5, 3: 1})
+        with self.assertRaises(TypeError):
+            profile.skills[2] = 4
+        fit1 = profile.fit_from_template()
+        fit2 = profile.fit_from_template()
+        self.assertIs(fit1.eos, self.eos)
+        self.assertEqual(fit1.skills[2].level, 5)
+        self.assertEqual(fit1.skills[3].level, 1)
+        self.assertIsNot(fit1.skills[2], fit2.skills[2])
+        self.assertEqual(len(self.log), 0)
+
+    def test_non_int_level(self):
+        with self.assertRaises(TypeError):
+            CharacterProfile({2: 5, 3: '1'}, eos=self.eos)
+        with self.assertRaises(TypeError):
+            CharacterProfile({2: 5.0}, eos=self.eos)
+        self.assertEqual(len(self.log), 0)
+
+    def test_modification(self):
+        profile = CharacterProfile({2: 5}, eos=self.eos)
+        fit1 = profile.fit_from_template()
+        fit1.ship = Ship(1)
+        fit2 = profile.fit_from_template()
+        fit2.ship = Ship(1)
+        self.assertAlmostEqual(fit1.ship.attributes[self.tgt_attr.id], 105)
+        # Skill changes on one fit affect neither profile
+        # nor other fits
+        fit1.skills[2].level = 3
+        self.assertAlmostEqual(fit1.ship.attributes[self.tgt_attr.id], 103)
+        self.assertAlmostEqual(fit2.ship.attributes[self.tgt_attr.id], 105)
+        fit3 = profile.fit_from_template()
+        fit3.ship = Ship(1)
+        self.assertEqual(fit3.skills[2].level, 5)
+        self.assertAlmostEqual(fit3.ship.attributes[self.tgt_attr.id], 105)
+        self.assertEqual(len(self.log), 0)
@@ -0,0 +1,143 @@
+#===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+#===============================================================================
+
+
+from unittest.mock import Mock
+
+from eos.const.eos import State, Domain, Scope, Operator
+from eos.const.eve import Attribute, EffectCategory, Type
+from eos.data.cache_object.modifier import Modifier
+from eos.fit import Fit
+from eos.fit.holder.item import Charge, ModuleHigh, Ship, Skill
+from eos.tests.eos_testcase import EosTestCase
+from eos.tests.environment import Logger
+
+
+class TestFitClone(EosTestCase):
+
+    def setUp(self):
+        EosTestCase.setUp(self)
+        self.ch.type_(type_id=Type.character_static)
+        self.src_attr = self.ch.attribute(attribute_id=1)
+        self.tgt_attr = self.ch.attribute(attribute_id=2)
+        modifier = Modifier()
+        modifier.state = State.online
+        modifier.scope = Scope.local
+        modifier.src_attr = self.src_attr.id
+        modifier.operator = Operator.post_percent
+        modifier.tgt_attr = self.tgt_attr.id
+        modifier.domain = Domain.ship
+        modifier.filter_type = None
+        modifier.filter_value = None
+        effect = self.ch.effect(effect_id=1, category=EffectCategory.online)
+        effect.modifiers = (modifier,)
+        self.ch.type_(type_id=1, attributes={self.tgt_attr.id: 100})
+        self.ch.type_(type_id=2, effects=(effect,), attributes={self.src_attr.id: 50})
+        self.ch.type_(type_id=3)
+        self.ch.type_(type_id=4)
+        self.eos = Mock(_cache_handler=self.ch, _logger=Logger(), spec_set=('_cache_handler', '_logger'))
+        self.fit = Fit(eos=self.eos)
+        self.fit.ship = Ship(1)
+        self.module = ModuleHigh(2, state=State.online, charge=Charge(3))
+        self.fit.modules.high.place(1, self.module)
+        self.fit.skills.add(Skill(4, level=3))
+
+    def test_holders(self):
+        clone = self.fit.clone()
+        self.assertIs(clone.eos, self.eos)
+        self.assertEqual(len(clone.modules.high), 2)
+        self.assertIsNone(clone.modules.high[0])
+        module = clone.modules.high[1]
+        self.assertIsNot(module, self.module)
+        self.assertIs(module._fit, clone)
+        self.assertEqual(module.state, State.online)
+        self.assertIs(module.item, self.module.item)
+        self.assertIsNot(module.charge, self.module.charge)
+        self.assertIs(module.charge._fit, clone)
+        self.assertIs(module.charge.container, module)
+        self.assertIs(self.module.charge.container, self.module)
+        self.assertEqual(clone.skills[4].level, 3)
+        self.assertIsNot(clone.skills[4], self.fit.skills[4])
+        self.assertIsNot(clone.character, self.fit.character)
+        self.assertIsNot(clone.ship, self.fit.ship)
+        self.assertEqual(len(self.log), 0)
+
+    def test_values(self):
+        self.assertAlmostEqual(self.fit.ship.attributes[self.tgt_attr.id], 150)
+        clone = self.fit.clone()
+        self.assertAlmostEqual(clone.ship.attributes[self.tgt_attr.id], 150)
+        # Changes on copy do not influence original fit
+        clone.modules.high[1].state = State.offline
+        self.assertAlmostEqual(clone.ship.attributes[self.tgt_attr.id], 100)
+        self.assertAlmostEqual(self.fit.ship.attributes[self.tgt_attr.id], 150)
+        # And vice versa
+        clone.modules.high[1].state = State.online
+        self.fit.modules.high.remove(self.module)
+        self.assertAlmostEqual(self.fit.ship.attributes[self.tgt_attr.id], 100)
+        self.assertAlmostEqual(clone.ship.attributes[self.tgt_attr.id], 150)
+        self.assertEqual(len(self.log), 0)
+
+    def test_clone_of_clone(self):
+        clone = self.fit.clone()
+        clone_of_clone = clone.clone()
+        self.assertAlmostEqual(clone_of_clone.ship.attributes[self.tgt_attr.id], 150)
+        clone.modules.high[1].state = State.offline
+        self.fit.modules.high.remove(self.module)
+        self.assertAlmostEqual(clone_of_clone.ship.attributes[self.tgt_attr.id], 150)
+        clone_of_clone.modules.high[1].state = State.offline
+        self.assertAlmostEqual(clone_of_clone.ship.attributes[self.tgt_attr.id], 100)
+        clone_of_clone.modules.high[1].state = State.online
+        self.assertAlmostEqual(clone_of_clone.ship.attributes[self.tgt_attr.id], 150)
+        self.assertAlmostEqual(clone.ship.attributes[self.tgt_attr.id], 100)
+        self.assertAlmostEqual(self.fit.ship.attributes[self.tgt_attr.id], 100)
+        self.assertEqual(len(self.log), 0)
+
+    def test_source_change(self):
+        # Links of clone are not affected by changes of
+        # original fit, even when they are not used yet
+        clone = self.fit.clone()
+        self.fit.modules.high[1].state = State.offline
+        self.assertAlmostEqual(self.fit.ship.attributes[self.tgt_attr.id], 100)
+        self.assertAlmostEqual(clone.ship.attributes[self.tgt_attr.id], 150)
+        clone.modules.high[1].state = State.offline
+        self.assertAlmostEqual(clone.ship.attributes[self.tgt_attr.id], 100)
+        self.assertEqual(len(self.log), 0)
+
+    def test_stats(self):
+        self.ch.attribute(attribute_id=Attribute.cpu)
+        self.ch.type_(type_id=5, attributes={Attribute.cpu: 25})
+        self.fit.modules.high.place(2, ModuleHigh(5, state=State.online))
+        clone = self.fit.clone()
+        self.assertAlmostEqual(clone.stats.cpu.used, 25)
+        clone.modules.high[2].state = State.offline
+        self.assertAlmostEqual(clone.stats.cpu.used, 0)
+        self.assertAlmostEqual(self.fit.stats.cpu.used, 25)
+        self.assertEqual(len(self.log), 0)
+
+    def test_stats_removal(self):
+        # Holders removed before first access to
+        # stats are not counted
+        self.ch.attribute(attribute_id=Attribute.cpu)
+        self.ch.type_(type_id=5, attributes={Attribute.cpu: 25})
+        self.fit.modules.high.place(2, ModuleHigh(5, state=State.online))
+        clone = self.fit.clone()
+        clone.modules.high.free(2)
+        self.assertAlmostEqual(clone.stats.cpu.used, 0)
+        self.assertEqual(len(self.log), 0)
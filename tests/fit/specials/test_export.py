@@ -0,0 +1,79 @@
+#===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+#===============================================================================
+
+
+import math
+from unittest.mock import Mock
+
+from eos.const.eos import State
+from eos.const.eve import Attribute, Type
+from eos.fit import Fit, export_stats, export_stat_columns
+from eos.tests.eos_testcase import EosTestCase
+from eos.tests.environment import Logger
+
+
+class TestStatExport(EosTestCase):
+
+    def setUp(self):
+        EosTestCase.setUp(self)
+        self.ch.type_(type_id=Type.character_static)
+        self.ch.attribute(attribute_id=Attribute.cpu)
+        self.ch.attribute(attribute_id=Attribute.cpu_output)
+        self.ch.attribute(attribute_id=Attribute.hi_slots)
+        self.ch.type_(type_id=1, attributes={Attribute.cpu_output: 50, Attribute.hi_slots: 3})
+        self.ch.type_(type_id=2, attributes={Attribute.cpu: 20})
+        self.eos = Mock(_cache_handler=self.ch, _logger=Logger(), spec_set=('_cache_handler', '_logger'))
+
+    def make_fits(self, amount):
+        for i in range(amount):
+            self.made_fits += 1
+            # First fit has no ship
+            spec = {'ship': 1} if i > 0 else {}
+            spec['modules'] = {'high': [[2, State.online]] * i}
+            yield Fit.from_spec(spec, eos=self.eos)
+
+    def test_records(self):
+        self.made_fits = 0
+        records = export_stats(self.make_fits(3), ('cpu_used', 'cpu_output', 'high_slots_used'))
+        # Fits are requested only when records are
+        self.assertEqual(self.made_fits, 0)
+        self.assertEqual(next(records), (0, None, 0))
+        self.assertEqual(self.made_fits, 1)
+        self.assertEqual(list(records), [(20, 50, 1), (40, 50, 2)])
+        self.assertEqual(len(self.log), 0)
+
+    def test_columns(self):
+        self.made_fits = 0
+        columns = export_stat_columns(self.make_fits(3), ('cpu_used', 'high_slots_total'))
+        self.assertEqual(set(columns), {'cpu_used', 'high_slots_total'})
+        self.assertEqual(columns['cpu_used'].typecode, 'd')
+        self.assertEqual(list(columns['cpu_used']), [0, 20, 40])
+        high_slots = columns['high_slots_total']
+        self.assertEqual(len(high_slots), 3)
+        self.assertTrue(math.isnan(high_slots[0]))
+        self.assertEqual(list(high_slots[1:]), [3, 3])
+        self.assertEqual(len(self.log), 0)
+
+    def test_unknown_stat(self):
+        self.made_fits = 0
+        with self.assertRaises(KeyError):
+            export_stats(self.make_fits(1), ('cpu_used', 'nonexistent'))
+        self.assertEqual(self.made_fits, 0)
+        self.assertEqual(len(self.log), 0)
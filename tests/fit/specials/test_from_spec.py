@@ -0,0 +1,101 @@
+#===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+#===============================================================================
+
+
+from unittest.mock import Mock
+
+from eos.const.eos import State, Domain, Scope, Operator
+from eos.const.eve import EffectCategory, Type
+from eos.data.cache_object.modifier import Modifier
+from eos.fit import Fit
+from eos.fit.holder.item import Charge, Drone, ModuleHigh, ModuleLow, Ship, Skill
+from eos.tests.eos_testcase import EosTestCase
+from eos.tests.environment import Logger
+
+
+class TestFitFromSpec(EosTestCase):
+
+    def setUp(self):
+        EosTestCase.setUp(self)
+        self.ch.type_(type_id=Type.character_static)
+        self.src_attr = self.ch.attribute(attribute_id=1)
+        self.tgt_attr = self.ch.attribute(attribute_id=2)
+        modifier = Modifier()
+        modifier.state = State.online
+        modifier.scope = Scope.local
+        modifier.src_attr = self.src_attr.id
+        modifier.operator = Operator.mod_add
+        modifier.tgt_attr = self.tgt_attr.id
+        modifier.domain = Domain.ship
+        modifier.filter_type = None
+        modifier.filter_value = None
+        effect = self.ch.effect(effect_id=1, category=EffectCategory.online)
+        effect.modifiers = (modifier,)
+        self.ch.type_(type_id=1, attributes={self.tgt_attr.id: 100})
+        self.ch.type_(type_id=2, effects=(effect,), attributes={self.src_attr.id: 10})
+        self.ch.type_(type_id=3)
+        self.ch.type_(type_id=4)
+        self.ch.type_(type_id=5)
+        self.eos = Mock(_cache_handler=self.ch, _logger=Logger(), spec_set=('_cache_handler', '_logger'))
+
+    def test_holders(self):
+        fit = Fit.from_spec({
+            'ship': 1,
+            'modules': {
+                'high': [None, (2, State.online, 3)],
+                'low': [2]
+            },
+            'drones': [5, (5, State.active)],
+            'skills': {4: 5}
+        }, eos=self.eos)
+        self.assertIs(fit.eos, self.eos)
+        self.assertIsInstance(fit.ship, Ship)
+        self.assertEqual(fit.ship._type_id, 1)
+        self.assertIsNone(fit.modules.high[0])
+        module = fit.modules.high[1]
+        self.assertIsInstance(module, ModuleHigh)
+        self.assertEqual(module.state, State.online)
+        self.assertIsInstance(module.charge, Charge)
+        self.assertEqual(module.charge._type_id, 3)
+        self.assertIs(module.charge._fit, fit)
+        self.assertIsInstance(fit.modules.low[0], ModuleLow)
+        self.assertEqual(fit.modules.low[0].state, State.offline)
+        self.assertIsNone(fit.modules.low[0].charge)
+        self.assertEqual(len(fit.modules.med), 0)
+        self.assertEqual(sorted(drone.state for drone in fit.drones), [State.offline, State.active])
+        for drone in fit.drones:
+            self.assertIsInstance(drone, Drone)
+        self.assertIsInstance(fit.skills[4], Skill)
+        self.assertEqual(fit.skills[4].level, 5)
+        self.assertIs(fit.skills[4].item, self.ch.get_type(4))
+        self.assertEqual(len(self.log), 0)
+
+    def test_values(self):
+        fit = Fit.from_spec({
+            'ship': 1,
+            'modules': {'high': [(2, State.online), 2, (2, State.active)]}
+        }, eos=self.eos)
+        self.assertAlmostEqual(fit.ship.attributes[self.tgt_attr.id], 120)
+        # Fit made from spec is regular fit
+        fit.modules.high[1].state = State.online
+        self.assertAlmostEqual(fit.ship.attributes[self.tgt_attr.id], 130)
+        fit.ship = Ship(1)
+        self.assertAlmostEqual(fit.ship.attributes[self.tgt_attr.id], 130)
+        self.assertEqual(len(self.log), 0)
@@ -0,0 +1,61 @@
+#===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+#===============================================================================
+
+
+import multiprocessing
+from unittest import skipUnless
+from unittest.mock import Mock
+
+from eos.const.eos import State, Restriction
+from eos.const.eve import Attribute, Type
+from eos.fit import FitPool, FitStats
+from eos.tests.eos_testcase import EosTestCase
+from eos.tests.environment import Logger
+
+
+@skipUnless('fork' in multiprocessing.get_all_start_methods(), 'forking is not supported')
+class TestFitPool(EosTestCase):
+
+    def setUp(self):
+        EosTestCase.setUp(self)
+        self.ch.type_(type_id=Type.character_static)
+        self.ch.attribute(attribute_id=Attribute.cpu)
+        self.ch.attribute(attribute_id=Attribute.cpu_output)
+        self.ch.type_(type_id=1, attributes={Attribute.cpu_output: 50})
+        self.ch.type_(type_id=2, attributes={Attribute.cpu: 20})
+        self.eos = Mock(_cache_handler=self.ch, _logger=Logger(), spec_set=('_cache_handler', '_logger'))
+
+    def test_evaluate(self):
+        specs = [
+            {'ship': 1, 'modules': {'med': [[2, State.online] for _ in range(i)]}}
+            for i in range(5)
+        ]
+        skip_checks = (Restriction.holder_class, Restriction.medium_slot, Restriction.state)
+        with FitPool(self.eos, processes=2, chunk_size=2, skip_checks=skip_checks) as pool:
+            results = list(pool.evaluate(specs))
+        self.assertEqual(len(results), 5)
+        for i, result in enumerate(results):
+            self.assertIsInstance(result, FitStats)
+            self.assertEqual(result.cpu_output, 50)
+            self.assertAlmostEqual(result.cpu_used, 20 * i)
+            self.assertIsNone(result.powergrid_output)
+        self.assertEqual(results[2].validation_errors, ())
+        self.assertEqual(results[3].validation_errors, ((2, Restriction.cpu),) * 3)
+        self.assertEqual(len(self.log), 0)
@@ -0,0 +1,101 @@
+#===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+#===============================================================================
+
+
+import json
+from unittest.mock import Mock
+
+from eos.const.eos import State, Domain, Scope, Operator
+from eos.const.eve import EffectCategory, Type
+from eos.data.cache_object.modifier import Modifier
+from eos.fit import Fit
+from eos.fit.exception import SnapshotFingerprintError
+from eos.tests.eos_testcase import EosTestCase
+from eos.tests.environment import Logger
+
+
+class TestFitSnapshot(EosTestCase):
+
+    def setUp(self):
+        EosTestCase.setUp(self)
+        self.ch.type_(type_id=Type.character_static)
+        self.src_attr = self.ch.attribute(attribute_id=1)
+        self.tgt_attr = self.ch.attribute(attribute_id=2, max_attribute=3)
+        self.cap_attr = self.ch.attribute(attribute_id=3)
+        modifier = Modifier()
+        modifier.state = State.online
+        modifier.scope = Scope.local
+        modifier.src_attr = self.src_attr.id
+        modifier.operator = Operator.mod_add
+        modifier.tgt_attr = self.tgt_attr.id
+        modifier.domain = Domain.ship
+        modifier.filter_type = None
+        modifier.filter_value = None
+        effect = self.ch.effect(effect_id=1, category=EffectCategory.online)
+        effect.modifiers = (modifier,)
+        self.ch.type_(type_id=1, attributes={self.tgt_attr.id: 100, self.cap_attr.id: 1000})
+        self.ch.type_(type_id=2, effects=(effect,), attributes={self.src_attr.id: 10})
+        self.ch.type_(type_id=3)
+        self.ch.type_(type_id=4)
+        self.ch.type_(type_id=5)
+        self.eos = Mock(_cache_handler=self.ch, _logger=Logger(), spec_set=('_cache_handler', '_logger'))
+        self.spec = {
+            'ship': 1,
+            'modules': {'high': [None, [2, State.online, 3]], 'low': [[2, State.offline]]},
+            'drones': [[5, State.active]],
+            'skills': [[4, 5]]
+        }
+
+    def test_spec(self):
+        fit = Fit.from_spec(self.spec, eos=self.eos)
+        self.assertEqual(fit.to_spec(), self.spec)
+        self.assertEqual(len(self.log), 0)
+
+    def test_restore(self):
+        fit = Fit.from_spec(self.spec, eos=self.eos)
+        self.assertAlmostEqual(fit.ship.attributes[self.tgt_attr.id], 110)
+        snapshot = json.loads(json.dumps(fit.make_snapshot()))
+        # Change data to make sure restored values are not recalculated
+        self.ch.get_type(1).attributes[self.tgt_attr.id] = 200
+        restored = Fit.from_snapshot(snapshot, eos=self.eos)
+        self.assertEqual(restored.to_spec(), self.spec)
+        self.assertAlmostEqual(restored.ship.attributes[self.tgt_attr.id], 110)
+        # Restored values are cleared as usual
+        restored.modules.low[0].state = State.online
+        self.assertAlmostEqual(restored.ship.attributes[self.tgt_attr.id], 220)
+        self.assertEqual(len(self.log), 0)
+
+    def test_restore_capped(self):
+        fit = Fit.from_spec(self.spec, eos=self.eos)
+        self.assertAlmostEqual(fit.ship.attributes[self.tgt_attr.id], 110)
+        snapshot = fit.make_snapshot()
+        restored = Fit.from_snapshot(snapshot, eos=self.eos)
+        # Change of capping value has to clear capped value
+        restored.ship.attributes[self.cap_attr.id] = 50
+        self.assertAlmostEqual(restored.ship.attributes[self.tgt_attr.id], 50)
+        self.assertEqual(len(self.log), 0)
+
+    def test_fingerprint_mismatch(self):
+        fit = Fit.from_spec(self.spec, eos=self.eos)
+        snapshot = fit.make_snapshot()
+        self.ch.fingerprint = 'other_fingerprint'
+        with self.assertRaises(SnapshotFingerprintError):
+            Fit.from_snapshot(snapshot, eos=self.eos)
+        self.assertEqual(len(self.log), 0)
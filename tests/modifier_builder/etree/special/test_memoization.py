@@ -0,0 +1,124 @@
+#===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+#===============================================================================
+
+
+from eos.const.eos import EffectBuildStatus
+from eos.const.eve import EffectCategory, Operand
+from eos.data.cache_generator.modifier_builder.expression_tree import Effect2Modifiers
+from eos.tests.environment import Logger
+from eos.tests.modifier_builder.modbuilder_testcase import ModBuilderTestCase
+
+
+class TestBuilderEtreeMemoization(ModBuilderTestCase):
+    """Test reuse of converted subtrees across effects"""
+
+    def setUp(self):
+        ModBuilderTestCase.setUp(self)
+        e_tgt = self.ef.make(1, operandID=Operand.def_loc, expressionValue='Ship')
+        e_tgt_attr = self.ef.make(2, operandID=Operand.def_attr, expressionAttributeID=9)
+        e_optr = self.ef.make(3, operandID=Operand.def_optr, expressionValue='PostPercent')
+        e_src_attr = self.ef.make(4, operandID=Operand.def_attr, expressionAttributeID=327)
+        e_tgt_spec = self.ef.make(
+            5, operandID=Operand.itm_attr,
+            arg1=e_tgt['expressionID'],
+            arg2=e_tgt_attr['expressionID']
+        )
+        e_optr_tgt = self.ef.make(
+            6, operandID=Operand.optr_tgt,
+            arg1=e_optr['expressionID'],
+            arg2=e_tgt_spec['expressionID']
+        )
+        self.e_add_mod = self.ef.make(
+            7, operandID=Operand.add_itm_mod,
+            arg1=e_optr_tgt['expressionID'],
+            arg2=e_src_attr['expressionID']
+        )
+        self.e_rm_mod = self.ef.make(
+            8, operandID=Operand.rm_itm_mod,
+            arg1=e_optr_tgt['expressionID'],
+            arg2=e_src_attr['expressionID']
+        )
+        self.converter = Effect2Modifiers(self.ef.data, Logger())
+
+    def make_effect_row(self, effect_id, pre_expression_id, post_expression_id):
+        return {
+            'effect_id': effect_id,
+            'pre_expression': pre_expression_id,
+            'post_expression': post_expression_id,
+            'effect_category': EffectCategory.passive,
+            'modifier_info': None
+        }
+
+    def test_shared_tree(self):
+        effect_row1 = self.make_effect_row(1, self.e_add_mod['expressionID'], self.e_rm_mod['expressionID'])
+        effect_row2 = self.make_effect_row(2, self.e_add_mod['expressionID'], self.e_rm_mod['expressionID'])
+        modifiers1, status1 = self.converter.convert(effect_row1)
+        stats = self.converter.stats
+        self.assertEqual(stats.hits, 0)
+        self.assertEqual(stats.misses, 2)
+        modifiers2, status2 = self.converter.convert(effect_row2)
+        stats = self.converter.stats
+        self.assertEqual(stats.hits, 2)
+        self.assertEqual(stats.misses, 2)
+        self.assertEqual(stats.size, 2)
+        self.assertEqual(status1, EffectBuildStatus.ok_full)
+        self.assertEqual(status2, EffectBuildStatus.ok_full)
+        self.assertEqual(len(modifiers1), 1)
+        self.assertEqual(len(modifiers2), 1)
+        modifier1 = modifiers1[0]
+        modifier2 = modifiers2[0]
+        self.assertIsNot(modifier1, modifier2)
+        self.assertEqual(modifier1.src_attr, modifier2.src_attr)
+        self.assertEqual(modifier1.tgt_attr, modifier2.tgt_attr)
+        self.assertEqual(modifier1.operator, modifier2.operator)
+        self.assertEqual(modifier1.domain, modifier2.domain)
+        self.assertEqual(len(self.log), 0)
+
+    def test_repeated_subtree(self):
+        # Subtree which is referenced multiple times within the same
+        # tree should still produce separate actions
+        e_add_splice = self.ef.make(
+            9, operandID=Operand.splice,
+            arg1=self.e_add_mod['expressionID'],
+            arg2=self.e_add_mod['expressionID']
+        )
+        e_rm_splice = self.ef.make(
+            10, operandID=Operand.splice,
+            arg1=self.e_rm_mod['expressionID'],
+            arg2=self.e_rm_mod['expressionID']
+        )
+        converter = Effect2Modifiers(self.ef.data, Logger())
+        effect_row = self.make_effect_row(1, e_add_splice['expressionID'], e_rm_splice['expressionID'])
+        modifiers, status = converter.convert(effect_row)
+        self.assertEqual(status, EffectBuildStatus.ok_full)
+        self.assertEqual(len(modifiers), 2)
+        stats = converter.stats
+        self.assertEqual(stats.hits, 2)
+        self.assertEqual(stats.misses, 4)
+        self.assertEqual(len(self.log), 0)
+
+    def test_error_not_memoized(self):
+        e_bad = self.ef.make(11, operandID=Operand.add_itm_mod, arg1=1000, arg2=1001)
+        effect_row = self.make_effect_row(1, e_bad['expressionID'], self.e_rm_mod['expressionID'])
+        modifiers, status = self.converter.convert(effect_row)
+        self.assertEqual(status, EffectBuildStatus.error)
+        self.assertEqual(len(modifiers), 0)
+        self.assertEqual(self.converter.stats.size, 0)
+        self.assertEqual(len(self.log), 1)
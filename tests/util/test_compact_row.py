@@ -0,0 +1,132 @@
+#===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+#===============================================================================
+
+
+import pickle
+
+from eos.tests.eos_testcase import EosTestCase
+from eos.util.compact_row import CompactRow
+
+
+class TestCompactRow(EosTestCase):
+
+    def test_access(self):
+        row = CompactRow({'a': 1, 'b': 2})
+        self.assertEqual(row['a'], 1)
+        self.assertEqual(row['b'], 2)
+        self.assertEqual(len(row), 2)
+        self.assertEqual(set(row), {'a', 'b'})
+        self.assertEqual(dict(row.items()), {'a': 1, 'b': 2})
+        self.assertEqual(len(self.log), 0)
+
+    def test_unknown_key(self):
+        row = CompactRow({'a': 1})
+        with self.assertRaises(KeyError):
+            row['b']
+        self.assertIsNone(row.get('b'))
+        self.assertEqual(row.get('b', 5), 5)
+        self.assertNotIn('b', row)
+        # Positional access is not available either
+        with self.assertRaises(KeyError):
+            row[1]
+        self.assertEqual(len(self.log), 0)
+
+    def test_unhashable_key(self):
+        row = CompactRow({'a': 1})
+        with self.assertRaises(KeyError):
+            row[['a']]
+        self.assertEqual(row.get(['a'], 5), 5)
+        self.assertNotIn(['a'], row)
+        self.assertEqual(len(self.log), 0)
+
+    def test_equality_key_order(self):
+        row1 = CompactRow({'a': 1, 'b': 2})
+        row2 = CompactRow({'b': 2, 'a': 1})
+        self.assertEqual(row1, row2)
+        self.assertEqual(hash(row1), hash(row2))
+        self.assertEqual(len({row1, row2}), 1)
+        self.assertNotEqual(row1, CompactRow({'a': 1, 'b': 3}))
+        self.assertNotEqual(row1, CompactRow({'a': 1}))
+        self.assertEqual(len(self.log), 0)
+
+    def test_equality_dict(self):
+        row = CompactRow({'a': 1, 'b': 2})
+        self.assertEqual(row, {'b': 2, 'a': 1})
+        self.assertEqual({'b': 2, 'a': 1}, row)
+        self.assertNotEqual(row, {'a': 1, 'b': 3})
+        self.assertNotEqual(row, {'a': 1})
+        self.assertNotEqual(row, (1, 2))
+        self.assertEqual(len(self.log), 0)
+
+    def test_replace(self):
+        row = CompactRow({'a': 1, 'b': 2})
+        new_row = row._replace(b=3)
+        self.assertEqual(new_row, {'a': 1, 'b': 3})
+        self.assertEqual(row, {'a': 1, 'b': 2})
+        self.assertEqual(row._replace(b=2), row)
+        self.assertEqual(hash(row._replace(b=2)), hash(row))
+        self.assertEqual(row._replace(c=4), {'a': 1, 'b': 2, 'c': 4})
+        self.assertEqual(len(self.log), 0)
+
+    def test_pickle(self):
+        row = CompactRow({'a': 1, 'b': (2, 3)})
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            restored = pickle.loads(pickle.dumps(row, protocol=protocol))
+            self.assertIs(type(restored), CompactRow)
+            self.assertEqual(restored, row)
+            self.assertEqual(hash(restored), hash(row))
+        self.assertEqual(len(self.log), 0)
+
+    def test_sequence_methods(self):
+        row = CompactRow({'a': 1, 'b': 2})
+        with self.assertRaises(TypeError):
+            row.count(1)
+        with self.assertRaises(TypeError):
+            row.index(1)
+        with self.assertRaises(TypeError):
+            row + row
+        with self.assertRaises(TypeError):
+            row + (1,)
+        with self.assertRaises(TypeError):
+            (1,) + row
+        with self.assertRaises(TypeError):
+            row * 2
+        with self.assertRaises(TypeError):
+            2 * row
+        self.assertEqual(len(self.log), 0)
+
+    def test_ordering(self):
+        row1 = CompactRow({'a': 1})
+        row2 = CompactRow({'a': 2})
+        with self.assertRaises(TypeError):
+            row1 < row2
+        with self.assertRaises(TypeError):
+            row1 <= row2
+        with self.assertRaises(TypeError):
+            row1 > row2
+        with self.assertRaises(TypeError):
+            row1 >= row2
+        with self.assertRaises(TypeError):
+            row1 < (1,)
+        with self.assertRaises(TypeError):
+            (1,) < row1
+        with self.assertRaises(TypeError):
+            sorted([row1, row2])
+        self.assertEqual(len(self.log), 0)
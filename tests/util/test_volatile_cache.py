@@ -0,0 +1,59 @@
+#===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+#===============================================================================
+
+
+from copy import copy
+
+from eos.tests.eos_testcase import EosTestCase
+from eos.util.volatile_cache import InheritableVolatileMixin, VolatileProperty
+
+
+class CloneBase:
+
+    def _setup_clone(self, clone):
+        clone.base_setup = True
+
+
+class CachingObject(InheritableVolatileMixin, CloneBase):
+
+    def __init__(self):
+        InheritableVolatileMixin.__init__(self)
+        self.calls = 0
+
+    @VolatileProperty
+    def value(self):
+        self.calls += 1
+        return self.calls
+
+
+class TestInheritableVolatileMixin(EosTestCase):
+
+    def test_setup_clone(self):
+        obj = CachingObject()
+        self.assertEqual(obj.value, 1)
+        clone = copy(obj)
+        obj._setup_clone(clone)
+        self.assertIs(clone.base_setup, True)
+        self.assertNotIn('value', vars(clone))
+        self.assertEqual(len(clone._volatile_attrs), 0)
+        self.assertIsNot(clone._volatile_attrs, obj._volatile_attrs)
+        self.assertEqual(clone.value, 2)
+        self.assertEqual(obj.value, 1)
+        self.assertEqual(len(self.log), 0)
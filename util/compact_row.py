@@ -0,0 +1,158 @@
+#===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+#===============================================================================
+
+
+from collections.abc import Mapping
+
+
+class _RowSchema:
+    """
+    Maps column names of rows to positions of values.
+    Schemas are shared between rows with the same set
+    of columns, and compared by identity.
+    """
+
+    __slots__ = ('columns', 'positions')
+
+    def __init__(self, columns):
+        self.columns = columns
+        # Values are stored after schema in row tuple
+        self.positions = {column: position for position, column in enumerate(columns, start=1)}
+
+
+# Format: {frozenset of columns: schema}
+_schemas = {}
+# Format: {tuple of columns in order of source mapping: schema}
+_schemas_ordered = {}
+
+
+def _get_schema(columns):
+    try:
+        return _schemas_ordered[columns]
+    except KeyError:
+        pass
+    column_set = frozenset(columns)
+    try:
+        schema = _schemas[column_set]
+    except KeyError:
+        schema = _schemas[column_set] = _RowSchema(columns)
+    _schemas_ordered[columns] = schema
+    return schema
+
+
+def _unsupported(self, *args):
+    raise TypeError('{} does not support this operation'.format(type(self).__name__))
+
+
+class CompactRow(tuple):
+    """
+    Immutable and hashable read-only mapping, intended to be
+    used as data row when there are lots of rows. Column names
+    are kept in schema shared between rows with the same set of
+    columns, while row itself is single tuple with values, thus
+    it takes much less memory than frozen dictionary. Like with
+    dictionaries, rows are equal to mappings with the same contents.
+    Sequence operations inherited from tuple are not supported.
+
+    Required arguments:
+    mapping -- mapping with initial row contents
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, mapping):
+        schema = _get_schema(tuple(mapping))
+        return tuple.__new__(cls, (schema, *map(mapping.__getitem__, schema.columns)))
+
+    def __getitem__(self, key):
+        try:
+            position = tuple.__getitem__(self, 0).positions[key]
+        except (KeyError, TypeError):
+            raise KeyError(key) from None
+        return tuple.__getitem__(self, position)
+
+    def get(self, key, default=None):
+        try:
+            position = tuple.__getitem__(self, 0).positions[key]
+        except (KeyError, TypeError):
+            return default
+        return tuple.__getitem__(self, position)
+
+    def __contains__(self, key):
+        try:
+            return key in tuple.__getitem__(self, 0).positions
+        except TypeError:
+            return False
+
+    def __iter__(self):
+        return iter(tuple.__getitem__(self, 0).columns)
+
+    def __len__(self):
+        return tuple.__len__(self) - 1
+
+    def keys(self):
+        return tuple.__getitem__(self, 0).columns
+
+    def values(self):
+        return tuple.__getitem__(self, slice(1, None))
+
+    def items(self):
+        return zip(tuple.__getitem__(self, 0).columns, tuple.__getitem__(self, slice(1, None)))
+
+    def __eq__(self, other):
+        if isinstance(other, CompactRow):
+            return tuple.__eq__(self, other)
+        # Like with dictionaries, rows are equal to any
+        # mapping with the same contents
+        if isinstance(other, Mapping):
+            return dict(self.items()) == other
+        return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    __hash__ = tuple.__hash__
+
+    # Row is not a sequence, thus tuple methods which treat
+    # it as such are disabled
+    count = index = _unsupported
+    __add__ = __radd__ = __mul__ = __rmul__ = _unsupported
+    __lt__ = __le__ = __gt__ = __ge__ = _unsupported
+
+    def _replace(self, **changes):
+        """
+        Get new row with the same contents as this one,
+        besides passed fields.
+        """
+        contents = dict(self.items())
+        contents.update(changes)
+        return CompactRow(contents)
+
+    def __reduce__(self):
+        return CompactRow, (dict(self.items()),)
+
+    def __repr__(self):
+        return 'compactrow({})'.format(dict(self.items()))
+
+
+Mapping.register(CompactRow)
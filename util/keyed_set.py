@@ -89,6 +89,20 @@ class KeyedSet(dict):
             if not value:
                 del self[key]
 
+    def remap(self, replace):
+        """
+        Make copy of dictionary, with keys and data objects
+        passed through replacement function.
+
+        Required arguments:
+        replace -- function which takes key or data object
+        and returns object which should be used in its place
+
+        Return value:
+        New KeyedSet
+        """
+        return type(self)((replace(key), {replace(data) for data in data_set}) for key, data_set in self.items())
+
     def get_data(self, key):
         """
         Get data set with safe fallback.
@@ -0,0 +1,97 @@
+#===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+#===============================================================================
+
+
+from collections import OrderedDict, namedtuple
+from weakref import WeakValueDictionary
+
+
+ObjectCacheStats = namedtuple('ObjectCacheStats', ('hits', 'misses', 'size'))
+
+
+class ObjectCache:
+    """
+    Dictionary-like object cache. Keeps strong references to
+    limited amount of most recently used objects; objects which
+    were pushed out of it are still returned while anything
+    else keeps them alive, as weak references to all stored
+    objects are kept as well.
+
+    Optional arguments:
+    max_size -- amount of objects to keep strong references to.
+    If None, all objects are pinned; if 0, only weak references
+    are kept. Default is None.
+    """
+
+    def __init__(self, max_size=None):
+        self.__max_size = max_size
+        # Format: {key: object}, ordered from least recently used
+        self.__strong = OrderedDict()
+        self.__weak = WeakValueDictionary()
+        self.__hits = 0
+        self.__misses = 0
+
+    def __getitem__(self, key):
+        try:
+            value = self.__strong[key]
+        except KeyError:
+            try:
+                value = self.__weak[key]
+            except KeyError:
+                self.__misses += 1
+                raise
+            # Object is still alive, make it strongly
+            # referenced again
+            self.__pin(key, value)
+        else:
+            self.__strong.move_to_end(key)
+        self.__hits += 1
+        return value
+
+    def __setitem__(self, key, value):
+        self.__weak[key] = value
+        self.__pin(key, value)
+
+    def __len__(self):
+        return len(self.__weak)
+
+    def clear(self):
+        """Remove all objects and reset counters."""
+        self.__strong.clear()
+        self.__weak.clear()
+        self.__hits = 0
+        self.__misses = 0
+
+    @property
+    def stats(self):
+        """Return hit/miss counters and current size."""
+        return ObjectCacheStats(hits=self.__hits, misses=self.__misses, size=len(self))
+
+    def __pin(self, key, value):
+        """Put object into strong reference storage."""
+        max_size = self.__max_size
+        if max_size == 0:
+            return
+        strong = self.__strong
+        strong[key] = value
+        strong.move_to_end(key)
+        if max_size is not None:
+            while len(strong) > max_size:
+                strong.popitem(last=False)
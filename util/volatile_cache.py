@@ -62,6 +62,27 @@ class InheritableVolatileMixin:
                 pass
         self._volatile_attrs.clear()
 
+    def _setup_clone(self, clone):
+        """
+        Remove cached values from copy of object.
+
+        Attempt to call next method in MRO, do nothing
+        on failure to find it.
+
+        Required arguments:
+        clone -- object copy
+        """
+        for attr_name in self._volatile_attrs:
+            clone.__dict__.pop(attr_name, None)
+        clone._volatile_attrs = set()
+        next_in_mro = super()
+        try:
+            method = next_in_mro._setup_clone
+        except AttributeError:
+            pass
+        else:
+            method(clone)
+
 
 class CooperativeVolatileMixin:
     """
@@ -73,6 +94,7 @@ class CooperativeVolatileMixin:
     Cooperative methods:
     __init__
     _clear_volatile_attrs
+    _setup_clone
     """
 
     def __init__(self, **kwargs):
@@ -100,3 +122,24 @@ class CooperativeVolatileMixin:
             pass
         else:
             method()
+
+    def _setup_clone(self, clone):
+        """
+        Remove cached values from copy of object.
+
+        Attempt to call next method in MRO, do nothing
+        on failure to find it.
+
+        Required arguments:
+        clone -- object copy
+        """
+        for attr_name in self._volatile_attrs:
+            clone.__dict__.pop(attr_name, None)
+        clone._volatile_attrs = set()
+        next_in_mro = super()
+        try:
+            method = next_in_mro._setup_clone
+        except AttributeError:
+            pass
+        else:
+            method(clone)